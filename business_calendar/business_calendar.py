@@ -2,8 +2,9 @@
 The business_calendar contains the main class Calendar.
 
 This module doesn't require any third-party package but will use `dateutil`
-for parsing if it is present. For testing however, `nose` and `dateutil`
-are required.
+for parsing if it is present. The array functions of Calendar, such as
+`Calendar.schedule`, require `numpy`. For testing however, `nose` and
+`dateutil` are required.
 
 In this module we adopt `weekdays()` notation, so Monday corresponds
 to 0 and Sunday corresponds to 6, therefore there is a natural index of days
@@ -12,17 +13,19 @@ of the week as a list.
 As default, `dateutil.parser.parse` is used as parser if dateutil is
 found. Otherwise, a simple parser function expecting `%Y-%m-%d` is used.
 You may **override** the parse function by assigning to the module variable
-`parsefun`.
+`parsefun`. dateutil is only imported when the first string is parsed, and
+numpy and pandas only when an array function is first called, so importing
+this module is fast.
 
 Classes:
-    Calendar
+    Calendar, CalendarCursor
 
 Constants:
     MO, TU, WE, TH, FR, SA, SU,
     FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
 
 Public Functions:
-    parsefun
+    parsefun, merge_ranges
 
 Warnings:
     CalendarHolidayWarning
@@ -30,13 +33,16 @@ Warnings:
 import bisect
 import collections
 import datetime
+import heapq
+import struct
+import sys
 import warnings
 
 __version__ = '0.1'
-__all__ = ['Calendar',
+__all__ = ['Calendar', 'CalendarCursor',
            'FOLLOWING', 'PREVIOUS', 'MODIFIEDFOLLOWING',
            'MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU',
-           'parsefun',
+           'parsefun', 'merge_ranges',
            'CalendarHolidayWarning']
 
 # constants used in date functions
@@ -57,6 +63,10 @@ DayOfWeek = collections.namedtuple('DayOfWeek', ['dayofweek', 'isworkday',
                                                  'nextworkday', 'offsetnext',
                                                  'prevworkday', 'offsetprev'])
 
+# named tuple returned by Calendar.cache_info
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize',
+                                                 'currsize'])
+
 
 # portable function to parse dates
 # pylint: disable=C0103
@@ -76,11 +86,26 @@ def _dateutilparsefun(date):
         return date
     return _dateutil_parse(date)
 
-try:
-    from dateutil.parser import parse as _dateutil_parse
-    parsefun = _dateutilparsefun
-except ImportError:
-    parsefun = _simpleparsefun
+def _lazyparsefun(date):
+    """
+    Default parsing function, dateutil is only imported when the first
+    string is parsed, then this function is replaced by the dateutil parsing
+    function or by the simple one if dateutil is not found.
+    """
+    # pylint: disable=W0603
+    global parsefun, _dateutil_parse
+    if hasattr(date, 'year'):
+        return date
+    try:
+        from dateutil.parser import parse as _dateutil_parse
+        fun = _dateutilparsefun
+    except ImportError:
+        fun = _simpleparsefun
+    if parsefun is _lazyparsefun: # unless it was overridden meanwhile
+        parsefun = fun
+    return fun(date)
+
+parsefun = _lazyparsefun
 
 
 # warning function
@@ -88,9 +113,175 @@ class CalendarHolidayWarning(Warning):
     """Warning thrown by Calendar class"""
     pass
 
-def warn(message):
-    """Throw warning with a message"""
-    warnings.warn(CalendarHolidayWarning(message), stacklevel=3)
+def warn(message, stacklevel=3):
+    """
+    Throw warning with a message, attributed to the caller stacklevel frames
+    up, or to the first caller outside of this package if stacklevel is None
+    (for warnings thrown at call depths that vary, like the array ones).
+    """
+    if stacklevel is None:
+        stacklevel = 2
+        frame = sys._getframe(1) # pylint: disable=W0212
+        while frame.f_back is not None and \
+                _inpackage(frame.f_globals.get('__name__', '')):
+            frame = frame.f_back
+            stacklevel += 1
+    warnings.warn(CalendarHolidayWarning(message), stacklevel=stacklevel)
+
+def _inpackage(name):
+    """(PRIVATE) Check if a module is part of this package, but not a test."""
+    package = __name__.rpartition('.')[0]
+    return (name == package or name.startswith(package + '.')) and \
+        not name.startswith(package + '.test')
+
+
+# week day map
+def _weekdaymap(weekmask):
+    """
+    (PRIVATE) Build the week day map of a 7 bit mask of work days, where bit
+    0 is Monday, in closed form.
+
+    Note:
+        The mask is repeated over two weeks, so the 7 bits after a day hold
+        the days after it, and the 7 bits from a day on hold the days before
+        it, a week earlier. The offset to the next work day is then the
+        position of the lowest bit set after the day, and the one to the
+        previous work day that of the highest bit set before it.
+    """
+    if not weekmask & 0x7f:
+        raise ValueError('No work days')
+    twoweeks = weekmask | weekmask << 7
+    weekdaymap = []
+    for wkday in range(7):
+        after = twoweeks >> (wkday + 1) & 0x7f
+        before = twoweeks >> wkday & 0x7f
+        offsetnext = (after & -after).bit_length()
+        offsetprev = before.bit_length() - 8
+        weekdaymap.append(DayOfWeek(
+            dayofweek=wkday, isworkday=bool(weekmask >> wkday & 1),
+            nextworkday=(wkday + offsetnext) % 7, offsetnext=offsetnext,
+            prevworkday=(wkday + offsetprev) % 7, offsetprev=offsetprev))
+    return weekdaymap
+
+
+# structures derived from a calendar
+def _samestate(state1, state2):
+    """
+    (PRIVATE) Check if two states returned by `Calendar._state` are equal,
+    either may be None. The holiday lists are compared by identity: the state
+    keeps a reference to its list, so the list cannot be freed and its id
+    reused by a new one.
+    """
+    return state1 is not None and state2 is not None and \
+        state1[0] is state2[0] and state1[1:] == state2[1:]
+
+
+class _LRUCache(object):
+    """
+    (PRIVATE) Least recently used cache with hit and miss counts, used by
+    `Calendar.cache`, `HolidayStore` and `Recurrence`.
+
+    Attributes:
+        maxsize (int): Maximum number of values kept, 0 or less to keep none.
+        hits (int): Lookups found in the cache.
+        misses (int): Lookups not found.
+    """
+
+    # returned by get for keys not in the cache
+    missing = object()
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        """Keys from the least to the most recently used."""
+        return iter(self._data)
+
+    def get(self, key):
+        """
+        Value of a key, marked as the most recently used, or
+        `_LRUCache.missing` if it is not in the cache.
+        """
+        data = self._data # speed up
+        value = data.pop(key, _LRUCache.missing)
+        if value is _LRUCache.missing:
+            self.misses += 1
+        else:
+            self.hits += 1
+            data[key] = value # reinserted as most recently used
+        return value
+
+    def put(self, key, value):
+        """Keep a value, dropping the least recently used ones if full."""
+        if self.maxsize > 0:
+            data = self._data # speed up
+            while len(data) >= self.maxsize:
+                data.popitem(last=False)
+            data[key] = value
+
+    def clear(self):
+        """Drop all values, the counts are kept."""
+        self._data.clear()
+
+
+# pickling functions
+def _compactkind(dates):
+    """
+    (PRIVATE) Class of dates if they are all naive datetimes at midnight or
+    all dates, so they can be pickled as ordinals, None otherwise.
+    """
+    kinds = set(type(date) for date in dates)
+    if kinds == set([datetime.date]):
+        return datetime.date
+    if kinds == set([datetime.datetime]) and \
+            all(date.time() == datetime.time() and date.tzinfo is None
+                for date in dates):
+        return datetime.datetime
+    return None
+
+class _PackedHolidays(object):
+    """
+    (PRIVATE) Holiday list of an unpickled calendar, unpacked on first use.
+    Once unpacked the list is an instance attribute, which takes precedence
+    over this class attribute, so later lookups cost nothing extra (unlike
+    a `__getattr__` hook, which slows down every attribute lookup).
+    """
+
+    def __get__(self, cal, cls):
+        if cal is None:
+            return self
+        if '_packed' not in cal.__dict__:
+            raise AttributeError('holidays')
+        isdate, packed = cal.__dict__.pop('_packed')
+        fromordinal = datetime.date.fromordinal if isdate else \
+            datetime.datetime.fromordinal
+        cal.holidays = list(map(fromordinal, struct.unpack(
+            '<%di' % (len(packed) // 4), packed)))
+        return cal.holidays
+
+def _restore(cls, compact):
+    """
+    (PRIVATE) Create a calendar when unpickling, from its compact form if
+    given, otherwise the instance attributes are restored by pickle. The
+    holiday list is only unpacked when first used, see `_PackedHolidays`.
+    """
+    cal = cls.__new__(cls)
+    if compact is not None:
+        weekmask, isdate, packed, validfrom, validto = compact
+        Calendar.__init__(cal, [wk for wk in range(7) if weekmask >> wk & 1])
+        del cal.holidays
+        cal._packed = (isdate, packed)
+        kind = datetime.date if isdate else datetime.datetime
+        if validfrom is not None:
+            cal.valid_from = kind.fromordinal(validfrom)
+        if validto is not None:
+            cal.valid_to = kind.fromordinal(validto)
+    return cal
 
 
 # main class
@@ -116,7 +307,25 @@ class Calendar(object):
     _idx_prevworkday = DayOfWeek._fields.index('prevworkday')
     _idx_offsetprev = DayOfWeek._fields.index('offsetprev')
 
-    def __init__(self, workdays=None, holidays=None):
+    # engine of the array functions, 'table' uses a precomputed RollTable and
+    # 'numpy' dispatches to the numpy business day functions
+    engine = 'table'
+
+    # week day maps already built, by tuple of work days
+    _weekdaymaps = {}
+
+    # holidays of unpickled calendars, until unpacked
+    holidays = _PackedHolidays()
+
+    # methods replaced by compile
+    compiled = ('isworkday', 'isbusday', 'addworkdays', 'addbusdays',
+                'workdaycount', 'busdaycount')
+
+    # methods replaced by cache
+    cached = ('adjust', 'addbusdays')
+
+    def __init__(self, workdays=None, holidays=None, valid_from=None,
+                 valid_to=None):
         """
         Initialize object and creates the week day map.
 
@@ -126,6 +335,16 @@ class Calendar(object):
                 Defaults to [MO, TU, WE, TH, FR].
             holidays: List or tuple of holidays (or strings).
                 Default is [].
+            valid_from (date, datetime or str): First date covered by the
+                holiday list. Defaults to the first holiday.
+            valid_to (date, datetime or str): Last date covered by the
+                holiday list. Defaults to the last holiday.
+
+        Note:
+            Dates outside of the validity window [valid_from, valid_to] may
+            have holidays that are not in the list, so functions warn with
+            a CalendarHolidayWarning when they need them. A calendar without
+            holidays and without an explicit window never warns.
         """
         if workdays is None:
             self.workdays = [MO, TU, WE, TH, FR]
@@ -138,53 +357,78 @@ class Calendar(object):
         # create week day map structure in local variable to speed up
         # this structure is the soul of this class, it is used in all
         # calculations and is the secret that enables the custom work day list
-        weekdaymap = []
-        for wkday in range(0, 7):
-            wmap = {}
-            wmap['dayofweek'] = wkday
-            if wkday in self.workdays:
-                wmap['isworkday'] = True
-                i = self.workdays.index(wkday)
-                # assign transition to next work day
-                if i == len(self.workdays) - 1: # last work day of week
-                    wmap['nextworkday'] = self.workdays[0]
-                    wmap['offsetnext'] = wmap['nextworkday'] + 7 - wkday
-                else:
-                    wmap['nextworkday'] = self.workdays[i+1]
-                    wmap['offsetnext'] = wmap['nextworkday'] - wkday
-                # assign transition to previous work day
-                if i == 0: # first work day of week
-                    wmap['prevworkday'] = self.workdays[-1]
-                    wmap['offsetprev'] = wmap['prevworkday'] - wkday - 7
-                else:
-                    wmap['prevworkday'] = self.workdays[i-1]
-                    wmap['offsetprev'] = wmap['prevworkday'] - wkday
-            else:
-                wmap['isworkday'] = False
-                # assign transition to next work day
-                after = [x for x in range(wkday+1, 7) if x in self.workdays]
-                if after: # there is a work day after this non-work day
-                    wmap['nextworkday'] = after[0]
-                    wmap['offsetnext'] = wmap['nextworkday'] - wkday
-                else:
-                    wmap['nextworkday'] = self.workdays[0]
-                    wmap['offsetnext'] = wmap['nextworkday'] + 7 - wkday
-                # assign transition to previous work day
-                before = [x for x in range(0, wkday) if x in self.workdays]
-                if before: # there is a work day before this non-work day
-                    wmap['prevworkday'] = before[-1]
-                    wmap['offsetprev'] = wmap['prevworkday'] - wkday
-                else:
-                    wmap['prevworkday'] = self.workdays[-1]
-                    wmap['offsetprev'] = wmap['prevworkday'] - wkday - 7
-            weekdaymap.append(DayOfWeek(**wmap))
-        self.weekdaymap = weekdaymap
+        # the map only depends on the work days, so it is built once for each
+        # set of work days and copied
+        weekdaymap = Calendar._weekdaymaps.get(tuple(self.workdays))
+        if weekdaymap is None:
+            weekdaymap = _weekdaymap(sum(1 << wk for wk in self.workdays))
+            Calendar._weekdaymaps[tuple(self.workdays)] = weekdaymap
+        self.weekdaymap = list(weekdaymap)
 
         # add holidays but eliminate non-work days and repetitions
         holidays = set([parsefun(hol) for hol in holidays])
         self.holidays = sorted(
             [hol for hol in holidays if weekdaymap[hol.weekday()].isworkday])
 
+        # validity window of the holiday list
+        if valid_from is not None:
+            self.valid_from = parsefun(valid_from)
+        else:
+            self.valid_from = self.holidays[0] if self.holidays else None
+        if valid_to is not None:
+            self.valid_to = parsefun(valid_to)
+        else:
+            self.valid_to = self.holidays[-1] if self.holidays else None
+
+        # precomputed business day table used by the array functions, it is
+        # only built on first use as it requires numpy
+        self._table = None
+        self._tablekey = None
+
+    def __getstate__(self):
+        """
+        (PRIVATE) Instance attributes pickled, without the methods replaced
+        by `compile` or `cache`, the result cache and the table, which are
+        rebuilt when needed.
+        """
+        state = dict(self.__dict__)
+        for name in Calendar.compiled + Calendar.cached + ('_cache',):
+            state.pop(name, None)
+        state['_table'] = state['_tablekey'] = None
+        return state
+
+    def __reduce__(self):
+        """
+        (PRIVATE) Pickle in compact form: the work days as a 7 bit mask and
+        the holidays as packed int32 ordinals. The week day map and the rest
+        of the derived structures are rebuilt when unpickling.
+
+        Note:
+            The compact form is used when the holidays and the validity
+            window are all naive datetimes at midnight (as parsed from
+            strings) or all dates, otherwise the instance attributes are
+            pickled as they are. Compiled and cached methods are not
+            pickled.
+        """
+        window = [date for date in (self.valid_from, self.valid_to)
+                  if date is not None]
+        kind = _compactkind(self.holidays + window)
+        state = self.__getstate__()
+        if kind is None:
+            return (_restore, (self.__class__, None), state)
+        for name in ('workdays', 'weekdaymap', 'holidays', 'valid_from',
+                     'valid_to', '_table', '_tablekey'):
+            del state[name]
+        weekmask = sum(1 << wk for wk in self.workdays)
+        packed = struct.pack('<%di' % len(self.holidays),
+                             *[hol.toordinal() for hol in self.holidays])
+        compact = (weekmask, kind is datetime.date, packed,
+                   None if self.valid_from is None else
+                   self.valid_from.toordinal(),
+                   None if self.valid_to is None else
+                   self.valid_to.toordinal())
+        return (_restore, (self.__class__, compact), state or None)
+
     def isworkday(self, date):
         """
         Check if a given date is a work date, ignoring holidays.
@@ -209,18 +453,12 @@ class Calendar(object):
             bool: True if the date is a holiday, False otherwise.
         """
         date = parsefun(date)
-        if self.holidays:
-            # i is the index of first holiday >= date
-            i = bisect.bisect_left(self.holidays, date)
-            if i == 0 and date < self.holidays[0]:
-                warn('Holiday list exhausted at start, ' \
-                     'isholiday(%s) output may be incorrect.' % date)
-            elif i == len(self.holidays):
-                warn('Holiday list exhausted at end, ' \
-                     'isholiday(%s) output may be incorrect.' % date)
-            elif self.holidays[i] == date:
-                return True
-        return False
+        if self.valid_from is not None and date < self.valid_from or \
+                self.valid_to is not None and date > self.valid_to:
+            self._checkwindow(date, date, 'isholiday(%s)', date)
+        # i is the index of first holiday >= date
+        i = bisect.bisect_left(self.holidays, date)
+        return i < len(self.holidays) and self.holidays[i] == date
 
     def isbusday(self, date):
         """
@@ -354,52 +592,80 @@ class Calendar(object):
 
         dateoffset = self.addworkdays(date, offset)
         holidays = self.holidays # speed up
-        if not holidays:
-            return dateoffset
-
-        weekdaymap = self.weekdaymap # speed up
-        datewk = dateoffset.weekday()
         if offset > 0:
             # i is the index of first holiday > date
             # we don't care if the start date is a holiday
             i = bisect.bisect_right(holidays, date)
-            if i == len(holidays):
-                warn('Holiday list exhausted at end, ' \
-                     'addbusday(%s,%s) output may be incorrect.' % \
-                     (date, offset))
-            else:
-                while holidays[i] <= dateoffset:
-                    dateoffset += datetime.timedelta(days=\
-                                                weekdaymap[datewk].offsetnext)
-                    datewk = weekdaymap[datewk].nextworkday
-                    i += 1
-                    if i == len(holidays):
-                        warn('Holiday list exhausted at end, ' \
-                             'addbusday(%s,%s) output may be incorrect.' % \
-                             (date, offset))
-                        break
+            dateoffset = self._skipholidays(offset, dateoffset, i)
+            self._checkwindow(None, dateoffset, 'addbusday(%s,%s)', date,
+                              offset)
         else:
-            # i is the index of first holiday >= date
+            # i is the index of last holiday < date
             # we don't care if the start date is a holiday
             i = bisect.bisect_left(holidays, date) - 1
-            if i == -1:
-                warn('Holiday list exhausted at start, ' \
-                     'addbusday(%s,%s) output may be incorrect.' \
-                     % (date, offset))
-            else:
-                while holidays[i] >= dateoffset:
-                    dateoffset += datetime.timedelta(days=\
-                                                weekdaymap[datewk].offsetprev)
-                    datewk = weekdaymap[datewk].prevworkday
-                    i -= 1
-                    if i == -1:
-                        warn('Holiday list exhausted at start, ' \
-                             'addbusday(%s,%s) output may be incorrect.' % \
-                             (date, offset))
-                        break
+            dateoffset = self._skipholidays(offset, dateoffset, i)
+            self._checkwindow(dateoffset, None, 'addbusday(%s,%s)', date,
+                              offset)
+        return dateoffset
 
+    def _skipholidays(self, offset, dateoffset, i):
+        """
+        (PRIVATE) Move a date incremented by work days past the holidays
+        found on the way, starting at holiday index i, so the increment is in
+        business days.
+        """
+        holidays = self.holidays # speed up
+        weekdaymap = self.weekdaymap # speed up
+        datewk = dateoffset.weekday()
+        if offset > 0:
+            while i < len(holidays) and holidays[i] <= dateoffset:
+                dateoffset += datetime.timedelta(days=\
+                                            weekdaymap[datewk].offsetnext)
+                datewk = weekdaymap[datewk].nextworkday
+                i += 1
+        else:
+            while i >= 0 and holidays[i] >= dateoffset:
+                dateoffset += datetime.timedelta(days=\
+                                            weekdaymap[datewk].offsetprev)
+                datewk = weekdaymap[datewk].prevworkday
+                i -= 1
         return dateoffset
 
+    def _checkwindow(self, date1, date2, call, *args):
+        """
+        (PRIVATE) Warn if the dates date1 to date2 are not inside the
+        validity window, None skipping the check of that end. The call and
+        args are only formatted into the message when warning.
+        """
+        if date1 is not None and self.valid_from is not None and \
+                date1 < self.valid_from:
+            warn('Holiday list exhausted at start, ' \
+                 '%s output may be incorrect.' % (call % args), 4)
+        if date2 is not None and self.valid_to is not None and \
+                date2 > self.valid_to:
+            warn('Holiday list exhausted at end, ' \
+                 '%s output may be incorrect.' % (call % args), 4)
+
+    def isvalid(self, date1, date2=None):
+        """
+        Check if dates are inside the validity window of the holiday list.
+
+        Args:
+            date1 (date, datetime or str): First date, or the only date.
+            date2 (date, datetime or str): Last date, defaults to date1.
+
+        Note:
+            Check the minimum and maximum of a batch of dates once, before
+            running the batch on a calendar compiled with `check=False`.
+
+        Returns:
+            bool: True if all dates from date1 to date2 are in the window.
+        """
+        date1 = parsefun(date1)
+        date2 = date1 if date2 is None else parsefun(date2)
+        return (self.valid_from is None or date1 >= self.valid_from) and \
+            (self.valid_to is None or date2 <= self.valid_to)
+
     def _workdaycount(self, date1, date2):
         """
         (PRIVATE) Count work days between two dates, ignoring holidays.
@@ -495,38 +761,211 @@ class Calendar(object):
         else:
             direction = 1
 
+        self._checkwindow(date1, date2, 'busdaycount(%s,%s)', date1, date2)
         ndays = self._workdaycount(date1, date2)
-
         if self.holidays:
-            holidays = self.holidays # speed up
-            if date1 > holidays[-1]:
-                warn('Holiday list exhausted at end, ' \
-                     'busdaycount(%s,%s) output may be incorrect.' % \
-                     (date1, date2))
-            elif date2 < holidays[0]:
-                warn('Holiday list exhausted at start, ' \
-                     'busdaycount(%s,%s) output may be incorrect.' % \
-                     (date1, date2))
-            else:
-                if date1 < holidays[0]:
-                    warn('Holiday list exhausted at start, ' \
-                         'busdaycount(%s,%s) output may be incorrect.' % \
-                         (date1, date2))
-                if date2 > holidays[-1]:
-                    warn('Holiday list exhausted at end, ' \
-                         'busdaycount(%s,%s) output may be incorrect.' % \
-                         (date1, date2))
-                # i is the index of first holiday > date
-                # we don't care if the start date is a holiday
-                i = bisect.bisect_right(holidays, date1)
-                while holidays[i] <= date2:
-                    ndays -= 1
-                    i += 1
-                    if i == len(holidays):
-                        break
-
+            # holidays counted are the ones > date1 and <= date2
+            ndays -= bisect.bisect_right(self.holidays, date2) - \
+                bisect.bisect_right(self.holidays, date1)
         return ndays * direction
 
+    def busday_mask(self, date1, date2):
+        """
+        Flag every day between two dates as business day or not, taking
+        holidays into consideration.
+
+        Args:
+            date1 (date, datetime or str): Date start of interval.
+            date2 (date, datetime or str): Date end of interval, not included.
+
+        Note:
+            The mask is built by repeating the week pattern of work days over
+            the interval and clearing the holidays in it, with no call per
+            day. It converts to a numpy bool array without copying with
+            `numpy.frombuffer(mask, dtype=bool)`.
+
+        Returns:
+            bytearray: One byte per day from date1 (inc) to date2 (exc), 1
+                for business days and 0 otherwise. Empty if date2 <= date1.
+        """
+        date1 = parsefun(date1)
+        date2 = parsefun(date2)
+        ndays = date2.toordinal() - date1.toordinal()
+        if ndays <= 0:
+            return bytearray()
+        self._checkwindow(date1, date2 - datetime.timedelta(days=1),
+                          'busday_mask(%s,%s)', date1, date2)
+
+        # week pattern starting at the week day of date1
+        wkday = date1.weekday()
+        pattern = bytearray(int(wk.isworkday) for wk in
+                            self.weekdaymap[wkday:] + self.weekdaymap[:wkday])
+        mask = (pattern * (ndays // 7 + 1))[:ndays]
+        holidays = self.holidays # speed up
+        start = date1.toordinal()
+        for i in range(bisect.bisect_left(holidays, date1),
+                       bisect.bisect_left(holidays, date2)):
+            mask[holidays[i].toordinal() - start] = 0
+        return mask
+
+    def busdaycount_matrix(self, dates1, dates2):
+        """
+        Count business days between every pair of dates of two arrays, taking
+        holidays into consideration. Requires numpy.
+
+        Args:
+            dates1 (sequence or array): Dates start of interval, one per row.
+            dates2 (sequence or array): Dates end of interval, one per column.
+
+        Note:
+            The business day index of each date is looked up only once and
+            the result is the difference of the two index vectors broadcast
+            to a matrix, so element [i, j] is the same as
+            `busdaycount(dates1[i], dates2[j])`, COB to COB. Missing dates
+            (NaT) raise ValueError.
+
+        Returns:
+            numpy.ndarray: 2-D array of int64 with shape
+                (len(dates1), len(dates2)).
+        """
+        import numpy
+        from .table import asdays
+        days1 = asdays(dates1).ravel()
+        days2 = asdays(dates2).ravel()
+        # a single lookup, which checks the validity window once
+        index = self._rolltable().index(numpy.concatenate([days1, days2]))
+        return index[None, len(days1):] - index[:len(days1), None]
+
+    def to_busday_index(self, dates, roll=None):
+        """
+        Convert dates to business day indexes, numbering business days
+        consecutively. Requires numpy.
+
+        Args:
+            dates (date, datetime, str, sequence or array): Dates.
+            roll (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING, to use
+                the index of the business date a non-business date is
+                adjusted to. If None non-business dates raise ValueError.
+
+        Note:
+            The index of a business date is the number of business days from
+            1970-01-01 up to and including the date, so the first business
+            day on or after 1970-01-01 has index 1 and earlier ones have
+            indexes of zero or less. The difference of the indexes of two
+            business dates is `busdaycount` between them. Conversions are
+            lookups in the shared table of the calendar. Missing dates (NaT)
+            raise ValueError.
+
+        Returns:
+            int or numpy.ndarray: Index of the date, or int64 array of
+                indexes with the shape of dates.
+        """
+        from .table import asdays
+        days = asdays(dates)
+        flat = days.ravel()
+        table = self._rolltable()
+        isbusday = table.isbusday(flat)
+        if roll is None:
+            if not isbusday.all():
+                raise ValueError('Not a business date %s' %
+                                 flat[~isbusday][:1].view('M8[D]')[0])
+            index = table.index(flat)
+        elif roll == FOLLOWING:
+            index = table.index(flat) + ~isbusday
+        elif roll == PREVIOUS:
+            index = table.index(flat)
+        else:
+            index = table.index(table.adjust(flat, roll))
+        if days.ndim == 0:
+            return int(index[0])
+        return index.reshape(days.shape)
+
+    def shift_busdays(self, dates, k):
+        """
+        Add business days to an array of dates, e.g. to lag or lead a time
+        series by k business days. Requires numpy.
+
+        Args:
+            dates (sequence or array): Dates, missing values (NaT) allowed.
+            k (integer or array): Number of business days to add, either the
+                same for all dates or one per date. Negative values move the
+                dates back.
+
+        Note:
+            Same results as `addbusdays` on each date, computed from the
+            business day index of the dates in the shared table, with two
+            lookups per date. Missing dates stay missing.
+
+        Example:
+            >>> lagged = cal.shift_busdays(df['date'].values, -5)
+
+        Returns:
+            numpy.ndarray: Array of `datetime64[D]` with the shape of dates
+                and k broadcast together.
+        """
+        from .table import asdays, todates
+        import numpy
+        days, k = numpy.broadcast_arrays(asdays(dates),
+                                         numpy.asarray(k, dtype='i8'))
+        result = todates(days).copy()
+        present = ~numpy.isnat(result)
+        result[present] = todates(self._rolltable().shift(days[present],
+                                                          k[present]))
+        return result
+
+    def busperiod_key(self, dates, freq, roll=PREVIOUS):
+        """
+        Label dates with the business period they belong to, as integer
+        group codes. Requires numpy.
+
+        Args:
+            dates (sequence or array): Dates, missing values (NaT) allowed.
+            freq (str or integer): 'W' for business weeks (Monday to Sunday),
+                'M' for business months, 'Q' for business quarters, or the
+                number of business days of fixed blocks, counted from the
+                first business day on or after 1970-01-01.
+            roll (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING, how
+                non-business dates are adjusted before finding their period,
+                None to use the dates as they are.
+
+        Note:
+            Codes start at zero with the period of the earliest date and go
+            up by one per period, including periods with no dates, so they
+            index the returned period starts and can be given to
+            `numpy.bincount`. Missing dates get the code -1. A period without
+            business days starts at the first business day of the next one.
+
+        Example:
+            >>> codes, starts = cal.busperiod_key(dates, 'M')
+            >>> monthly = numpy.bincount(codes, weights=pnl)
+
+        Returns:
+            tuple: Array of int64 codes with the shape of dates, and array of
+                `datetime64[D]` with the first business day of each period.
+        """
+        from .periods import busperiod_key
+        return busperiod_key(self, dates, freq, roll)
+
+    def from_busday_index(self, indexes):
+        """
+        Convert business day indexes to business dates, the inverse of
+        `to_busday_index`. Requires numpy.
+
+        Args:
+            indexes (integer, sequence or array): Business day indexes.
+
+        Returns:
+            datetime or numpy.ndarray: Business date, or `datetime64[D]`
+                array with the shape of indexes.
+        """
+        from .table import EPOCH, todates
+        import numpy
+        indexes = numpy.asarray(indexes, dtype='i8')
+        days = self._rolltable().fromindex(indexes.ravel())
+        if indexes.ndim == 0:
+            return datetime.datetime.fromordinal(int(days[0]) + EPOCH)
+        return todates(days).reshape(indexes.shape)
+
     @staticmethod
     def caleom(date):
         """
@@ -556,6 +995,562 @@ class Calendar(object):
         """
         return self.adjust(self.caleom(date), PREVIOUS)
 
+    def _state(self):
+        """
+        (PRIVATE) Attributes that structures derived from this calendar
+        depend on: the holiday list and its length, the work days and the
+        validity window. Compare states with `_samestate`.
+
+        Note:
+            In-place edits of the holiday list that keep its length are not
+            detected, replace the list instead.
+        """
+        return (self.holidays, len(self.holidays), tuple(self.workdays),
+                self.valid_from, self.valid_to)
+
+    def _rolltable(self):
+        """
+        (PRIVATE) Shared table of this calendar used by the array functions,
+        built on first use and rebuilt if workdays, holidays, validity window
+        or engine were replaced.
+        """
+        key = self._state() + (self.engine,)
+        if self._table is None or not _samestate(self._tablekey, key):
+            from .table import RollTable, NumpyTable, EPOCH
+            weekmask = [wk.isworkday for wk in self.weekdaymap]
+            holidays = [hol.toordinal() - EPOCH for hol in self.holidays]
+            validfrom = validto = None
+            if self.valid_from is not None:
+                validfrom = self.valid_from.toordinal() - EPOCH
+            if self.valid_to is not None:
+                validto = self.valid_to.toordinal() - EPOCH
+            if self.engine == 'table':
+                self._table = RollTable(weekmask, holidays,
+                                        validfrom=validfrom, validto=validto)
+            elif self.engine == 'numpy':
+                self._table = NumpyTable(weekmask, holidays, validfrom,
+                                         validto)
+            else:
+                raise ValueError('Invalid engine %s' % self.engine)
+            self._tablekey = key
+        return self._table
+
+    def to_numpy(self):
+        """
+        Convert to a numpy business day calendar. Requires numpy.
+
+        Returns:
+            numpy.busdaycalendar: Calendar with a week mask from the work
+                days and the holidays as `datetime64[D]`.
+        """
+        from .table import EPOCH, todates
+        import numpy
+        return numpy.busdaycalendar(
+            weekmask=[int(wk.isworkday) for wk in self.weekdaymap],
+            holidays=todates([hol.toordinal() - EPOCH
+                              for hol in self.holidays]))
+
+    @classmethod
+    def from_numpy(cls, busdaycal):
+        """
+        Create a Calendar from a numpy business day calendar. Requires numpy.
+
+        Args:
+            busdaycal (numpy.busdaycalendar): Calendar to convert.
+
+        Returns:
+            Calendar: Calendar with the same work days and holidays, as
+                `datetime.datetime`.
+        """
+        workdays = [i for i, isworkday in enumerate(busdaycal.weekmask)
+                    if isworkday]
+        holidays = busdaycal.holidays.astype('M8[us]').astype(object)
+        return cls(workdays=workdays, holidays=list(holidays))
+
+    @classmethod
+    def from_array(cls, holidays, workdays=None, valid_from=None,
+                   valid_to=None):
+        """
+        Create a Calendar from an array of holidays already parsed, much
+        faster than the constructor for large holiday lists. Requires numpy.
+
+        Args:
+            holidays: Array or sequence of holidays, either integer
+                proleptic Gregorian ordinals (see `datetime.date.toordinal`)
+                or `numpy.datetime64` of any unit, time of day is discarded
+                and NaT is ignored.
+            workdays: List or tuple of week days considered 'work days',
+                see `Calendar`.
+            valid_from (date, datetime or str): First date covered by the
+                holiday list, defaults to the first holiday.
+            valid_to (date, datetime or str): Last date covered by the
+                holiday list, defaults to the last holiday.
+
+        Note:
+            Holidays are sorted, deduplicated and filtered to work days in a
+            single vectorized pass, without calling `parsefun`, and converted
+            to `datetime.datetime` at once.
+
+        Returns:
+            Calendar: New calendar.
+        """
+        import numpy as np
+        from .table import EPOCH, EPOCH_WEEKDAY, asdays, todates
+        cal = cls.__new__(cls)
+        Calendar.__init__(cal, workdays, None, valid_from, valid_to)
+
+        holidays = np.asarray(holidays)
+        if holidays.dtype.kind in 'iu':
+            days = holidays.astype('i8').ravel() - EPOCH
+        else:
+            days = asdays(holidays).ravel()
+            days = days[~np.isnat(todates(days))]
+        days = np.unique(days) # sorted
+        weekmask = np.array([wk.isworkday for wk in cal.weekdaymap])
+        days = days[weekmask[(days + EPOCH_WEEKDAY) % 7]]
+        cal.holidays = todates(days).astype('M8[us]').astype(object).tolist()
+
+        if valid_from is None and cal.holidays:
+            cal.valid_from = cal.holidays[0]
+        if valid_to is None and cal.holidays:
+            cal.valid_to = cal.holidays[-1]
+        return cal
+
+    def schedule(self, start, end, months, mode=MODIFIEDFOLLOWING,
+                 backward=True, eom=False, fixing=0, payment=0):
+        """
+        Generate schedules of periodic dates in batch, returning columnar
+        arrays. Requires numpy.
+
+        Args:
+            start (date, datetime, str or array): Start date of each
+                schedule.
+            end (date, datetime, str or array): End date of each schedule,
+                must be after start.
+            months (integer): Length of a regular period in months.
+            mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING, used to
+                adjust the dates. None leaves the dates unadjusted.
+            backward (bool): If True dates are rolled back from end and a
+                short stub is left at the start, otherwise dates are rolled
+                forward from start and the stub is left at the end.
+            eom (bool): If True and the date the schedule is rolled from is
+                the last day of a month, all dates are month ends.
+            fixing (integer): Business days added to each adjusted date to
+                get its fixing date, usually zero or negative.
+            payment (integer): Business days added to each adjusted date to
+                get its payment date.
+
+        Note:
+            All schedules are generated in a single pass and stacked in the
+            returned arrays, one row per date, with the `schedule` column
+            holding the index of the schedule each row belongs to. Regular
+            dates keep the day of month of the date they are rolled from,
+            capped to the length of each month.
+
+        Example:
+            >>> cal = Calendar()
+            >>> sch = cal.schedule('2015-01-15', '2016-01-15', 6, payment=2)
+            >>> sch.adjusted
+            array(['2015-01-15', '2015-07-15', '2016-01-15'],
+                  dtype='datetime64[D]')
+
+        Returns:
+            Schedule: Named tuple of numpy arrays `schedule`, `unadjusted`,
+                `adjusted`, `fixing` and `payment`.
+        """
+        from .schedule import generate
+        return generate(self, start, end, months, mode, backward, eom,
+                        fixing, payment)
+
+    def map_parallel(self, op, dates, offsets=None, workers=None,
+                     chunksize=None):
+        """
+        Run a batch operation on a large array of dates in a process pool.
+        Requires numpy.
+
+        Args:
+            op (str): 'isbusday', 'adjust', 'addbusdays' or 'busdaycount'.
+            dates (sequence or array): Dates, the first argument of op.
+            offsets: Second argument of op: the mode of 'adjust' (default
+                FOLLOWING), the business days of 'addbusdays' (an integer or
+                one per date) or the end dates of 'busdaycount'. Not used by
+                'isbusday'.
+            workers (integer): Number of processes, defaults to the number of
+                CPUs.
+            chunksize (integer): Dates in each shard sent to a worker,
+                defaults to a quarter of the dates per worker.
+
+        Note:
+            The calendar is sent once to each worker in compact form and the
+            pool is only started when iteration begins. The results are the
+            same as the ones of the array functions, e.g. 'addbusdays'
+            yields `datetime64[D]` arrays. Closing the generator early
+            terminates the pool.
+
+        Example:
+            >>> result = numpy.concatenate(list(cal.map_parallel(
+            ...     'addbusdays', dates, 2, workers=8)))
+
+        Yields:
+            numpy.ndarray: Results of each shard, in order.
+        """
+        from .parallel import map_parallel
+        return map_parallel(self, op, dates, offsets, workers, chunksize)
+
+    def compile(self, check=True):
+        """
+        Replace the generic methods of this instance by closures specialized
+        for its work days and holidays, to reduce the latency of each call.
+
+        Args:
+            check (bool): If False the closures never check the validity
+                window, for callers that guarantee all dates are inside it
+                (see `isvalid`).
+
+        Note:
+            The closures have the week day map flattened into tuples, the
+            work day increments and counts precomputed for every week day (so
+            there are no loops over the week), and the holiday list bound as
+            a local variable. Results and warnings are the same as the
+            generic methods. Compile again after replacing `workdays`,
+            `holidays` or the validity window, and call `decompile` to
+            restore the generic methods. If the calendar is cached, the
+            cache is emptied and kept on top of the compiled methods.
+
+            The methods replaced are listed in `Calendar.compiled`.
+
+        Returns:
+            Calendar: This calendar, so that `cal = Calendar(...).compile()`
+                works.
+        """
+        # pylint: disable=R0914
+        # the cache wraps the methods replaced, it is rebuilt over the new ones
+        cacheinfo = self.cache_info()
+        self.uncache()
+        weekdaymap = self.weekdaymap
+        holidays = self.holidays
+        nwork = len(self.workdays)
+        workday = tuple(wk.isworkday for wk in weekdaymap)
+        nextworkday = tuple(wk.nextworkday for wk in weekdaymap)
+        prevworkday = tuple(wk.prevworkday for wk in weekdaymap)
+        offsetprev = tuple(wk.offsetprev for wk in weekdaymap)
+
+        # days to add to a date of each week day to move 0 to nwork - 1 work
+        # days forward or backward, including the move to a work day when
+        # counting starts from a rest day
+        forward = []
+        backward = []
+        for wkday in range(7):
+            wk = weekdaymap[wkday]
+            if wk.isworkday:
+                days, datewk = 0, wkday
+            else:
+                days, datewk = wk.offsetprev, wk.prevworkday
+            row = [days]
+            for i in range(1, nwork):
+                days += weekdaymap[datewk].offsetnext
+                datewk = weekdaymap[datewk].nextworkday
+                row.append(days)
+            forward.append(tuple(row))
+            if wk.isworkday:
+                days, datewk = 0, wkday
+            else:
+                days, datewk = wk.offsetnext, wk.nextworkday
+            row = [days]
+            for i in range(1, nwork):
+                days += weekdaymap[datewk].offsetprev
+                datewk = weekdaymap[datewk].prevworkday
+                row.append(days)
+            backward.append(tuple(row))
+        forward = tuple(forward)
+        backward = tuple(backward)
+
+        # steps[wk1][wk2] is the number of moves to the next work day needed
+        # to go from week day wk1 to work day wk2
+        steps = []
+        for wkday in range(7):
+            row = [0] * 7
+            datewk = wkday
+            for i in range(1, nwork + 1):
+                datewk = nextworkday[datewk]
+                if datewk != wkday:
+                    row[datewk] = i
+            steps.append(tuple(row))
+        steps = tuple(steps)
+
+        timedelta = datetime.timedelta
+        bisect_left = bisect.bisect_left
+        bisect_right = bisect.bisect_right
+        skipholidays = self._skipholidays
+        nholidays = len(holidays)
+
+        def isworkday(date):
+            """Compiled `Calendar.isworkday`."""
+            return workday[parsefun(date).weekday()]
+
+        def isbusday(date):
+            """Compiled `Calendar.isbusday`."""
+            date = parsefun(date)
+            if not workday[date.weekday()]:
+                return False
+            i = bisect_left(holidays, date)
+            return i == nholidays or holidays[i] != date
+
+        def addworkdays(date, offset):
+            """Compiled `Calendar.addworkdays`."""
+            date = parsefun(date)
+            if offset == 0:
+                return date
+            if offset > 0:
+                nw, nd = divmod(offset, nwork)
+                return date + timedelta(days=nw*7 +
+                                        forward[date.weekday()][nd])
+            nw, nd = divmod(-offset, nwork)
+            return date + timedelta(days=backward[date.weekday()][nd] - nw*7)
+
+        def addbusdays(date, offset):
+            """Compiled `Calendar.addbusdays`."""
+            date = parsefun(date)
+            if offset == 0:
+                return date
+            dateoffset = addworkdays(date, offset)
+            if offset > 0:
+                i = bisect_right(holidays, date)
+                if i < nholidays and holidays[i] <= dateoffset:
+                    return skipholidays(offset, dateoffset, i)
+            else:
+                i = bisect_left(holidays, date) - 1
+                if i >= 0 and holidays[i] >= dateoffset:
+                    return skipholidays(offset, dateoffset, i)
+            return dateoffset # no holidays on the way
+
+        def count(date1, date2):
+            """Compiled `Calendar._workdaycount`."""
+            date2wd = date2.weekday()
+            if not workday[date2wd]:
+                date2 += timedelta(days=offsetprev[date2wd])
+                date2wd = prevworkday[date2wd]
+            if date2 <= date1:
+                return 0
+            nw, nd = divmod((date2 - date1).days, 7)
+            if nd > 0:
+                return nw * nwork + steps[date1.weekday()][date2wd]
+            return nw * nwork
+
+        def workdaycount(date1, date2):
+            """Compiled `Calendar.workdaycount`."""
+            date1 = parsefun(date1)
+            date2 = parsefun(date2)
+            if date1 > date2:
+                return -count(date2, date1)
+            return count(date1, date2)
+
+        def busdaycount(date1, date2):
+            """Compiled `Calendar.busdaycount`."""
+            date1 = parsefun(date1)
+            date2 = parsefun(date2)
+            if date1 > date2:
+                return bisect_right(holidays, date1) - \
+                    bisect_right(holidays, date2) - count(date2, date1)
+            return count(date1, date2) - (bisect_right(holidays, date2) -
+                                          bisect_right(holidays, date1))
+
+        if check:
+            # the window is tested inline so that dates inside of it cost no
+            # extra call, only warnings go through _checkwindow
+            checkwindow = self._checkwindow
+            validfrom = self.valid_from
+            validto = self.valid_to
+            uncheckedisbusday = isbusday
+            uncheckedaddbusdays = addbusdays
+            uncheckedbusdaycount = busdaycount
+
+            def isbusday(date):
+                """Compiled `Calendar.isbusday`."""
+                date = parsefun(date)
+                if workday[date.weekday()] and \
+                        (validfrom is not None and date < validfrom or
+                         validto is not None and date > validto):
+                    checkwindow(date, date, 'isholiday(%s)', date)
+                return uncheckedisbusday(date)
+
+            def addbusdays(date, offset):
+                """Compiled `Calendar.addbusdays`."""
+                date = parsefun(date)
+                dateoffset = uncheckedaddbusdays(date, offset)
+                if offset > 0:
+                    if validto is not None and dateoffset > validto:
+                        checkwindow(None, dateoffset, 'addbusday(%s,%s)',
+                                    date, offset)
+                elif offset < 0:
+                    if validfrom is not None and dateoffset < validfrom:
+                        checkwindow(dateoffset, None, 'addbusday(%s,%s)',
+                                    date, offset)
+                return dateoffset
+
+            def busdaycount(date1, date2):
+                """Compiled `Calendar.busdaycount`."""
+                date1 = parsefun(date1)
+                date2 = parsefun(date2)
+                first, last = (date1, date2) if date1 < date2 else \
+                    (date2, date1)
+                if first != last and \
+                        (validfrom is not None and first < validfrom or
+                         validto is not None and last > validto):
+                    checkwindow(first, last, 'busdaycount(%s,%s)', first,
+                                last)
+                return uncheckedbusdaycount(date1, date2)
+
+        self.isworkday = isworkday
+        self.isbusday = isbusday
+        self.addworkdays = addworkdays
+        self.addbusdays = addbusdays
+        self.workdaycount = workdaycount
+        self.busdaycount = busdaycount
+        if cacheinfo is not None:
+            self.cache(cacheinfo.maxsize)
+        return self
+
+    def decompile(self):
+        """
+        Restore the generic methods replaced by `compile`. If the calendar
+        is cached, the cache is emptied and kept on top of the generic
+        methods.
+
+        Returns:
+            Calendar: This calendar.
+        """
+        cacheinfo = self.cache_info()
+        self.uncache()
+        for name in Calendar.compiled:
+            self.__dict__.pop(name, None)
+        if cacheinfo is not None:
+            self.cache(cacheinfo.maxsize)
+        return self
+
+    def cache(self, maxsize=1024):
+        """
+        Replace `adjust` and `addbusdays` of this instance by versions that
+        keep their results in a least recently used cache, so repeated calls
+        with the same arguments are dictionary lookups.
+
+        Args:
+            maxsize (int): Maximum number of results kept, 0 or less to keep
+                none (the statistics are still counted).
+
+        Note:
+            Results are keyed on the method and its arguments as given, so
+            the date is not even parsed on a hit. The cache is cleared
+            whenever `holidays`, `workdays` or the validity window are
+            replaced, or the holiday list changes length. In-place edits of
+            the holiday list that keep its length (`cal.holidays[0] = date`)
+            are not detected: replace the list or call `cache_clear` after
+            them. Warnings are only thrown when a result is computed, not on
+            hits.
+
+            The methods cached are the compiled ones if the calendar is
+            compiled, `compile` and `decompile` keep the cache (emptied) on
+            top of the methods they install. Call `uncache` to restore the
+            methods replaced, which are listed in `Calendar.cached`.
+
+        Returns:
+            Calendar: This calendar, so that `cal = Calendar(...).cache()`
+                works.
+        """
+        self.uncache()
+        results = _LRUCache(maxsize)
+        missing = _LRUCache.missing
+        # attributes the cached results depend on
+        state = [None]
+        # methods replaced, restored by uncache
+        replaced = dict((name, self.__dict__[name])
+                        for name in Calendar.cached if name in self.__dict__)
+        self._cache = (results, replaced)
+
+        def lookup(name, method, date, arg):
+            """Result of a method from the cache, or computed."""
+            holidays = self.holidays # speed up
+            current = state[0]
+            if current is None or current[0] is not holidays or \
+                    current[1] != len(holidays) or \
+                    current[2] is not self.workdays or \
+                    current[3] is not self.valid_from or \
+                    current[4] is not self.valid_to:
+                results.clear()
+                state[0] = (holidays, len(holidays), self.workdays,
+                            self.valid_from, self.valid_to)
+            key = (name, date, arg)
+            result = results.get(key)
+            if result is missing:
+                result = method(date, arg)
+                results.put(key, result)
+            return result
+
+        # methods cached, compiled or generic
+        adjust = self.adjust
+        addbusdays = self.addbusdays
+
+        def cachedadjust(date, mode):
+            """Cached `Calendar.adjust`."""
+            return lookup('adjust', adjust, date, mode)
+
+        def cachedaddbusdays(date, offset):
+            """Cached `Calendar.addbusdays`."""
+            return lookup('addbusdays', addbusdays, date, offset)
+
+        self.adjust = cachedadjust
+        self.addbusdays = cachedaddbusdays
+        return self
+
+    def uncache(self):
+        """
+        Restore the methods replaced by `cache` and drop the cached results.
+
+        Returns:
+            Calendar: This calendar.
+        """
+        if '_cache' in self.__dict__:
+            replaced = self._cache[1]
+            del self._cache
+            for name in Calendar.cached:
+                self.__dict__.pop(name, None)
+            self.__dict__.update(replaced)
+        return self
+
+    def cache_info(self):
+        """
+        Statistics of the result cache, see `cache`.
+
+        Returns:
+            CacheInfo: Named tuple of `hits`, `misses`, `maxsize` and
+                `currsize`, or None if the calendar is not cached.
+        """
+        if '_cache' not in self.__dict__:
+            return None
+        results = self._cache[0]
+        return CacheInfo(results.hits, results.misses, results.maxsize,
+                         len(results))
+
+    def cache_clear(self):
+        """Drop the cached results and reset the statistics."""
+        if '_cache' in self.__dict__:
+            results = self._cache[0]
+            results.clear()
+            results.hits = results.misses = 0
+
+    def cursor(self):
+        """
+        Create a cursor for queries on dates that arrive in sorted order.
+
+        Note:
+            See CalendarCursor.
+
+        Returns:
+            CalendarCursor: New cursor positioned at the start of the holiday
+                list.
+        """
+        return CalendarCursor(self)
+
     def range(self, date1, date2):
         """
         Generate business days between two dates, taking holidays into
@@ -575,17 +1570,15 @@ class Calendar(object):
         date1 = self.adjust(parsefun(date1), FOLLOWING)
         date2 = parsefun(date2)
 
-        holidays = []
-        holidx = 0
-        if len(self.holidays):
-            index1 = bisect.bisect_left(self.holidays, date1)
-            index2 = bisect.bisect_left(self.holidays, date2)
-            if index2 > index1:
-                holidays = self.holidays[index1:index2]
+        # walk the holiday list in place, so memory stays constant however
+        # long the range
+        holidays = self.holidays
+        holidx = bisect.bisect_left(holidays, date1)
+        nholidays = len(holidays)
 
         datewk = date1.weekday()
         while date1 < date2:
-            if (holidx < len(holidays)) and (holidays[holidx] == date1):
+            if (holidx < nholidays) and (holidays[holidx] == date1):
                 holidx += 1
             else:
                 yield date1
@@ -593,3 +1586,196 @@ class Calendar(object):
                                         self.weekdaymap[datewk].offsetnext)
             datewk = self.weekdaymap[datewk].nextworkday
 
+
+class CalendarCursor(object):
+    """
+    Cursor over the holiday list of a Calendar, for queries on dates that
+    arrive in sorted order.
+
+    Note:
+        The cursor remembers its position in the holiday list and moves it
+        from the last date queried to the next one, so queries on sorted
+        dates (e.g. when replaying a time series) cost amortized O(1) instead
+        of a bisect each. Small steps backwards are walked back as well and
+        long jumps in either direction fall back to a bisect, so any order of
+        dates gives correct results. Results and warnings are the same as
+        the ones from the Calendar methods.
+
+    Example:
+        >>> cursor = cal.cursor()
+        >>> for date in dates:
+        ...     if cursor.isbusday(date):
+        ...         settle = cursor.addbusdays(date, 2)
+    """
+
+    # steps walked in the holiday list before falling back to bisect
+    maxsteps = 8
+
+    def __init__(self, cal):
+        """
+        Initialize object.
+
+        Args:
+            cal (Calendar): Calendar queried by the cursor.
+        """
+        self.cal = cal
+        self.pos1 = 0 # first holiday >= last date queried
+        self.pos2 = 0 # first holiday >= last end date in busdaycount
+
+    def _seek(self, pos, date):
+        """
+        (PRIVATE) Index of first holiday >= date, searching from pos.
+        """
+        holidays = self.cal.holidays # speed up
+        n = len(holidays)
+        if pos > n:
+            pos = n
+        if pos < n and holidays[pos] < date:
+            stop = min(pos + self.maxsteps, n)
+            while pos < stop and holidays[pos] < date:
+                pos += 1
+            if pos < n and holidays[pos] < date:
+                pos = bisect.bisect_left(holidays, date, pos, n)
+        elif pos > 0 and holidays[pos-1] >= date:
+            stop = max(pos - self.maxsteps, 0)
+            while pos > stop and holidays[pos-1] >= date:
+                pos -= 1
+            if pos > 0 and holidays[pos-1] >= date:
+                pos = bisect.bisect_left(holidays, date, 0, pos)
+        return pos
+
+    def isholiday(self, date):
+        """
+        Check if a given date is a holiday, see `Calendar.isholiday`.
+        """
+        date = parsefun(date)
+        holidays = self.cal.holidays # speed up
+        self.cal._checkwindow(date, date, 'isholiday(%s)', date)
+        i = self.pos1 = self._seek(self.pos1, date)
+        return i < len(holidays) and holidays[i] == date
+
+    def isbusday(self, date):
+        """
+        Check if a given date is a business date, see `Calendar.isbusday`.
+        """
+        date = parsefun(date)
+        return self.cal.weekdaymap[date.weekday()].isworkday and \
+            not self.isholiday(date)
+
+    def addbusdays(self, date, offset):
+        """
+        Add business days to a given date, see `Calendar.addbusdays`.
+        """
+        date = parsefun(date)
+        if offset == 0:
+            return date
+
+        cal = self.cal
+        dateoffset = cal.addworkdays(date, offset)
+        holidays = cal.holidays # speed up
+        i = self.pos1 = self._seek(self.pos1, date)
+        if offset > 0:
+            # index of first holiday > date
+            if i < len(holidays) and holidays[i] == date:
+                i += 1
+            dateoffset = cal._skipholidays(offset, dateoffset, i)
+            cal._checkwindow(None, dateoffset, 'addbusday(%s,%s)', date,
+                             offset)
+        else:
+            # index of last holiday < date
+            dateoffset = cal._skipholidays(offset, dateoffset, i - 1)
+            cal._checkwindow(dateoffset, None, 'addbusday(%s,%s)', date,
+                             offset)
+        return dateoffset
+
+    def busdaycount(self, date1, date2):
+        """
+        Count business days between two dates, see `Calendar.busdaycount`.
+
+        Note:
+            The cursor keeps separate positions for date1 and date2, so both
+            arguments should be sorted streams, like a rolling window.
+        """
+        date1 = parsefun(date1)
+        date2 = parsefun(date2)
+        if date1 == date2:
+            return 0
+
+        cal = self.cal
+        holidays = cal.holidays # speed up
+        if date1 > date2:
+            date1, date2 = date2, date1
+            direction = -1
+        else:
+            direction = 1
+
+        cal._checkwindow(date1, date2, 'busdaycount(%s,%s)', date1, date2)
+        ndays = cal._workdaycount(date1, date2)
+        if holidays:
+            # holidays counted are the ones between the first holiday > date1
+            # and the first holiday > date2
+            self.pos1 = self._seek(self.pos1, date1 if direction > 0 else date2)
+            self.pos2 = self._seek(self.pos2, date2 if direction > 0 else date1)
+            i, j = (self.pos1, self.pos2) if direction > 0 else \
+                (self.pos2, self.pos1)
+            if i < len(holidays) and holidays[i] == date1:
+                i += 1
+            if j < len(holidays) and holidays[j] == date2:
+                j += 1
+            ndays -= j - i
+        return ndays * direction
+
+
+def _tagged(dates, tag):
+    """(PRIVATE) Pair each date of an iterable with a tag."""
+    for date in dates:
+        yield date, tag
+
+
+def merge_ranges(calendars, date1, date2, bitmask=False):
+    """
+    Generate the business days of several calendars between two dates, in
+    date order, with the calendars open on each.
+
+    Args:
+        calendars: Dict of Calendars by name, or sequence of Calendars.
+        date1 (date, datetime or str): Date start of interval.
+        date2 (date, datetime or str): Date end of interval, not included.
+        bitmask (bool): Yield an int with bit i set when the i-th calendar is
+            open, instead of a set. The calendars of a dict are numbered in
+            the sorted order of their names.
+
+    Note:
+        The `Calendar.range` generators of all calendars are merged lazily
+        with a heap, so only one pending date per calendar is kept in memory
+        however long the interval. Dates on which no calendar is open are
+        not generated.
+
+    Yields:
+        tuple: Business day and set of names (or indexes, for a sequence)
+            of the calendars open on it, or their bitmask.
+    """
+    if hasattr(calendars, 'keys'):
+        names = sorted(calendars)
+        calendars = [calendars[name] for name in names]
+    else:
+        calendars = list(calendars)
+        names = list(range(len(calendars)))
+    date1 = parsefun(date1)
+    date2 = parsefun(date2)
+
+    merged = heapq.merge(*[_tagged(cal.range(date1, date2), i)
+                           for i, cal in enumerate(calendars)])
+    current = opened = None
+    for date, i in merged:
+        if date != current:
+            if current is not None:
+                yield current, opened
+            current = date
+            opened = 0 if bitmask else set()
+        if bitmask:
+            opened |= 1 << i
+        else:
+            opened.add(names[i])
+    if current is not None:
+        yield current, opened
@@ -0,0 +1,116 @@
+"""
+The daycount module computes business day year fractions in batch.
+
+This module requires `numpy`. All functions accept a Calendar and arrays (or
+scalars) of start and end dates and count business days COB to COB, exactly
+as `Calendar.busdaycount`, using the cumulative business day count of the
+shared RollTable of the calendar, so the whole array is computed in a single
+vectorized pass. Missing dates (NaT) raise ValueError.
+
+Public Functions:
+    busdaycount, bus252, busyearfrac, busbus
+"""
+import numpy as np
+
+from .table import asdays, todates, _checknat
+
+__all__ = ['busdaycount', 'bus252', 'busyearfrac', 'busbus']
+
+
+def _yearend(years):
+    """(PRIVATE) Day numbers of the last day of years counted from 1970."""
+    return (years + 1).astype('M8[Y]').astype('M8[D]').view('i8') - 1
+
+
+def busdaycount(cal, date1, date2):
+    """
+    Count business days between arrays of dates.
+
+    Args:
+        cal (Calendar): Calendar used to count business days.
+        date1 (date, datetime, str or array): Dates start of interval.
+        date2 (date, datetime, str or array): Dates end of interval.
+
+    Note:
+        Same as `Calendar.busdaycount` applied element by element, date1 is
+        not included in the count and the result is negative if
+        date1 > date2.
+
+    Returns:
+        numpy.ndarray: Array of int64.
+    """
+    days1, days2 = np.broadcast_arrays(asdays(date1), asdays(date2))
+    return cal._rolltable().count(days1, days2)
+
+
+def busyearfrac(cal, date1, date2, basis=252):
+    """
+    Business day year fraction between arrays of dates, using a fixed number
+    of business days per year.
+
+    Args:
+        cal (Calendar): Calendar used to count business days.
+        date1 (date, datetime, str or array): Dates start of interval.
+        date2 (date, datetime, str or array): Dates end of interval.
+        basis (integer): Number of business days in a year.
+
+    Returns:
+        numpy.ndarray: Array of float64.
+    """
+    return busdaycount(cal, date1, date2) / float(basis)
+
+
+def bus252(cal, date1, date2):
+    """
+    Bus/252 year fraction between arrays of dates, the business day count
+    used for Brazilian rates.
+
+    Args:
+        cal (Calendar): Calendar used to count business days.
+        date1 (date, datetime, str or array): Dates start of interval.
+        date2 (date, datetime, str or array): Dates end of interval.
+
+    Returns:
+        numpy.ndarray: Array of float64.
+    """
+    return busyearfrac(cal, date1, date2, 252)
+
+
+def busbus(cal, date1, date2):
+    """
+    Bus/Bus year fraction between arrays of dates, where the business days in
+    each calendar year are divided by the number of business days in that
+    year.
+
+    Args:
+        cal (Calendar): Calendar used to count business days.
+        date1 (date, datetime, str or array): Dates start of interval.
+        date2 (date, datetime, str or array): Dates end of interval.
+
+    Note:
+        This is the business day analogue of Act/Act ISDA: every whole
+        calendar year between the two dates counts as exactly 1.
+
+    Returns:
+        numpy.ndarray: Array of float64, negative if date1 > date2.
+    """
+    days1, days2 = np.broadcast_arrays(asdays(date1), asdays(date2))
+    if days1.size:
+        # the year ends below would not be NaT
+        _checknat(min(days1.min(), days2.min()))
+    sign = np.where(days1 > days2, -1.0, 1.0)
+    days1, days2 = np.minimum(days1, days2), np.maximum(days1, days2)
+    year1 = todates(days1).astype('M8[Y]').view('i8')
+    year2 = todates(days2).astype('M8[Y]').view('i8')
+    table = cal._rolltable()
+    # business days in a year are counted from the last day of the year
+    # before, as counts are COB to COB
+    inyear1 = table.count(_yearend(year1 - 1), _yearend(year1))
+    inyear2 = table.count(_yearend(year2 - 1), _yearend(year2))
+    frac = np.where(year1 == year2,
+                    table.count(days1, days2) / inyear1.astype(float),
+                    table.count(days1, _yearend(year1)) /
+                    inyear1.astype(float) + (year2 - year1 - 1) +
+                    table.count(_yearend(year2 - 1), days2) /
+                    inyear2.astype(float))
+    return sign * frac
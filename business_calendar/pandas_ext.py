@@ -0,0 +1,237 @@
+"""
+The pandas_ext module integrates Calendar with pandas.
+
+This module requires `pandas`. Importing it registers the `bcal` accessor on
+Series and Index objects holding dates, so business day functions run on
+whole columns at once:
+
+    >>> import business_calendar.pandas_ext
+    >>> df['settle'] = df['trade'].bcal(cal).addbusdays(2)
+    >>> df['busdays'] = df['trade'].bcal(cal).busdaycount(df['settle'])
+
+All functions work on the underlying datetime64 arrays through the shared
+table of the calendar, never on boxed Timestamp objects. Time of day is
+dropped, missing values (NaT) are kept as missing and time zone aware dates
+are handled in their local time.
+
+Classes:
+    CalendarAccessor, CalendarDay
+
+Public Functions:
+    busdate_range
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import CustomBusinessDay
+
+from .business_calendar import Calendar, FOLLOWING
+from .table import asdays, todates
+
+__all__ = ['CalendarAccessor', 'CalendarDay', 'busdate_range']
+
+
+def _days(dates):
+    """
+    (PRIVATE) Day numbers of dates in local time, NaT where missing, and the
+    mask of missing values. The table is only run on the days present, as
+    it rejects missing ones.
+    """
+    if isinstance(dates, (pd.Series, pd.Index)):
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        dates = dates.values
+    days = asdays(dates)
+    return days, np.isnat(todates(days))
+
+
+@pd.api.extensions.register_series_accessor('bcal')
+@pd.api.extensions.register_index_accessor('bcal')
+class CalendarAccessor(object):
+    """
+    Business day functions of a Calendar on a Series or DatetimeIndex,
+    available as the `bcal` attribute.
+
+    Note:
+        Call the accessor with a Calendar to choose the calendar, e.g.
+        `series.bcal(cal).isbusday()`, otherwise the default Calendar (Monday
+        to Friday, no holidays) is used. Functions returning dates return an
+        object of the same type, with the same index and name.
+    """
+
+    def __init__(self, obj, calendar=None):
+        """
+        Initialize object.
+
+        Args:
+            obj (Series or Index): Dates.
+            calendar (Calendar): Calendar used, default is `Calendar()`.
+        """
+        self._obj = obj
+        self.calendar = Calendar() if calendar is None else calendar
+
+    def __call__(self, calendar):
+        """
+        Choose the calendar.
+
+        Args:
+            calendar (Calendar): Calendar used.
+
+        Returns:
+            CalendarAccessor: Accessor on the same dates using calendar.
+        """
+        return CalendarAccessor(self._obj, calendar)
+
+    def _wrapdates(self, days, missing):
+        """(PRIVATE) Wrap day numbers in the type of the original object."""
+        dates = pd.DatetimeIndex(self._obj)
+        values = todates(days).astype(dates.values.dtype)
+        values[missing] = np.datetime64('NaT')
+        result = pd.DatetimeIndex(values)
+        if dates.tz is not None:
+            result = result.tz_localize(dates.tz)
+        if isinstance(self._obj, pd.Series):
+            return pd.Series(result, index=self._obj.index,
+                             name=self._obj.name)
+        return result.rename(self._obj.name)
+
+    def _wrap(self, values):
+        """(PRIVATE) Wrap an array in the type of the original object."""
+        if isinstance(self._obj, pd.Series):
+            return pd.Series(values, index=self._obj.index,
+                             name=self._obj.name)
+        return pd.Index(values, name=self._obj.name)
+
+    def isbusday(self):
+        """
+        Check which dates are business dates, see `Calendar.isbusday`.
+
+        Returns:
+            Series or Index: Booleans, False where the date is missing.
+        """
+        days, missing = _days(self._obj)
+        result = np.zeros(days.shape, dtype=bool)
+        result[~missing] = self.calendar._rolltable().isbusday(days[~missing])
+        return self._wrap(result)
+
+    def adjust(self, mode=FOLLOWING):
+        """
+        Adjust dates to business dates, see `Calendar.adjust`.
+
+        Args:
+            mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING.
+
+        Returns:
+            Series or DatetimeIndex: Adjusted dates.
+        """
+        days, missing = _days(self._obj)
+        result = days.copy()
+        result[~missing] = self.calendar._rolltable().adjust(days[~missing],
+                                                             mode)
+        return self._wrapdates(result, missing)
+
+    def addbusdays(self, offset):
+        """
+        Add business days to the dates, see `Calendar.addbusdays`.
+
+        Args:
+            offset (integer or array): Number of business days to add, either
+                the same for all dates or one per date.
+
+        Returns:
+            Series or DatetimeIndex: Incremented dates.
+        """
+        days, missing = _days(self._obj)
+        days, offset = np.broadcast_arrays(days, np.asarray(offset))
+        result = days.copy()
+        result[~missing] = self.calendar._rolltable().shift(
+            days[~missing], offset[~missing])
+        return self._wrapdates(result, missing)
+
+    def busdaycount(self, other):
+        """
+        Count business days from the dates to other dates, see
+        `Calendar.busdaycount`.
+
+        Args:
+            other (date, datetime, str, array or Series): End of intervals,
+                either one date or one per date.
+
+        Returns:
+            Series or Index: Counts as int64, or as float64 with NaN where
+                any of the dates is missing, like pandas does.
+        """
+        days, missing = _days(self._obj)
+        otherdays, othermissing = _days(other)
+        days, otherdays = np.broadcast_arrays(days, otherdays)
+        missing = np.broadcast_to(missing | othermissing, days.shape)
+        counts = np.zeros(days.shape, dtype='i8')
+        counts[~missing] = self.calendar._rolltable().count(
+            days[~missing], otherdays[~missing])
+        if missing.any():
+            counts = np.where(missing, np.nan, counts)
+        return self._wrap(counts)
+
+
+class CalendarDay(CustomBusinessDay):
+    """
+    DateOffset of business days of a Calendar, usable anywhere pandas takes
+    a frequency, e.g. `pandas.date_range(start, end, freq=CalendarDay(1,
+    calendar=cal))`.
+
+    Note:
+        This is a CustomBusinessDay built from `Calendar.to_numpy`, so it
+        follows pandas conventions: unlike `Calendar.addbusdays` a zero
+        offset rolls a non-business date forward. Adding it to arrays of
+        dates is vectorized.
+    """
+
+    def __init__(self, n=1, normalize=False, weekmask='Mon Tue Wed Thu Fri',
+                 holidays=None, calendar=None,
+                 offset=datetime.timedelta(0)):
+        """
+        Initialize object.
+
+        Args:
+            n (integer): Number of business days.
+            normalize (bool): Normalize dates to midnight.
+            weekmask, holidays: Only used if calendar is not given, see
+                `pandas.tseries.offsets.CustomBusinessDay`.
+            calendar (Calendar or numpy.busdaycalendar): Calendar of the
+                business days.
+            offset (timedelta): Time offset to apply.
+        """
+        if isinstance(calendar, Calendar):
+            calendar = calendar.to_numpy()
+        CustomBusinessDay.__init__(self, n, normalize, weekmask, holidays,
+                                   calendar, offset)
+
+    def _apply_array(self, dtarr):
+        """(PRIVATE) Vectorized addition to an array of datetime64."""
+        days = dtarr.astype('M8[D]')
+        roll = 'forward' if self.n <= 0 else 'backward'
+        result = np.busday_offset(days, self.n, roll=roll,
+                                  busdaycal=self.calendar)
+        if not self.normalize:
+            result = result + (dtarr - days)
+        return (result + np.timedelta64(self.offset)).astype(dtarr.dtype)
+
+
+def busdate_range(cal, date1, date2, name=None):
+    """
+    Business days between two dates as a DatetimeIndex, the same dates as
+    `Calendar.range`.
+
+    Args:
+        cal (Calendar): Calendar of the business days.
+        date1 (date, datetime or str): Date start of interval.
+        date2 (date, datetime or str): Date end of interval, not included.
+        name (str): Name of the index.
+
+    Returns:
+        DatetimeIndex: Business days in the specified range.
+    """
+    days = cal._rolltable().range(int(asdays(date1)), int(asdays(date2)))
+    return pd.DatetimeIndex(todates(days).astype('M8[ns]'), name=name)
@@ -0,0 +1,120 @@
+"""
+The parallel module shards batch operations of a Calendar across a process
+pool.
+
+This module requires `numpy`. It is used through `Calendar.map_parallel`,
+for jobs too large for a single core. The calendar is sent once to each
+worker, when the pool starts, as its week mask and an int32 array of holiday
+day numbers, and every worker builds its own table from them. Input arrays
+are then split in shards which are sent to the workers, and the results are
+yielded back in order, one array per shard, as soon as they are ready.
+
+Public Functions:
+    map_parallel
+"""
+import multiprocessing
+
+import numpy as np
+
+from .business_calendar import FOLLOWING
+from .table import RollTable, NumpyTable, EPOCH, asdays, todates
+
+__all__ = ['map_parallel']
+
+# operations available, all take the dates and a second argument
+OPERATIONS = ('isbusday', 'adjust', 'addbusdays', 'busdaycount')
+
+# table of the worker process, built by _initworker
+_table = None
+
+
+def _state(cal):
+    """
+    (PRIVATE) Compact form of a calendar sent to the workers: engine, week
+    mask, holiday day numbers and validity window.
+    """
+    validfrom = validto = None
+    if cal.valid_from is not None:
+        validfrom = cal.valid_from.toordinal() - EPOCH
+    if cal.valid_to is not None:
+        validto = cal.valid_to.toordinal() - EPOCH
+    return (cal.engine, [wk.isworkday for wk in cal.weekdaymap],
+            np.array([hol.toordinal() - EPOCH for hol in cal.holidays],
+                     dtype='i4'),
+            validfrom, validto)
+
+
+def _initworker(engine, weekmask, holidays, validfrom, validto):
+    """(PRIVATE) Build the table of a worker process."""
+    global _table # pylint: disable=W0603
+    if engine == 'numpy':
+        _table = NumpyTable(weekmask, holidays, validfrom, validto)
+    else:
+        _table = RollTable(weekmask, holidays, validfrom=validfrom,
+                           validto=validto)
+
+
+def _work(task):
+    """(PRIVATE) Run an operation on a shard, in a worker process."""
+    op, days, other = task
+    if op == 'isbusday':
+        return _table.isbusday(days)
+    elif op == 'adjust':
+        return todates(_table.adjust(days, other))
+    elif op == 'addbusdays':
+        return todates(_table.shift(days, other))
+    return _table.count(days, other)
+
+
+def _shards(op, days, other, chunksize):
+    """(PRIVATE) Generate the tasks of each shard."""
+    for start in range(0, len(days), chunksize):
+        stop = start + chunksize
+        if np.ndim(other):
+            yield op, days[start:stop], other[start:stop]
+        else:
+            yield op, days[start:stop], other
+
+
+def map_parallel(cal, op, dates, offsets=None, workers=None, chunksize=None):
+    """
+    Run a batch operation in a process pool, see `Calendar.map_parallel`.
+
+    Returns:
+        generator: Results of each shard, in order.
+    """
+    if op not in OPERATIONS:
+        raise ValueError('Invalid operation %s' % op)
+    days = asdays(dates).ravel()
+    if op == 'busdaycount':
+        days, other = np.broadcast_arrays(days, asdays(offsets).ravel())
+    elif op == 'addbusdays':
+        other = np.asarray(offsets, dtype='i8')
+        if other.ndim:
+            days, other = np.broadcast_arrays(days, other.ravel())
+        else:
+            other = int(other)
+    elif op == 'adjust':
+        other = FOLLOWING if offsets is None else offsets
+    else:
+        other = None
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, -(-len(days) // (workers * 4)))
+
+    return _imap(_state(cal), _shards(op, days, other, chunksize), workers)
+
+
+def _imap(state, tasks, workers):
+    """
+    (PRIVATE) Start the pool and yield the results of the tasks in order.
+    """
+    pool = multiprocessing.Pool(workers, _initworker, state)
+    try:
+        for result in pool.imap(_work, tasks):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
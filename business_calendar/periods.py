@@ -0,0 +1,77 @@
+"""
+The periods module labels dates with the business period they belong to.
+
+This module requires `numpy`. It is used through `Calendar.busperiod_key`,
+which turns an array of dates into integer group codes, one per business
+week, month, quarter or block of N business days, for aggregations with
+`numpy.bincount` or a pandas groupby.
+
+The boundaries of all periods spanned by the dates are computed once per
+call, and each date is then assigned its period with a single binary search
+on them, so there are no per-date calendar calls.
+
+Public Functions:
+    busperiod_key
+"""
+import numbers
+
+import numpy as np
+
+from .business_calendar import FOLLOWING
+from .table import asdays, todates
+
+__all__ = ['busperiod_key']
+
+# calendar period lengths in months
+MONTHS = {'M': 1, 'Q': 3}
+
+
+def _boundaries(table, freq, lo, hi):
+    """
+    (PRIVATE) Day numbers of the first day of each period from the one of
+    day lo up to the one of day hi.
+    """
+    if freq == 'W':
+        # weeks start on Monday, 1970-01-01 was a Thursday
+        first = lo - (lo + 3) % 7
+        return np.arange(first, hi + 1, 7)
+    if freq in MONTHS:
+        months = MONTHS[freq]
+        first = todates(lo).astype('M8[M]').view('i8') // months * months
+        last = todates(hi).astype('M8[M]').view('i8')
+        return np.arange(first, last + 1, months).astype(
+            'M8[M]').astype('M8[D]').view('i8')
+    # blocks of freq business days, counted from the first business day on
+    # or after 1970-01-01, which has index 1
+    first, last = (table.index(np.array([lo, hi])) - 1) // freq
+    return table.fromindex(np.arange(first, last + 1) * freq + 1)
+
+
+def busperiod_key(cal, dates, freq, roll):
+    """
+    Label dates with their business period, see `Calendar.busperiod_key`.
+
+    Returns:
+        tuple: Codes and first business day of each period.
+    """
+    blocks = isinstance(freq, numbers.Integral) and \
+        not isinstance(freq, bool)
+    if not (blocks and freq >= 1 or not blocks and freq in ('W', 'M', 'Q')):
+        raise ValueError('Invalid frequency %s' % (freq,))
+    days = asdays(dates)
+    flat = days.ravel()
+    present = ~np.isnat(todates(flat))
+    codes = np.full(flat.shape, -1, dtype='i8')
+    if not present.any():
+        return codes.reshape(days.shape), todates(np.empty(0, dtype='i8'))
+
+    table = cal._rolltable()
+    adjusted = flat[present]
+    if roll is not None:
+        adjusted = table.adjust(adjusted, roll)
+    starts = _boundaries(table, freq, int(adjusted.min()),
+                         int(adjusted.max()))
+    codes[present] = np.searchsorted(starts, adjusted, side='right') - 1
+    if not blocks:
+        starts = table.adjust(starts, FOLLOWING)
+    return codes.reshape(days.shape), todates(starts)
@@ -0,0 +1,221 @@
+"""
+The provider module keeps Calendars built from holiday files up to date in
+an asyncio application, without ever blocking the event loop.
+
+This module requires `asyncio`. The files are watched by polling their
+modification times, and changed files are parsed and their Calendars built in
+an executor. The new Calendars are then swapped in on the event loop thread,
+so readers always get a complete Calendar with a plain dict lookup:
+
+    >>> provider = HolidayFileProvider({'NYSE': 'nyse.txt'}, loop=loop)
+    >>> loop.run_until_complete(provider.start())
+    >>> cal = provider['NYSE']
+
+Holiday files have one date per line, blank lines and lines starting with
+'#' are ignored.
+
+Classes:
+    HolidayFileProvider
+
+Public Functions:
+    readholidays
+"""
+import asyncio
+import os
+
+from . import business_calendar as core
+from .business_calendar import Calendar
+
+__all__ = ['HolidayFileProvider', 'readholidays']
+
+
+def readholidays(path):
+    """
+    Read a holiday file.
+
+    Args:
+        path (str): File name.
+
+    Returns:
+        list: Holidays as returned by `parsefun`.
+    """
+    parsefun = core.parsefun # may be overridden at any time
+    with open(path) as holidayfile:
+        return [parsefun(line.strip()) for line in holidayfile
+                if line.strip() and not line.lstrip().startswith('#')]
+
+
+def _build(files, workdays, mtimes):
+    """
+    (PRIVATE) Build the Calendars of the files modified since mtimes, runs
+    in the executor. Returns the new Calendars and modification times.
+    """
+    calendars = {}
+    newmtimes = {}
+    for name, path in files.items():
+        mtime = os.stat(path).st_mtime
+        if mtimes.get(name) != mtime:
+            calendars[name] = Calendar(workdays=workdays,
+                                       holidays=readholidays(path))
+            newmtimes[name] = mtime
+    return calendars, newmtimes
+
+
+class HolidayFileProvider(object):
+    """
+    Calendars built from holiday files and reloaded when the files change.
+
+    Note:
+        All methods must be called from the event loop thread. Reloads run
+        one at a time in the executor and swap in a new dict of Calendars
+        in a single assignment, so readers see either all the old or all the
+        new Calendars and are never blocked. If a reload fails the old
+        Calendars are kept and the exception is kept in `error`.
+
+    Attributes:
+        files (dict): File name of each calendar, by calendar name.
+        workdays: Work days of all calendars, see `Calendar`.
+        interval (float): Seconds between checks of the files.
+        error (Exception): Exception of the last failed reload, or None.
+    """
+
+    def __init__(self, files, workdays=None, interval=5.0, loop=None,
+                 executor=None):
+        """
+        Initialize object, no file is read until `start` or `reload`.
+
+        Args:
+            files (dict): File name of each calendar, by calendar name.
+            workdays: Work days of all calendars, see `Calendar`.
+            interval (float): Seconds between checks of the files.
+            loop (asyncio.AbstractEventLoop): Event loop, defaults to the
+                current one.
+            executor (concurrent.futures.Executor): Executor where files are
+                parsed, defaults to the default executor of the loop. A
+                ProcessPoolExecutor keeps parsing off the interpreter of the
+                event loop altogether.
+        """
+        self.files = dict(files)
+        self.workdays = workdays
+        self.interval = interval
+        self.error = None
+        self._loop = loop
+        self._executor = executor
+        self._calendars = {}
+        self._mtimes = {}
+        self._pending = None
+        self._handle = None
+        self._metrics = {'reloads': 0, 'swaps': 0, 'errors': 0,
+                         'latency_last': None, 'latency_max': 0.0,
+                         'latency_total': 0.0}
+
+    @property
+    def loop(self):
+        """Event loop of the provider."""
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        return self._loop
+
+    def __getitem__(self, name):
+        """
+        Current Calendar of a file.
+
+        Args:
+            name (str): Name of the calendar.
+
+        Returns:
+            Calendar: Calendar built from the last version of the file read.
+        """
+        return self._calendars[name]
+
+    def __contains__(self, name):
+        return name in self._calendars
+
+    def get(self, name, default=None):
+        """Current Calendar of a file, or default if not loaded yet."""
+        return self._calendars.get(name, default)
+
+    def metrics(self):
+        """
+        Reload metrics.
+
+        Returns:
+            dict: Number of `reloads` run, `swaps` of Calendars and
+                `errors`, and the `latency_last`, `latency_max` and
+                `latency_total` of reloads in seconds, from the start of the
+                reload until the swap.
+        """
+        return dict(self._metrics)
+
+    def reload(self, force=False):
+        """
+        Check the files and rebuild the Calendars of the modified ones in the
+        executor.
+
+        Args:
+            force (bool): Rebuild all Calendars even if not modified.
+
+        Returns:
+            asyncio.Future: Future done after the swap, with the set of
+                names of the Calendars swapped. If a reload is already
+                running its future is returned.
+        """
+        if self._pending is not None and not self._pending.done():
+            return self._pending
+        loop = self.loop
+        mtimes = {} if force else dict(self._mtimes)
+        future = loop.run_in_executor(self._executor, _build, self.files,
+                                      self.workdays, mtimes)
+        done = asyncio.Future(loop=loop)
+        start = loop.time()
+
+        def swap(future):
+            """Swap in the new Calendars, on the event loop thread."""
+            self._metrics['reloads'] += 1
+            if future.exception() is not None:
+                self.error = future.exception()
+                self._metrics['errors'] += 1
+                done.set_exception(self.error)
+                return
+            calendars, newmtimes = future.result()
+            if calendars:
+                merged = dict(self._calendars)
+                merged.update(calendars)
+                self._calendars = merged # atomic for readers
+                self._mtimes.update(newmtimes)
+                self._metrics['swaps'] += 1
+            self.error = None
+            latency = loop.time() - start
+            self._metrics['latency_last'] = latency
+            self._metrics['latency_max'] = max(latency,
+                                               self._metrics['latency_max'])
+            self._metrics['latency_total'] += latency
+            done.set_result(set(calendars))
+
+        future.add_done_callback(swap)
+        self._pending = done
+        return done
+
+    def start(self):
+        """
+        Load all files and check them again every `interval` seconds.
+
+        Returns:
+            asyncio.Future: Future of the first load, see `reload`.
+        """
+        first = self.reload()
+        self._handle = self.loop.call_later(self.interval, self._poll)
+        return first
+
+    def stop(self):
+        """Stop checking the files."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _poll(self):
+        """(PRIVATE) Periodic check of the files."""
+        future = self.reload()
+        # errors are kept in error and metrics, not raised in the loop
+        future.add_done_callback(lambda future: future.exception())
+        self._handle = self.loop.call_later(self.interval, self._poll)
@@ -0,0 +1,294 @@
+"""
+The recurring module generates recurring dates, such as IMM dates, CDS roll
+dates or the last business day before some day of each month, adjusted by a
+Calendar.
+
+A recurrence is given by a function of a year returning its unadjusted dates,
+like `imm` or the ones built by `nthweekday` and `monthday`, and how the dates
+are adjusted:
+
+    >>> immdates = Recurrence(imm, cal, FOLLOWING)
+    >>> list(immdates.range('2015-01-01', '2016-01-01'))
+    >>> before15 = Recurrence(monthday(15), cal, None, offset=-1)
+
+The adjusted dates of each year are kept in a least recently used cache, so
+repeated queries over the same horizon do not call the calendar again. Only
+`Recurrence.array` requires `numpy`.
+
+Classes:
+    Recurrence
+
+Public Functions:
+    imm, cds, nthweekday, monthday
+"""
+import calendar
+import datetime
+
+from . import business_calendar as core
+from .business_calendar import FOLLOWING, PREVIOUS, WE
+
+__all__ = ['Recurrence', 'imm', 'cds', 'nthweekday', 'monthday']
+
+# months of the quarterly IMM and CDS dates
+QUARTERLY = (3, 6, 9, 12)
+
+
+def nthweekday(n, weekday, months=range(1, 13)):
+    """
+    Recurrence of the n-th week day of some months of each year.
+
+    Args:
+        n (integer): 1 for the first week day of the month, 2 for the second
+            and so on, -1 for the last, -2 for the one before and so on.
+        weekday (integer): Week day, MO to SU.
+        months: Months of the year, 1 to 12. Defaults to all.
+
+    Note:
+        Months without an n-th week day (the fifth, say) are skipped.
+
+    Returns:
+        function: Function of a year returning the list of its dates.
+    """
+    months = tuple(months)
+    if n == 0 or abs(n) > 5:
+        raise ValueError('Invalid week number %s' % n)
+
+    def dates(year):
+        """Dates of a year."""
+        result = []
+        for month in months:
+            if n > 0:
+                day = datetime.datetime(year, month, 1)
+                day += datetime.timedelta(
+                    days=(weekday - day.weekday()) % 7 + 7 * (n - 1))
+            else:
+                day = datetime.datetime(year, month,
+                                        calendar.monthrange(year, month)[1])
+                day -= datetime.timedelta(
+                    days=(day.weekday() - weekday) % 7 + 7 * (-n - 1))
+            if day.month == month:
+                result.append(day)
+        return result
+
+    return dates
+
+
+def monthday(day, months=range(1, 13)):
+    """
+    Recurrence of a day of some months of each year.
+
+    Args:
+        day (integer): Day of month, capped to the length of each month, so
+            31 is the last day of every month.
+        months: Months of the year, 1 to 12. Defaults to all.
+
+    Returns:
+        function: Function of a year returning the list of its dates.
+    """
+    months = tuple(months)
+
+    def dates(year):
+        """Dates of a year."""
+        return [datetime.datetime(year, month, min(
+            day, calendar.monthrange(year, month)[1])) for month in months]
+
+    return dates
+
+
+_imm = nthweekday(3, WE, QUARTERLY)
+_cds = monthday(20, QUARTERLY)
+
+
+def imm(year):
+    """
+    IMM dates of a year: third Wednesday of March, June, September and
+    December.
+
+    Args:
+        year (int): Year.
+
+    Returns:
+        list: Unadjusted dates, as datetime.
+    """
+    return _imm(year)
+
+
+def cds(year):
+    """
+    CDS roll dates of a year: 20th of March, June, September and December.
+
+    Args:
+        year (int): Year.
+
+    Returns:
+        list: Unadjusted dates, as datetime.
+    """
+    return _cds(year)
+
+
+def _convert(date, kind):
+    """
+    (PRIVATE) Convert a date to kind, either datetime.date or
+    datetime.datetime.
+    """
+    if kind is datetime.datetime:
+        if not isinstance(date, datetime.datetime):
+            date = datetime.datetime(date.year, date.month, date.day)
+    elif isinstance(date, datetime.datetime):
+        date = date.date()
+    return date
+
+
+def _kind(cal):
+    """
+    (PRIVATE) Class of the dates of a calendar: datetime.date if its
+    holidays (or validity window) are dates, datetime.datetime otherwise,
+    like the dates parsed from strings.
+    """
+    if cal is not None:
+        for date in cal.holidays[:1] + [cal.valid_from, cal.valid_to]:
+            if date is not None:
+                return datetime.datetime if \
+                    isinstance(date, datetime.datetime) else datetime.date
+    return datetime.datetime
+
+
+class Recurrence(object):
+    """
+    Recurring dates adjusted by a calendar.
+
+    Note:
+        Each date is adjusted with `Calendar.adjust`, if a mode is given, and
+        then moved by offset business days with `Calendar.addbusdays`. Dates
+        are datetime.date if the holidays of the calendar are, otherwise
+        datetime.datetime. The cache is cleared whenever the work days, holidays or validity window
+        of the calendar are replaced (or the holiday list changes length).
+        Adjusted dates are assumed to stay within a year of the unadjusted
+        ones.
+
+    Attributes:
+        dates (function): Function of a year returning its unadjusted dates,
+            in order.
+        cal (Calendar): Calendar used to adjust the dates, None to keep them
+            unadjusted.
+        mode (integer): FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING or None.
+        offset (integer): Business days added after adjusting.
+        cachesize (int): Maximum number of years kept in memory.
+        hits (int): Years found in the cache.
+        misses (int): Years computed.
+    """
+
+    def __init__(self, dates, cal=None, mode=FOLLOWING, offset=0,
+                 cachesize=256):
+        """
+        Initialize object.
+
+        Args:
+            dates (function): Function of a year returning its unadjusted
+                dates, in order, such as `imm`.
+            cal (Calendar): Calendar used to adjust the dates.
+            mode (integer): FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING or None
+                not to adjust.
+            offset (integer): Business days added after adjusting.
+            cachesize (int): Maximum number of years kept in memory.
+        """
+        self.dates = dates
+        self.cal = cal
+        self.mode = mode
+        self.offset = offset
+        self._cache = core._LRUCache(cachesize)
+        self._cachekey = None
+
+    @property
+    def cachesize(self):
+        """Maximum number of years kept in memory."""
+        return self._cache.maxsize
+
+    @cachesize.setter
+    def cachesize(self, cachesize):
+        self._cache.maxsize = cachesize
+
+    @property
+    def hits(self):
+        """Years found in the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        """Years computed."""
+        return self._cache.misses
+
+    def year(self, year):
+        """
+        Adjusted dates of a year, from the cache if possible.
+
+        Args:
+            year (int): Year of the unadjusted dates.
+
+        Returns:
+            tuple: Sorted tuple of datetime, or of date, see `Recurrence`.
+        """
+        cal = self.cal
+        if cal is not None:
+            key = cal._state()
+            if not core._samestate(key, self._cachekey):
+                self._cache.clear()
+                self._cachekey = key
+        dates = self._cache.get(year)
+        if dates is core._LRUCache.missing:
+            kind = _kind(cal)
+            dates = [_convert(date, kind) for date in self.dates(year)]
+            if cal is not None:
+                if self.mode is not None:
+                    dates = [cal.adjust(date, self.mode) for date in dates]
+                if self.offset:
+                    dates = [cal.addbusdays(date, self.offset)
+                             for date in dates]
+            dates = tuple(dates)
+            self._cache.put(year, dates)
+        return dates
+
+    def range(self, date1, date2):
+        """
+        Generate the recurring dates between two dates.
+
+        Args:
+            date1 (date, datetime or str): Date start of interval.
+            date2 (date, datetime or str): Date end of interval, not included.
+
+        Note:
+            Adjusted dates are returned, the unadjusted ones may fall outside
+            of the interval.
+
+        Yields:
+            datetime or date: Recurring dates in the specified range.
+        """
+        kind = _kind(self.cal)
+        date1 = _convert(core.parsefun(date1), kind)
+        date2 = _convert(core.parsefun(date2), kind)
+        if date1 >= date2:
+            return
+        year1 = date1.year
+        year2 = (date2 - datetime.timedelta(days=1)).year
+        # dates of the previous year may be moved forward into the range,
+        # dates of the next year back into it
+        if self.cal is not None:
+            if self.mode == FOLLOWING or self.offset > 0:
+                year1 = max(year1 - 1, datetime.MINYEAR)
+            if self.mode == PREVIOUS or self.offset < 0:
+                year2 = min(year2 + 1, datetime.MAXYEAR)
+        for year in range(year1, year2 + 1):
+            for date in self.year(year):
+                if date1 <= date < date2:
+                    yield date
+
+    def array(self, date1, date2):
+        """
+        Recurring dates between two dates as an array, see `range`. Requires
+        numpy.
+
+        Returns:
+            numpy.ndarray: Array of `datetime64[D]`.
+        """
+        import numpy
+        return numpy.array(list(self.range(date1, date2)), dtype='M8[D]')
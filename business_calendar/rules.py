@@ -0,0 +1,255 @@
+"""
+The rules module describes date rules as chains of steps, which are compiled
+against a Calendar and evaluated on whole arrays of dates.
+
+This module requires `numpy`. A rule is built by chaining steps, starting
+from the class itself, and compiling it gives a function of the anchor
+dates:
+
+    >>> rule = Rule.addbus(2).eom().adjust(PREVIOUS).addbus(-1)
+    >>> fun = rule.compile(cal)
+    >>> fun(trades['date'].values)
+
+Steps are run on arrays of int64 day numbers through the shared table of the
+calendar, so no date objects are created along the way, and consecutive
+steps are fused when compiling: days and business days added are summed,
+and adjustments of dates that are already business days are dropped.
+
+Classes:
+    Rule
+"""
+import numbers
+import types
+
+import numpy as np
+
+from .business_calendar import FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+from .schedule import _monthdays
+from .table import asdays, todates
+
+__all__ = ['Rule']
+
+
+class _step(object):
+    """
+    (PRIVATE) Method of Rule that can also be called on the class, which
+    starts a new rule with it.
+    """
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.__doc__ = fun.__doc__
+
+    def __get__(self, rule, cls):
+        if rule is None:
+            rule = cls()
+        return types.MethodType(self.fun, rule)
+
+
+def _integer(n):
+    """(PRIVATE) Check that an argument of a step is an integer."""
+    if not isinstance(n, numbers.Integral) or isinstance(n, bool):
+        raise ValueError('Invalid number %s' % (n,))
+    return int(n)
+
+
+def _fuse(steps):
+    """
+    (PRIVATE) Merge consecutive steps. A run of business day steps becomes a
+    single ('bus', first, extra) stage, where first is the step that moves
+    the date to a business day and extra the business days added after it.
+    """
+    stages = []
+    for name, arg in steps:
+        last = stages[-1] if stages else (None, None)
+        if name in ('adddays', 'addmonths', 'addbus') and arg == 0:
+            continue # identity
+        if name == 'adddays' and last[0] == 'adddays':
+            stages[-1] = ('adddays', last[1] + arg)
+        elif name == 'eom' and last[0] == 'eom':
+            continue
+        elif name in ('adjust', 'addbus') and last[0] == 'bus':
+            # the date is already a business day, adjusting it does nothing
+            if name == 'addbus':
+                stages[-1] = ('bus', last[1], last[2] + arg)
+        elif name in ('adjust', 'addbus'):
+            stages.append(('bus', (name, arg), 0))
+        else:
+            stages.append((name, arg))
+    return stages
+
+
+def _run(table, stages, days):
+    """(PRIVATE) Run the stages on an array of day numbers."""
+    for stage in stages:
+        if stage[0] == 'adddays':
+            days = days + stage[1]
+        elif stage[0] == 'addmonths':
+            months = todates(days).astype('M8[M]')
+            day = days - months.astype('M8[D]').view('i8') + 1
+            days = _monthdays(months + stage[1], day, False)
+        elif stage[0] == 'eom':
+            days = _monthdays(todates(days).astype('M8[M]'), 31, True)
+        else:
+            (name, arg), extra = stage[1:]
+            if name == 'addbus' and arg * extra > 0:
+                # same direction, a single shift
+                arg, extra = arg + extra, 0
+            if name == 'addbus':
+                days = table.shift(days, arg)
+            else:
+                days = table.adjust(days, arg)
+            if extra:
+                days = table.shift(days, extra)
+    return days
+
+
+class Rule(object):
+    """
+    Date rule made of a chain of steps.
+
+    Note:
+        Rules are immutable, every step returns a new rule, so a rule can be
+        extended in different ways. Steps can be called on the class to
+        start a rule, `Rule()` is the rule that leaves dates unchanged.
+
+    Attributes:
+        steps (tuple): Steps of the rule, as (name, argument) pairs.
+    """
+
+    def __init__(self, steps=()):
+        """
+        Initialize object.
+
+        Args:
+            steps: Steps of the rule, as (name, argument) pairs.
+        """
+        self.steps = tuple(steps)
+
+    def __repr__(self):
+        return 'Rule' + ''.join(
+            '.%s(%s)' % (name, '' if arg is None else arg)
+            for name, arg in self.steps)
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.steps == other.steps
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.steps)
+
+    def _then(self, name, arg=None):
+        """(PRIVATE) New rule with one more step."""
+        return self.__class__(self.steps + ((name, arg),))
+
+    @_step
+    def adddays(self, n):
+        """
+        Add calendar days.
+
+        Args:
+            n (integer): Number of days, negative to move back.
+
+        Returns:
+            Rule: New rule.
+        """
+        return self._then('adddays', _integer(n))
+
+    @_step
+    def addmonths(self, n):
+        """
+        Add months, keeping the day of month capped to the length of the new
+        month.
+
+        Args:
+            n (integer): Number of months, negative to move back.
+
+        Returns:
+            Rule: New rule.
+        """
+        return self._then('addmonths', _integer(n))
+
+    @_step
+    def eom(self):
+        """
+        Move to the last calendar day of the month, see `adjust` for the last
+        business day.
+
+        Returns:
+            Rule: New rule.
+        """
+        return self._then('eom')
+
+    @_step
+    def addbus(self, n):
+        """
+        Add business days, same semantics as `Calendar.addbusdays`.
+
+        Args:
+            n (integer): Number of business days, negative to move back.
+
+        Returns:
+            Rule: New rule.
+        """
+        return self._then('addbus', _integer(n))
+
+    @_step
+    def adjust(self, mode):
+        """
+        Adjust to a business day, same semantics as `Calendar.adjust`.
+
+        Args:
+            mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING.
+
+        Returns:
+            Rule: New rule.
+        """
+        if mode not in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+            raise ValueError('Invalid mode %s' % (mode,))
+        return self._then('adjust', mode)
+
+    def compile(self, cal):
+        """
+        Compile the rule against a calendar.
+
+        Args:
+            cal (Calendar): Calendar of the business day steps.
+
+        Note:
+            The function returned uses the shared table of the calendar, so
+            changes to its holidays are seen by later calls.
+
+        Returns:
+            function: Function of an array of anchor dates (missing values
+                allowed) returning the `datetime64[D]` array of the dates
+                given by the rule, with the same shape. Missing dates stay
+                missing.
+        """
+        stages = _fuse(self.steps)
+
+        def evaluate(dates):
+            """Evaluate the rule on an array of dates."""
+            days = asdays(dates)
+            result = todates(days).copy()
+            present = ~np.isnat(result)
+            if present.any():
+                result[present] = todates(_run(cal._rolltable(), stages,
+                                               days[present]))
+            return result
+
+        return evaluate
+
+    def apply(self, cal, dates):
+        """
+        Evaluate the rule once, see `compile`.
+
+        Args:
+            cal (Calendar): Calendar of the business day steps.
+            dates (sequence or array): Anchor dates.
+
+        Returns:
+            numpy.ndarray: Array of `datetime64[D]`.
+        """
+        return self.compile(cal)(dates)
@@ -0,0 +1,97 @@
+"""
+The schedule module generates coupon and payment schedules in batch.
+
+This module requires `numpy`. It is used through `Calendar.schedule`, which
+generates any number of schedules in a single vectorized pass and returns
+them as columnar `numpy.datetime64[D]` arrays. All date rolling goes through
+the shared RollTable of the calendar.
+
+Classes:
+    Schedule
+
+Public Functions:
+    generate
+"""
+import collections
+
+import numpy as np
+
+from .table import asdays, todates
+
+__all__ = ['Schedule', 'generate']
+
+# named tuple returned by generate, one row per schedule date
+Schedule = collections.namedtuple('Schedule', ['schedule', 'unadjusted',
+                                               'adjusted', 'fixing',
+                                               'payment'])
+
+
+def _monthdays(months, day, eom):
+    """
+    (PRIVATE) Day numbers of the given day in each month, capped to the
+    month length, or the last day of the month where eom is True.
+    """
+    first = months.astype('M8[M]').astype('M8[D]').view('i8')
+    length = (months + 1).astype('M8[M]').astype('M8[D]').view('i8') - first
+    return first + np.where(eom, length, np.minimum(day, length)) - 1
+
+
+def generate(cal, start, end, months, mode, backward=True, eom=False,
+             fixing=0, payment=0):
+    """
+    Generate schedules of periodic dates, see `Calendar.schedule`.
+
+    Returns:
+        Schedule: Named tuple of columnar arrays.
+    """
+    start, end = np.broadcast_arrays(asdays(start).ravel(),
+                                     asdays(end).ravel())
+    if months <= 0:
+        raise ValueError('Invalid period of %s months' % months)
+    if np.any(end <= start):
+        raise ValueError('Schedule end dates must be after start dates')
+
+    startmonth = todates(start).astype('M8[M]').view('i8')
+    endmonth = todates(end).astype('M8[M]').view('i8')
+    nmonths, rest = np.divmod(endmonth - startmonth, months)
+
+    # the anchor date is rolled by whole periods towards the other end of the
+    # schedule, which is kept as a (short) stub if the periods do not fit
+    if backward:
+        anchormonth, anchor, othermonth = endmonth, end, startmonth
+    else:
+        anchormonth, anchor, othermonth = startmonth, start, endmonth
+    anchorday = anchor - _monthdays(anchormonth, 1, False) + 1
+    anchoreom = eom & (_monthdays(anchormonth, 31, True) == anchor)
+    other = _monthdays(othermonth, anchorday, anchoreom)
+    if backward:
+        ndates = nmonths + ((rest != 0) | (other > start))
+    else:
+        ndates = nmonths + ((rest != 0) | (other < end))
+
+    # flat row layout: each schedule has the anchor, the rolled dates and
+    # the stub (or the exact other end) as its ndates + 1 rows
+    nrows = ndates + 1
+    sched = np.repeat(np.arange(len(start)), nrows)
+    first = np.repeat(np.cumsum(nrows) - nrows, nrows)
+    row = np.arange(len(sched)) - first
+    if backward:
+        step = np.repeat(ndates, nrows) - row
+        dates = _monthdays(np.repeat(anchormonth, nrows) - step * months,
+                           np.repeat(anchorday, nrows),
+                           np.repeat(anchoreom, nrows))
+        dates[row == 0] = start
+    else:
+        dates = _monthdays(np.repeat(anchormonth, nrows) + row * months,
+                           np.repeat(anchorday, nrows),
+                           np.repeat(anchoreom, nrows))
+        dates[row == np.repeat(ndates, nrows)] = end
+
+    table = cal._rolltable()
+    if mode is None:
+        adjusted = dates
+    else:
+        adjusted = table.adjust(dates, mode)
+    return Schedule(sched, todates(dates), todates(adjusted),
+                    todates(table.shift(adjusted, fixing)),
+                    todates(table.shift(adjusted, payment)))
@@ -0,0 +1,137 @@
+"""
+The settlement module computes value dates that must be good on several
+calendars, such as FX spot dates or settlement of cross-listed securities.
+
+This module requires `numpy`. T+n is counted on one calendar, then rolled to
+a business day of the joint calendar of all the markets required to be open,
+which is a Calendar itself: a day is a business day on it only if it is a
+business day on each of them. The joint calendar and its table are built
+once and reused by every batch, so a batch costs two table lookups per
+date, like the single calendar array functions:
+
+    >>> spot = Settlement(gbp, [gbp, usd])
+    >>> spot.value_dates(trades['date'].values, 2)
+
+Classes:
+    Settlement
+
+Public Functions:
+    joint
+"""
+import numpy as np
+
+from .business_calendar import Calendar, FOLLOWING, PREVIOUS, \
+    MODIFIEDFOLLOWING, _samestate
+from .table import asdays, todates
+
+__all__ = ['Settlement', 'joint']
+
+
+def joint(calendars):
+    """
+    Joint calendar of several calendars, where a day is a business day only
+    if it is a business day on all of them.
+
+    Args:
+        calendars: Sequence of Calendars.
+
+    Note:
+        The work days are the ones common to all calendars, the holidays
+        the union of their holidays and the validity window the
+        intersection of their windows.
+
+    Returns:
+        Calendar: New calendar.
+    """
+    calendars = list(calendars)
+    if not calendars:
+        raise ValueError('No calendars')
+    workdays = set(calendars[0].workdays)
+    for cal in calendars[1:]:
+        workdays &= set(cal.workdays)
+    holidays = [hol for cal in calendars for hol in cal.holidays]
+    validfrom = [cal.valid_from for cal in calendars
+                 if cal.valid_from is not None]
+    validto = [cal.valid_to for cal in calendars if cal.valid_to is not None]
+    return Calendar(workdays=sorted(workdays), holidays=holidays,
+                    valid_from=max(validfrom) if validfrom else None,
+                    valid_to=min(validto) if validto else None)
+
+
+class Settlement(object):
+    """
+    Value date calculator: T+n business days on a counting calendar, rolled
+    to a day on which all the required calendars are open.
+
+    Note:
+        The counting calendar is not required to be open on the value date
+        unless it is in the required calendars too. The joint calendar is
+        rebuilt whenever calendars are added to or removed from `required`,
+        or the work days, holidays or validity window of a required calendar
+        are replaced (or the holiday list changes length).
+
+    Attributes:
+        cal (Calendar): Calendar on which business days are counted.
+        required (tuple): Calendars that must be open on the value date.
+        mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING, how the
+            counted date is rolled to a business day of the joint calendar.
+    """
+
+    def __init__(self, cal, required=(), mode=FOLLOWING):
+        """
+        Initialize object, the joint calendar is built on first use.
+
+        Args:
+            cal (Calendar): Calendar on which business days are counted.
+            required: Sequence of Calendars that must be open on the value
+                date.
+            mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING.
+        """
+        if mode not in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+            raise ValueError('Invalid mode %s' % (mode,))
+        self.cal = cal
+        self.required = tuple(required)
+        self.mode = mode
+        self._joint = None
+        self._jointkey = None
+
+    @property
+    def joint(self):
+        """Joint calendar of the required calendars, or None."""
+        if not self.required:
+            return None
+        key = [cal._state() for cal in self.required]
+        if self._joint is None or len(key) != len(self._jointkey) or \
+                not all(_samestate(*states)
+                        for states in zip(self._jointkey, key)):
+            self._joint = joint(self.required)
+            self._jointkey = key
+        self._joint.engine = self.cal.engine
+        return self._joint
+
+    def value_dates(self, dates, n):
+        """
+        Value dates of an array of trade dates.
+
+        Args:
+            dates (sequence or array): Trade dates, missing values (NaT)
+                allowed.
+            n (integer or array): Business days from trade to value date on
+                the counting calendar, either the same for all dates or one
+                per date.
+
+        Returns:
+            numpy.ndarray: Array of `datetime64[D]` with the shape of dates
+                and n broadcast together. Missing dates stay missing.
+        """
+        days, n = np.broadcast_arrays(asdays(dates),
+                                      np.asarray(n, dtype='i8'))
+        result = todates(days).copy()
+        present = ~np.isnat(result)
+        if present.any():
+            spot = self.cal._rolltable().shift(days[present], n[present])
+            jointcal = self.joint
+            if jointcal is not None:
+                spot = jointcal._rolltable().adjust(spot, self.mode)
+            result[present] = todates(spot)
+        return result
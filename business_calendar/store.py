@@ -0,0 +1,203 @@
+"""
+The store module keeps the holidays of many calendars in a SQLite database.
+
+Holiday master data for hundreds of calendars over many years is bulk loaded
+once into the database, indexed on (calendar, date), and each process only
+fetches the years it needs when creating a Calendar:
+
+    >>> store = HolidayStore('holidays.db')
+    >>> store.bulkload(rows) # (calendar, date) pairs
+    >>> cal = store.calendar('BRSP', 2015, 2025)
+
+Holidays are fetched in blocks of one calendar year, which are kept in a
+least recently used cache so that creating calendars over overlapping years
+does not query the database again. Only the standard library `sqlite3` is
+required.
+
+Classes:
+    HolidayStore
+"""
+import datetime
+import sqlite3
+
+from . import business_calendar as core
+from .business_calendar import Calendar
+
+__all__ = ['HolidayStore']
+
+
+class HolidayStore(object):
+    """
+    Holidays of many calendars stored in a SQLite database.
+
+    Note:
+        Dates are stored as proleptic Gregorian ordinals (see
+        `datetime.date.toordinal`) in the table `holidays(calendar, date)`,
+        with a unique index on (calendar, date) that serves every query.
+        Holidays are returned as `datetime.datetime`, like the ones parsed
+        by Calendar.
+
+    Attributes:
+        connection (sqlite3.Connection): Connection to the database.
+        cachesize (int): Maximum number of year blocks kept in memory.
+        hits (int): Year blocks found in the cache.
+        misses (int): Year blocks fetched from the database.
+    """
+
+    def __init__(self, path=':memory:', cachesize=256):
+        """
+        Open (or create) the database.
+
+        Args:
+            path (str): File name of the database, by default an in-memory
+                database is created.
+            cachesize (int): Maximum number of year blocks kept in memory.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS holidays ('
+                                'calendar TEXT NOT NULL, '
+                                'date INTEGER NOT NULL)')
+        self.connection.execute('CREATE UNIQUE INDEX IF NOT EXISTS '
+                                'holidays_calendar_date '
+                                'ON holidays (calendar, date)')
+        self.connection.commit()
+        self._cache = core._LRUCache(cachesize)
+
+    @property
+    def cachesize(self):
+        """Maximum number of year blocks kept in memory."""
+        return self._cache.maxsize
+
+    @cachesize.setter
+    def cachesize(self, cachesize):
+        self._cache.maxsize = cachesize
+
+    @property
+    def hits(self):
+        """Year blocks found in the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        """Year blocks fetched from the database."""
+        return self._cache.misses
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def bulkload(self, rows):
+        """
+        Import holidays in a single transaction.
+
+        Args:
+            rows: Iterable of (calendar, date) pairs, where calendar is the
+                name of the calendar and date a date, datetime or str.
+                Holidays already in the store are ignored.
+
+        Returns:
+            int: Number of holidays inserted.
+        """
+        parsefun = core.parsefun # speed up
+        before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO holidays (calendar, date) '
+                'VALUES (?, ?)',
+                ((name, parsefun(date).toordinal()) for name, date in rows))
+        self._cache.clear()
+        return self.connection.total_changes - before
+
+    def load(self, name, holidays):
+        """
+        Import the holidays of one calendar, see `bulkload`.
+
+        Args:
+            name (str): Name of the calendar.
+            holidays: Iterable of dates, datetimes or strs.
+
+        Returns:
+            int: Number of holidays inserted.
+        """
+        return self.bulkload((name, date) for date in holidays)
+
+    def names(self):
+        """
+        Names of the calendars in the store.
+
+        Returns:
+            list: Sorted list of str.
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT DISTINCT calendar FROM holidays ORDER BY calendar')]
+
+    def holidays(self, name, date1, date2):
+        """
+        Holidays of a calendar between two dates, straight from the database.
+
+        Args:
+            name (str): Name of the calendar.
+            date1 (date, datetime or str): Date start of interval.
+            date2 (date, datetime or str): Date end of interval, included.
+
+        Returns:
+            list: Sorted list of datetime.
+        """
+        return self._fetch(name, core.parsefun(date1).toordinal(),
+                           core.parsefun(date2).toordinal() + 1)
+
+    def _fetch(self, name, start, stop):
+        """
+        (PRIVATE) Holidays of a calendar with ordinals in [start, stop).
+        """
+        fromordinal = datetime.datetime.fromordinal # speed up
+        return [fromordinal(row[0]) for row in self.connection.execute(
+            'SELECT date FROM holidays WHERE calendar = ? AND date >= ? '
+            'AND date < ? ORDER BY date', (name, start, stop))]
+
+    def year(self, name, year):
+        """
+        Holidays of a calendar in a year, from the cache if possible.
+
+        Args:
+            name (str): Name of the calendar.
+            year (int): Year.
+
+        Returns:
+            tuple: Sorted tuple of datetime.
+        """
+        key = (name, year)
+        block = self._cache.get(key)
+        if block is core._LRUCache.missing:
+            block = tuple(self._fetch(
+                name, datetime.date(year, 1, 1).toordinal(),
+                datetime.date(year + 1, 1, 1).toordinal()))
+            self._cache.put(key, block)
+        return block
+
+    def calendar(self, name, year1, year2=None, workdays=None):
+        """
+        Create a Calendar with the holidays of some years only.
+
+        Args:
+            name (str): Name of the calendar.
+            year1 (int): First year.
+            year2 (int): Last year, defaults to year1.
+            workdays: List or tuple of week days considered 'work days',
+                see `Calendar`.
+
+        Note:
+            The validity window of the calendar is set to the years fetched,
+            so it warns about dates outside of them.
+
+        Returns:
+            Calendar: New calendar.
+        """
+        if year2 is None:
+            year2 = year1
+        holidays = []
+        for year in range(year1, year2 + 1):
+            holidays.extend(self.year(name, year))
+        return Calendar(workdays=workdays, holidays=holidays,
+                        valid_from=datetime.datetime(year1, 1, 1),
+                        valid_to=datetime.datetime(year2, 12, 31))
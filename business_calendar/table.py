@@ -0,0 +1,562 @@
+"""
+The table module contains the precomputed business day table shared by the
+array (batch) APIs of Calendar.
+
+This module requires `numpy`. Dates are handled internally as integer day
+numbers counted from 1970-01-01, which is the representation used by
+`numpy.datetime64[D]`, so converting to and from arrays is free.
+
+The table covers a window of days and stores, for every day in the window,
+whether it is a business day and the cumulative count of business days up to
+and including that day. Every batch operation is then a couple of indexed
+lookups:
+
+    isbusday(d)       -> mask[d]
+    busdaycount(a, b) -> cum[b] - cum[a]
+    addbusdays(d, n)  -> busdays[cum[d] + n - 1]  (n > 0)
+
+The window grows automatically whenever a query falls outside of it. It is
+not to be confused with the validity window of the calendar: every operation
+checks the minimum and maximum of its days once against it, and warns with a
+CalendarHolidayWarning if any day given or returned is outside of it.
+
+NumpyTable has the same interface but dispatches every operation to the
+business day functions of numpy, it is used by calendars whose `engine` is
+'numpy'.
+
+Classes:
+    RollTable, NumpyTable
+
+Public Functions:
+    asdays, todates
+"""
+import datetime
+
+import numpy as np
+
+from . import business_calendar as core
+from .business_calendar import FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+
+__all__ = ['RollTable', 'NumpyTable', 'asdays', 'todates']
+
+# ordinal of 1970-01-01, the datetime64 epoch, which was a Thursday
+EPOCH = datetime.date(1970, 1, 1).toordinal()
+EPOCH_WEEKDAY = 3
+
+# number of days added around a window every time the table is (re)built
+PADDING = 366
+
+# day number of NaT, the missing date
+NAT = np.iinfo(np.int64).min
+
+
+def asdays(dates):
+    """
+    Convert dates to an array of day numbers since 1970-01-01.
+
+    Args:
+        dates: A date, datetime or str, a sequence of those, or an array of
+            `numpy.datetime64` of any unit. Time of day is discarded.
+
+    Returns:
+        numpy.ndarray: Array of int64 day numbers with the shape of the input.
+    """
+    arr = np.asarray(dates)
+    if arr.dtype.kind != 'M':
+        try:
+            arr = np.array(dates, dtype='M8[D]')
+        except (ValueError, TypeError):
+            parsefun = core.parsefun # may be overridden at any time
+            arr = np.array([parsefun(d) for d in arr.ravel()],
+                           dtype='M8[D]').reshape(arr.shape)
+    return arr.astype('M8[D]').view('i8')
+
+
+def todates(days):
+    """
+    Convert day numbers since 1970-01-01 to an array of `datetime64[D]`.
+
+    Args:
+        days (numpy.ndarray): Integer day numbers.
+
+    Returns:
+        numpy.ndarray: Array of `datetime64[D]`.
+    """
+    return np.asarray(days, dtype='i8').view('M8[D]')
+
+
+def _checknat(lo):
+    """
+    (PRIVATE) Raise ValueError if lo, the first day of an array, is NaT: the
+    tables do not handle missing dates, callers mask them out first.
+    """
+    if lo == NAT:
+        raise ValueError('Missing dates (NaT) are not supported')
+
+
+class _Table(object):
+    """
+    (PRIVATE) Validity window check shared by the tables.
+    """
+
+    # first and last day numbers covered by the holiday list, None if open
+    validfrom = None
+    validto = None
+
+    def _checkwindow(self, lo, hi):
+        """
+        (PRIVATE) Warn if the days lo to hi are not inside the validity
+        window. The warning is attributed to the first caller outside of
+        this package, however deep the table is called.
+        """
+        if self.validfrom is not None and lo < self.validfrom:
+            core.warn('Holiday list exhausted at start, ' \
+                      'array output may be incorrect.', None)
+        if self.validto is not None and hi > self.validto:
+            core.warn('Holiday list exhausted at end, ' \
+                      'array output may be incorrect.', None)
+
+    def _checkdays(self, *arrays):
+        """
+        (PRIVATE) Check the days of several arrays against the validity
+        window at once, so that an operation warns only once.
+        """
+        arrays = [days for days in arrays if days.size]
+        if arrays:
+            self._checkwindow(min(int(days.min()) for days in arrays),
+                              max(int(days.max()) for days in arrays))
+
+
+class RollTable(_Table):
+    """
+    Precomputed business day table of a calendar over a window of days.
+
+    Note:
+        The table is built from a week mask and a holiday list and knows
+        nothing about the Calendar that created it. It is rebuilt over a
+        wider window by `cover` whenever a query requires so, so callers must
+        always go through `cover` (or the operations below, which call it)
+        before indexing the arrays directly.
+
+    Attributes:
+        lo (int): First day number of the window.
+        hi (int): Last day number of the window (inclusive).
+        mask (numpy.ndarray): Business day flag for each day of the window.
+        cum (numpy.ndarray): Number of business days from `lo` up to and
+            including each day of the window.
+        busdays (numpy.ndarray): Day numbers of all business days in the
+            window.
+        base (int): Number of business days in the window before
+            1970-01-01, so that `cum - base` does not depend on the window.
+        validfrom (int): First day number of the validity window, or None.
+        validto (int): Last day number of the validity window, or None.
+    """
+
+    def __init__(self, weekmask, holidays, lo=None, hi=None, validfrom=None,
+                 validto=None):
+        """
+        Initialize the table.
+
+        Args:
+            weekmask: Sequence of 7 booleans, Monday first, True for work
+                days.
+            holidays: Sorted array of holiday day numbers.
+            lo (int): First day of the initial window. Defaults to the first
+                holiday or today.
+            hi (int): Last day of the initial window. Defaults to the last
+                holiday or today.
+            validfrom (int): First day of the validity window, None if the
+                window is open at the start.
+            validto (int): Last day of the validity window, None if the
+                window is open at the end.
+        """
+        self.validfrom = validfrom
+        self.validto = validto
+        self.weekmask = np.array(weekmask, dtype=bool)
+        if not self.weekmask.any():
+            raise ValueError('Calendar has no work days')
+        self.holidays = np.asarray(holidays, dtype='i8')
+        if lo is None or hi is None:
+            if len(self.holidays):
+                lo, hi = self.holidays[0], self.holidays[-1]
+            else:
+                lo = hi = datetime.date.today().toordinal() - EPOCH
+        self.lo = self.hi = None
+        self._build(int(lo) - PADDING, int(hi) + PADDING)
+
+    def _build(self, lo, hi):
+        """(PRIVATE) Build all arrays for the window [lo, hi]."""
+        days = np.arange(lo, hi + 1, dtype='i8')
+        mask = self.weekmask[(days + EPOCH_WEEKDAY) % 7]
+        i, j = np.searchsorted(self.holidays, [lo, hi + 1])
+        mask[self.holidays[i:j] - lo] = False
+        self.mask = mask
+        self.cum = np.cumsum(mask, dtype='i8')
+        self.busdays = days[mask]
+        if lo <= 0:
+            self.base = int(np.searchsorted(self.busdays, 0))
+        else:
+            self.base = -self._countrange(0, lo)
+        self.lo, self.hi = lo, hi
+
+    def _countrange(self, start, stop):
+        """
+        (PRIVATE) Number of business days in [start, stop) computed in
+        closed form, without building the mask of the days.
+        """
+        weeks, rest = divmod(stop - start, 7)
+        tail = np.arange(stop - rest, stop)
+        i, j = np.searchsorted(self.holidays, [start, stop])
+        return int(weeks * self.weekmask.sum() +
+                   self.weekmask[(tail + EPOCH_WEEKDAY) % 7].sum() - (j - i))
+
+    def cover(self, lo, hi):
+        """
+        Make sure the window includes the days [lo, hi].
+
+        Args:
+            lo (int): First day number required.
+            hi (int): Last day number required.
+        """
+        if lo < self.lo or hi > self.hi:
+            self._build(min(lo - PADDING, self.lo),
+                        max(hi + PADDING, self.hi))
+
+    def coverdays(self, days, check=True):
+        """
+        Make sure the window includes all days of an array, and check them
+        against the validity window.
+
+        Args:
+            days (numpy.ndarray): Day numbers required.
+            check (bool): False to skip the validity window check, for
+                operations that check their input and output at once.
+        """
+        if days.size:
+            lo, hi = int(days.min()), int(days.max())
+            _checknat(lo)
+            self.cover(lo, hi)
+            if check:
+                self._checkwindow(lo, hi)
+
+    def isbusday(self, days):
+        """
+        Check if each day is a business day.
+
+        Args:
+            days (numpy.ndarray): Day numbers.
+
+        Returns:
+            numpy.ndarray: Array of bool.
+        """
+        self.coverdays(days)
+        return self.mask[days - self.lo]
+
+    def index(self, days):
+        """
+        Business day index of each day, the number of business days from
+        1970-01-01 up to and including the day (negative before 1970).
+
+        Note:
+            The difference of the indexes of two days is the number of
+            business days between them, COB to COB.
+
+        Args:
+            days (numpy.ndarray): Day numbers.
+
+        Returns:
+            numpy.ndarray: Array of int64.
+        """
+        self.coverdays(days)
+        return self.cum[days - self.lo] - self.base
+
+    def range(self, start, stop):
+        """
+        Business days in the interval [start, stop).
+
+        Args:
+            start (int): Day number start of interval.
+            stop (int): Day number end of interval, not included.
+
+        Returns:
+            numpy.ndarray: Array of int64 day numbers.
+        """
+        if stop <= start:
+            return np.empty(0, dtype='i8')
+        self.cover(start, stop)
+        self._checkwindow(start, stop - 1)
+        i, j = np.searchsorted(self.busdays, [start, stop])
+        return self.busdays[i:j].copy()
+
+    def count(self, days1, days2):
+        """
+        Count business days between two arrays of day numbers, COB to COB.
+
+        Args:
+            days1 (numpy.ndarray): Day numbers of the start of the intervals.
+            days2 (numpy.ndarray): Day numbers of the end of the intervals.
+
+        Returns:
+            numpy.ndarray: Array of int64, negative where days1 > days2.
+        """
+        self.coverdays(days1, False)
+        self.coverdays(days2, False)
+        self._checkdays(days1, days2)
+        return self.cum[days2 - self.lo] - self.cum[days1 - self.lo]
+
+    def shift(self, days, offsets):
+        """
+        Add business days to an array of day numbers.
+
+        Note:
+            Same semantics as `Calendar.addbusdays`: a zero offset returns
+            the day unchanged, an offset of 1 is the next business day
+            regardless of the day being a business day or not.
+
+        Args:
+            days (numpy.ndarray): Day numbers.
+            offsets: Integer or array of integers broadcastable to `days`.
+
+        Returns:
+            numpy.ndarray: Array of int64 day numbers.
+        """
+        days, offsets = np.broadcast_arrays(np.asarray(days, dtype='i8'),
+                                            np.asarray(offsets, dtype='i8'))
+        result = self._shift(days, offsets)
+        self._checkdays(days, result)
+        return result
+
+    def _shift(self, days, offsets):
+        """
+        (PRIVATE) Add business days to broadcast arrays of day numbers and
+        offsets, without checking the validity window.
+        """
+        if not days.size:
+            return days.copy()
+        self.coverdays(days, False)
+        while True:
+            pos = days - self.lo
+            # number of business days strictly before each day
+            before = self.cum[pos] - self.mask[pos]
+            idx = np.where(offsets > 0, before + self.mask[pos] + offsets - 1,
+                           before + offsets)
+            idx[offsets == 0] = 0
+            if self._fits(idx):
+                break
+        return np.where(offsets == 0, days, self.busdays[idx])
+
+    def _fits(self, idx):
+        """
+        (PRIVATE) Check if all positions idx are in the business day array,
+        otherwise grow the window so that they will be after the positions
+        are computed again (which shifts them if the window grew at the
+        start).
+        """
+        short = int(-idx.min()) if idx.min() < 0 else 0
+        extra = int(idx.max()) - len(self.busdays) + 1
+        if short <= 0 and extra <= 0:
+            return True
+        # grow the window by enough weeks to fit the missing business days,
+        # plus the holidays that may fall in the new days
+        weeks = (max(short, extra) // int(self.weekmask.sum()) + 1) * 7
+        self.cover(self.lo - (weeks if short > 0 else 0),
+                   self.hi + (weeks if extra > 0 else 0))
+        return False
+
+    def fromindex(self, indexes):
+        """
+        Business days with the given business day indexes, the inverse of
+        `index`.
+
+        Args:
+            indexes (numpy.ndarray): Business day indexes, 1 being the first
+                business day on or after 1970-01-01.
+
+        Returns:
+            numpy.ndarray: Array of int64 day numbers.
+        """
+        indexes = np.asarray(indexes, dtype='i8')
+        if not indexes.size:
+            return indexes.copy()
+        while True:
+            idx = indexes + self.base - 1
+            if self._fits(idx):
+                break
+        result = self.busdays[idx]
+        self._checkwindow(int(result.min()), int(result.max()))
+        return result
+
+    def adjust(self, days, mode):
+        """
+        Adjust an array of day numbers to business days.
+
+        Args:
+            days (numpy.ndarray): Day numbers.
+            mode (integer): FOLLOWING, PREVIOUS or MODIFIEDFOLLOWING.
+
+        Returns:
+            numpy.ndarray: Array of int64 day numbers.
+        """
+        days = np.asarray(days, dtype='i8')
+        if mode == FOLLOWING:
+            adjusted = self._shift(days, np.ones_like(days))
+        elif mode == PREVIOUS:
+            adjusted = self._shift(days, -np.ones_like(days))
+        elif mode == MODIFIEDFOLLOWING:
+            adjusted = self._shift(days, np.ones_like(days))
+            month = todates(days).astype('M8[M]')
+            other = todates(adjusted).astype('M8[M]') != month
+            adjusted[other] = self._shift(days[other],
+                                          -np.ones_like(days[other]))
+        else:
+            raise ValueError('Invalid mode %s' % mode)
+        # the window covers days now, it may have grown while shifting
+        result = np.where(self.mask[days - self.lo], days, adjusted)
+        self._checkdays(days, result)
+        return result
+
+
+class NumpyTable(_Table):
+    """
+    Business day table that dispatches to `numpy.busday_count`,
+    `numpy.busday_offset` and `numpy.is_busday`.
+
+    Note:
+        Same interface and semantics as RollTable, numpy conventions are
+        translated so counts are COB to COB and a zero offset returns the
+        day unchanged even if it is not a business day. There is no window,
+        numpy handles any date.
+
+    Attributes:
+        busdaycal (numpy.busdaycalendar): Calendar used in numpy calls.
+        validfrom (int): First day number of the validity window, or None.
+        validto (int): Last day number of the validity window, or None.
+    """
+
+    def __init__(self, weekmask, holidays, validfrom=None, validto=None):
+        """
+        Initialize the table.
+
+        Args:
+            weekmask: Sequence of 7 booleans, Monday first, True for work
+                days.
+            holidays: Sorted array of holiday day numbers.
+            validfrom (int): First day of the validity window, or None.
+            validto (int): Last day of the validity window, or None.
+        """
+        self.validfrom = validfrom
+        self.validto = validto
+        if not any(weekmask):
+            raise ValueError('Calendar has no work days')
+        self.busdaycal = np.busdaycalendar(weekmask=list(weekmask),
+                                           holidays=todates(holidays))
+
+    def cover(self, lo, hi):
+        """Does nothing, kept for compatibility with RollTable."""
+        pass
+
+    def coverdays(self, days, check=True):
+        """
+        Check all days of an array against the validity window, there is no
+        window to cover, see `RollTable.coverdays`.
+        """
+        days = np.asarray(days)
+        if days.size:
+            lo = int(days.min())
+            _checknat(lo)
+            if check:
+                self._checkwindow(lo, int(days.max()))
+
+    def isbusday(self, days):
+        """
+        Check if each day is a business day, see `RollTable.isbusday`.
+        """
+        self.coverdays(days)
+        return np.is_busday(todates(days), busdaycal=self.busdaycal)
+
+    def index(self, days):
+        """
+        Business day index of each day, see `RollTable.index`.
+        """
+        days = np.asarray(days, dtype='i8')
+        self.coverdays(days)
+        # count from 1969-12-31, COB to COB, always forward as in count
+        start, stop = np.minimum(days, -1), np.maximum(days, -1)
+        count = np.busday_count(todates(start + 1), todates(stop + 1),
+                                busdaycal=self.busdaycal).astype('i8')
+        return np.where(days < -1, -count, count)
+
+    def fromindex(self, indexes):
+        """
+        Business days with the given business day indexes, see
+        `RollTable.fromindex`.
+        """
+        # the first business day on or after 1970-01-01 has index 1
+        result = np.busday_offset(np.datetime64(0, 'D'),
+                                  np.asarray(indexes, dtype='i8') - 1,
+                                  roll='forward',
+                                  busdaycal=self.busdaycal).view('i8')
+        self.coverdays(result)
+        return result
+
+    def range(self, start, stop):
+        """
+        Business days in the interval [start, stop), see `RollTable.range`.
+        """
+        if stop > start:
+            self._checkwindow(start, stop - 1)
+        days = np.arange(start, stop, dtype='i8')
+        return days[self.isbusday(days)]
+
+    def count(self, days1, days2):
+        """
+        Count business days between two arrays of day numbers, see
+        `RollTable.count`.
+        """
+        self.coverdays(days1, False)
+        self.coverdays(days2, False)
+        self._checkdays(days1, days2)
+        # numpy counts [begin, end) forward but (end, begin] backward, so
+        # the count is always done forward from the day after the first day
+        start, stop = np.minimum(days1, days2), np.maximum(days1, days2)
+        count = np.busday_count(todates(start + 1), todates(stop + 1),
+                                busdaycal=self.busdaycal).astype('i8')
+        return np.where(days1 > days2, -count, count)
+
+    def shift(self, days, offsets):
+        """
+        Add business days to an array of day numbers, see `RollTable.shift`.
+        """
+        days, offsets = np.broadcast_arrays(np.asarray(days, dtype='i8'),
+                                            np.asarray(offsets, dtype='i8'))
+        self.coverdays(days, False)
+        result = days.copy()
+        # counting starts from the previous business day when moving forward
+        # and from the next one when moving backward, so that an offset of 1
+        # is always the next business day
+        for sel, roll in ((offsets > 0, 'backward'), (offsets < 0, 'forward')):
+            result[sel] = np.busday_offset(todates(days[sel]), offsets[sel],
+                                           roll=roll,
+                                           busdaycal=self.busdaycal).view('i8')
+        self._checkdays(days, result)
+        return result
+
+    def adjust(self, days, mode):
+        """
+        Adjust an array of day numbers to business days, see
+        `RollTable.adjust`.
+        """
+        if mode == FOLLOWING:
+            roll = 'forward'
+        elif mode == PREVIOUS:
+            roll = 'backward'
+        elif mode == MODIFIEDFOLLOWING:
+            roll = 'modifiedfollowing'
+        else:
+            raise ValueError('Invalid mode %s' % mode)
+        days = np.asarray(days, dtype='i8')
+        self.coverdays(days, False)
+        result = np.busday_offset(todates(days), 0, roll=roll,
+                                  busdaycal=self.busdaycal).view('i8')
+        self._checkdays(days, result)
+        return result
@@ -0,0 +1,19 @@
+"""
+Fixtures shared by the tests of the array functions.
+"""
+import datetime
+import random
+
+
+holidays = ['2010-01-01', '2010-04-02', '2010-12-24', '2010-12-27',
+            '2011-01-03', '2011-04-22', '2011-12-26', '2012-01-02',
+            '2012-06-04', '2012-06-05', '2012-06-06', '2012-06-07',
+            '2013-12-25']
+
+
+def random_dates(n, seed=0):
+    """n random datetimes from mid 2009 to 2013, around the holidays."""
+    rnd = random.Random(seed)
+    start = datetime.datetime(2009, 6, 1)
+    return [start + datetime.timedelta(days=rnd.randint(0, 1400))
+            for i in range(n)]
@@ -0,0 +1,46 @@
+"""
+Scaling of Calendar.map_parallel with the number of worker processes.
+
+Run with `python -m business_calendar.test.benchmark_parallel [n]`, where n
+is the number of dates (default 20 million).
+"""
+from business_calendar import Calendar
+import datetime
+import multiprocessing
+import sys
+import time
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings('ignore', module='business_calendar')
+
+holidays = [datetime.datetime(2000, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 11000, 13)]
+
+
+def elapsed(cal, dates, offsets, workers):
+    start = time.time()
+    for result in cal.map_parallel('addbusdays', dates, offsets,
+                                   workers=workers):
+        pass
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000000
+    rnd = np.random.RandomState(0)
+    dates = np.datetime64('2001-01-01') + rnd.randint(0, 9000, n)
+    offsets = rnd.randint(-60, 60, n)
+    cal = Calendar(holidays=holidays)
+    start = time.time()
+    cal._rolltable().shift(dates.view('i8'), offsets)
+    print('%d dates, single process without pool %.3fs' % \
+        (n, time.time() - start))
+    base = None
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        t = elapsed(cal, dates, offsets, workers)
+        base = base or t
+        print('  %2d workers %.3fs speedup %.2fx' % (workers, t, base / t))
+        workers *= 2
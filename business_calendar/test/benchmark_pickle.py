@@ -0,0 +1,34 @@
+"""
+Pickle size and load time of a Calendar in compact form against the default
+pickling of its attributes. The compact form unpacks the holidays on first
+use, so the load time including the first use is shown as well.
+
+Run with `python -m business_calendar.test.benchmark_pickle`.
+"""
+from business_calendar import Calendar
+import datetime
+import pickle
+import timeit
+
+
+class PlainCalendar(Calendar):
+    """Calendar pickled with the default protocol, for comparison."""
+    __reduce__ = object.__reduce__
+
+
+if __name__ == '__main__':
+    for nholidays in (10, 100, 1000, 10000):
+        holidays = [datetime.datetime(1900, 1, 1) +
+                    datetime.timedelta(days=d * 5)
+                    for d in range(nholidays)]
+        print('%d holidays' % nholidays)
+        for name, cls in (('default', PlainCalendar), ('compact', Calendar)):
+            data = pickle.dumps(cls(holidays=holidays),
+                                pickle.HIGHEST_PROTOCOL)
+            number = max(1, 20000 // nholidays)
+            load = min(timeit.repeat(lambda: pickle.loads(data), repeat=3,
+                                     number=number)) / number
+            use = min(timeit.repeat(lambda: pickle.loads(data).holidays,
+                                    repeat=3, number=number)) / number
+            print('  %-8s size %8d bytes load %9.1fus load+use %9.1fus' % \
+                (name, len(data), load * 1e6, use * 1e6))
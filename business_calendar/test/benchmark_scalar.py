@@ -0,0 +1,54 @@
+"""
+Scalar call latency of the generic Calendar methods against the ones
+specialized by Calendar.compile, with and without the validity window
+check, and the ones memoized by Calendar.cache (repeated calls only hit the
+cache).
+
+Run with `python -m business_calendar.test.benchmark_scalar`.
+"""
+from business_calendar import Calendar, FOLLOWING
+import datetime
+import timeit
+import warnings
+
+warnings.filterwarnings('ignore', module='business_calendar')
+
+holidays = [datetime.datetime(2000, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 11000, 13)]
+
+date1 = datetime.datetime(2013, 5, 17)
+date2 = datetime.datetime(2013, 8, 2)
+
+calls = [
+    ('isbusday', lambda cal: cal.isbusday(date1)),
+    ('adjust', lambda cal: cal.adjust(date1, FOLLOWING)),
+    ('addworkdays', lambda cal: cal.addworkdays(date1, 17)),
+    ('addbusdays', lambda cal: cal.addbusdays(date1, 17)),
+    ('addbusdays back', lambda cal: cal.addbusdays(date1, -17)),
+    ('workdaycount', lambda cal: cal.workdaycount(date1, date2)),
+    ('busdaycount', lambda cal: cal.busdaycount(date1, date2)),
+]
+
+
+def latency(fun, cal, number=100000):
+    return min(timeit.repeat(lambda: fun(cal), repeat=3,
+                             number=number)) / number
+
+
+if __name__ == '__main__':
+    for workdays in ([0, 1, 2, 3, 4], [0, 1, 4, 6]):
+        generic = Calendar(workdays=workdays, holidays=holidays)
+        compiled = Calendar(workdays=workdays, holidays=holidays).compile()
+        unchecked = Calendar(workdays=workdays,
+                             holidays=holidays).compile(check=False)
+        cached = Calendar(workdays=workdays, holidays=holidays).cache()
+        print('workdays %s' % workdays)
+        for name, fun in calls:
+            t1 = latency(fun, generic)
+            t2 = latency(fun, compiled)
+            t3 = latency(fun, unchecked)
+            t4 = latency(fun, cached)
+            print('  %-16s generic %.3fus compiled %.3fus (%.1fx) ' \
+                  'unchecked %.3fus (%.1fx) cached %.3fus (%.1fx)' % \
+                (name, t1 * 1e6, t2 * 1e6, t1 / t2, t3 * 1e6, t1 / t3,
+                 t4 * 1e6, t1 / t4))
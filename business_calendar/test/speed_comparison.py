@@ -51,7 +51,7 @@ Wednesday Dec 25, 2013
 Thursday Dec 26, 2013
 """
 
-holidays = [parse(x) for x in global_holidays.split('\n')]
+holidays = [parse(x) for x in global_holidays.strip().split('\n')]
 
 def init_calendar():
     return Calendar(holidays=holidays)
@@ -70,7 +70,7 @@ cal = init_calendar()
 rr = init_rruleset()
 
 def gen_calendar_1():
-    cal.range(datetime.datetime(2010,1,1), datetime.datetime(2013,12,31))
+    list(cal.range(datetime.datetime(2010,1,1), datetime.datetime(2013,12,31)))
 
 def gen_busdaycount_1():
     cal.busdaycount(datetime.datetime(2009,12,31), datetime.datetime(2013,12,31))
@@ -80,7 +80,7 @@ def gen_rruleset_1():
                inc=True)
 
 def gen_calendar_2():
-    cal.range(datetime.datetime(2010,1,1), datetime.datetime(2010,3,1))
+    list(cal.range(datetime.datetime(2010,1,1), datetime.datetime(2010,3,1)))
 
 def gen_busdaycount_2():
     cal.busdaycount(datetime.datetime(2009,12,31), datetime.datetime(2010,3,1))
@@ -90,7 +90,7 @@ def gen_rruleset_2():
                inc=True)
 
 def gen_calendar_3():
-    cal.range(datetime.datetime(1970,1,1), datetime.datetime(2030,12,31))
+    list(cal.range(datetime.datetime(1970,1,1), datetime.datetime(2030,12,31)))
 
 def gen_busdaycount_3():
     cal.busdaycount(datetime.datetime(1969,12,31), datetime.datetime(2030,12,31))
@@ -101,49 +101,22 @@ def gen_rruleset_3():
 
 import timeit
 
-t = timeit.repeat('init_calendar', repeat=3, number=10000000,
-                  setup='from __main__ import init_calendar')
-print('init cal: %.6fs' % min(t))
-
-t = timeit.repeat('init_rruleset', repeat=3, number=10000000,
-                  setup='from __main__ import init_rruleset')
-print('init rr: %.6fs' % min(t))
-
-
-t = timeit.repeat('gen_calendar_1', repeat=3, number=10000000,
-                  setup='from __main__ import gen_calendar_1')
-print('gen cal medium: %.6fs' % min(t))
-
-t = timeit.repeat('gen_calendar_2', repeat=3, number=10000000,
-                  setup='from __main__ import gen_calendar_2')
-print('gen cal short: %.6fs' % min(t))
-
-t = timeit.repeat('gen_calendar_3', repeat=3, number=10000000,
-                  setup='from __main__ import gen_calendar_3')
-print('gen cal long: %.6fs' % min(t))
-
-
-t = timeit.repeat('gen_rruleset_1', repeat=3, number=10000000,
-                  setup='from __main__ import gen_rruleset_1')
-print('gen rr medium: %.6fs' % min(t))
-
-t = timeit.repeat('gen_rruleset_2', repeat=3, number=10000000,
-                  setup='from __main__ import gen_rruleset_2')
-print('gen rr short: %.6fs' % min(t))
-
-t = timeit.repeat('gen_rruleset_3', repeat=3, number=10000000,
-                  setup='from __main__ import gen_rruleset_3')
-print('gen rr long: %.6fs' % min(t))
-
-
-t = timeit.repeat('gen_busdaycount_1', repeat=3, number=10000000,
-                  setup='from __main__ import gen_busdaycount_1')
-print('busdaycount medium: %.6fs' % min(t))
-
-t = timeit.repeat('gen_busdaycount_2', repeat=3, number=10000000,
-                  setup='from __main__ import gen_busdaycount_2')
-print('busdaycount short: %.6fs' % min(t))
-
-t = timeit.repeat('gen_busdaycount_3', repeat=3, number=10000000,
-                  setup='from __main__ import gen_busdaycount_3')
-print('busdaycount long: %.6fs' % min(t))
+# the functions are called number times, the time printed is per call
+benchmarks = [
+    ('init cal', 'init_calendar', 1000),
+    ('init rr', 'init_rruleset', 1000),
+    ('gen cal medium', 'gen_calendar_1', 100),
+    ('gen cal short', 'gen_calendar_2', 1000),
+    ('gen cal long', 'gen_calendar_3', 10),
+    ('gen rr medium', 'gen_rruleset_1', 100),
+    ('gen rr short', 'gen_rruleset_2', 1000),
+    ('gen rr long', 'gen_rruleset_3', 3),
+    ('busdaycount medium', 'gen_busdaycount_1', 100000),
+    ('busdaycount short', 'gen_busdaycount_2', 100000),
+    ('busdaycount long', 'gen_busdaycount_3', 100000),
+]
+
+for label, fun, number in benchmarks:
+    t = timeit.repeat('%s()' % fun, repeat=3, number=number,
+                      setup='from __main__ import %s' % fun)
+    print('%s: %.6fs' % (label, min(t) / number))
@@ -1,6 +1,8 @@
 import datetime
+import itertools
 import warnings
 from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+from business_calendar import merge_ranges
 from dateutil.rrule import rruleset, rrule, DAILY, MO, TU, WE, TH, FR, SA, SU
 from dateutil.parser import parse
 
@@ -479,4 +481,79 @@ class TestCalendarCrazyWeek2WithHolidays(BaseCalendarTest):
         self.rr = rr
         self.dates = rr.between(datetime.datetime(2010,1,1),
                                 datetime.datetime(2013,12,31),
-                                inc=True)
\ No newline at end of file
+                                inc=True)
+
+
+def test_weekdaymap():
+    print('test_weekdaymap')
+    for workdays in itertools.chain.from_iterable(
+            itertools.combinations(range(7), n) for n in range(1, 8)):
+        cal = Calendar(workdays=workdays)
+        for wk in cal.weekdaymap:
+            assert wk.isworkday == (wk.dayofweek in workdays)
+            nxt = [k for k in range(1, 8)
+                   if (wk.dayofweek + k) % 7 in workdays]
+            prv = [k for k in range(1, 8)
+                   if (wk.dayofweek - k) % 7 in workdays]
+            assert wk.offsetnext == nxt[0]
+            assert wk.nextworkday == (wk.dayofweek + nxt[0]) % 7
+            assert wk.offsetprev == -prv[0]
+            assert wk.prevworkday == (wk.dayofweek - prv[0]) % 7
+    try:
+        Calendar(workdays=[])
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_busday_mask():
+    print('test_busday_mask')
+    warnings.filterwarnings('ignore', module='business_calendar')
+    holidays = [parse(x) for x in global_holidays.strip().split('\n')]
+    start = datetime.datetime(2010, 1, 1)
+    days = [start + datetime.timedelta(days=i) for i in range(1461)]
+    for workdays, hols in (([0, 1, 2, 3, 4], []), ([0, 1, 4, 6], holidays),
+                           ([0], holidays)):
+        cal = Calendar(workdays=workdays, holidays=hols)
+        dates = [day for day in days
+                 if day.weekday() in workdays and day not in hols]
+        mask = cal.busday_mask(start, 'Jan 1, 2014')
+        assert len(mask) == 1461
+        assert [day for day, flag in zip(days, mask) if flag] == dates
+        for i in range(0, 100, 5):
+            mask = cal.busday_mask(dates[i], dates[-i-1])
+            assert sum(mask) == len(dates[i:-i-1])
+        assert cal.busday_mask(dates[1], dates[0]) == bytearray()
+
+
+def test_merge_ranges():
+    print('test_merge_ranges')
+    warnings.filterwarnings('ignore', module='business_calendar')
+    holidays = [parse(x) for x in global_holidays.strip().split('\n')]
+    calendars = {'A': Calendar(),
+                 'B': Calendar(workdays=[0, 1, 4, 6], holidays=holidays),
+                 'C': Calendar(workdays=[0], holidays=holidays[::2])}
+    date1 = datetime.datetime(2010, 1, 1)
+    date2 = datetime.datetime(2014, 1, 1)
+    ranges = dict((name, set(cal.range(date1, date2)))
+                  for name, cal in calendars.items())
+    expected = [(date, set(name for name in sorted(ranges)
+                           if date in ranges[name]))
+                for date in sorted(set.union(*ranges.values()))]
+    assert list(merge_ranges(calendars, date1, date2)) == expected
+    assert list(merge_ranges(calendars, '2010-01-01', '2014-01-01',
+                             bitmask=True)) == \
+        [(date, sum(1 << i for i, name in enumerate('ABC') if name in open_))
+         for date, open_ in expected]
+    merged = list(merge_ranges([calendars['C'], calendars['A']],
+                               date1, date2))
+    assert merged == [(date, set(i for i, name in enumerate('CA')
+                                 if name in open_))
+                      for date, open_ in expected if open_ - set('B')]
+    assert list(merge_ranges(calendars, date2, date1)) == []
+    assert list(merge_ranges([], date1, date2)) == []
+    # lazy over an arbitrarily long span
+    head = list(itertools.islice(
+        merge_ranges(calendars, date1, datetime.datetime(9999, 1, 1)), 3))
+    assert head == expected[:3]
@@ -0,0 +1,123 @@
+import datetime
+import pickle
+import random
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+def test_cached_matches_generic():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    rnd = random.Random(0)
+    start = datetime.datetime(2009, 6, 1)
+    for workdays in ([0, 1, 2, 3, 4], [0, 1, 4, 6], [2]):
+        cal = Calendar(workdays=workdays, holidays=holidays)
+        fast = Calendar(workdays=workdays, holidays=holidays).cache(200)
+        for i in range(2000):
+            date = start + datetime.timedelta(days=rnd.randint(0, 30))
+            offset = rnd.randint(-5, 5)
+            mode = rnd.choice([FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING])
+            assert fast.addbusdays(date, offset) == \
+                cal.addbusdays(date, offset)
+            assert fast.adjust(date, mode) == cal.adjust(date, mode)
+        info = fast.cache_info()
+        assert info.hits > 0
+        assert info.maxsize == info.currsize == 200
+
+
+def test_cache_info():
+    cal = Calendar(holidays=holidays)
+    assert cal.cache_info() is None
+    assert cal.cache(maxsize=2) is cal
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    assert tuple(cal.cache_info()) == (1, 1, 2, 1)
+    cal.adjust('2012-01-07', FOLLOWING)
+    cal.addbusdays('2012-01-02', 2)
+    # the least recently used result was evicted
+    assert cal.cache_info().currsize == 2
+    cal.cache_clear()
+    assert tuple(cal.cache_info()) == (0, 0, 2, 0)
+
+
+def test_cache_signatures():
+    cal = Calendar(holidays=holidays).cache()
+    assert cal.adjust('2012-01-07', mode=PREVIOUS) == \
+        datetime.datetime(2012, 1, 6)
+    assert cal.addbusdays(date='2012-01-02', offset=1) == \
+        datetime.datetime(2012, 1, 3)
+
+
+def test_no_cache():
+    cal = Calendar(holidays=holidays).cache(maxsize=0)
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    assert tuple(cal.cache_info()) == (0, 2, 0, 0)
+
+
+def test_cache_invalidation():
+    cal = Calendar(holidays=holidays).cache()
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    cal.holidays.append(datetime.datetime(2020, 1, 3))
+    cal.holidays.insert(0, datetime.datetime(2000, 1, 3))
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 3)
+    assert cal.cache_info().misses == 2
+    cal.holidays = sorted(cal.holidays + [datetime.datetime(2012, 1, 3)])
+    assert cal.addbusdays('2012-01-02', 1) == datetime.datetime(2012, 1, 4)
+    assert cal.cache_info().misses == 3
+    assert cal.cache_info().currsize == 1
+    # in-place edits that keep the length need cache_clear
+    cal.holidays[-1] = datetime.datetime(2012, 1, 4)
+    cal.holidays.sort()
+    cal.cache_clear()
+    assert cal.addbusdays('2012-01-03', 1) == datetime.datetime(2012, 1, 5)
+
+
+def test_uncache():
+    cal = Calendar(holidays=holidays).compile()
+    compiled = cal.addbusdays
+    cal.cache()
+    assert cal.addbusdays is not compiled
+    assert cal.uncache() is cal
+    assert cal.addbusdays is compiled
+    assert 'adjust' not in vars(cal)
+    assert cal.cache_info() is None
+    cal = Calendar().cache()
+    cal.adjust('2015-01-03', FOLLOWING)
+    cal2 = pickle.loads(pickle.dumps(cal))
+    assert 'adjust' not in vars(cal2)
+    assert cal2.cache_info() is None
+    assert cal2.adjust('2015-01-03', FOLLOWING) == \
+        datetime.datetime(2015, 1, 5)
+
+
+def test_cache_compile_orderings():
+    date = datetime.datetime(2012, 1, 7)
+    generic = Calendar(holidays=holidays)
+
+    def check(cal, compiled, cached):
+        for name in Calendar.cached:
+            method = vars(cal).get(name)
+            if cached:
+                assert method.__doc__ == 'Cached `Calendar.%s`.' % name
+            elif compiled and name in Calendar.compiled:
+                assert method.__doc__ == 'Compiled `Calendar.%s`.' % name
+            else:
+                assert method is None
+        assert (cal.cache_info() is not None) == cached
+        assert ('_cache' in vars(cal)) == cached
+        assert cal.adjust(date, FOLLOWING) == generic.adjust(date, FOLLOWING)
+        assert cal.addbusdays(date, 1) == generic.addbusdays(date, 1)
+
+    cal = Calendar(holidays=holidays)
+    check(cal.compile().cache(5), True, True)
+    check(cal.decompile(), False, True)
+    assert cal.cache_info().maxsize == 5
+    check(cal.compile(), True, True)
+    check(cal.uncache(), True, False)
+    check(cal.cache().decompile(), False, True)
+    check(cal.uncache(), False, False)
+    check(cal.cache().compile().uncache().decompile(), False, False)
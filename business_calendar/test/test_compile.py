@@ -0,0 +1,55 @@
+import datetime
+import random
+import warnings
+from business_calendar import Calendar, CalendarHolidayWarning
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+def test_compiled_matches_generic():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    rnd = random.Random(0)
+    start = datetime.datetime(2009, 6, 1)
+    for workdays in ([0, 1, 2, 3, 4], [0, 1, 4, 6], [2], [5, 6],
+                     range(7)):
+        for hols in (holidays, []):
+            cal = Calendar(workdays=workdays, holidays=hols)
+            fast = Calendar(workdays=workdays, holidays=hols).compile()
+            for i in range(400):
+                date1 = start + datetime.timedelta(days=rnd.randint(0, 1600))
+                date2 = start + datetime.timedelta(days=rnd.randint(0, 1600))
+                offset = rnd.randint(-40, 40)
+                assert fast.isworkday(date1) == cal.isworkday(date1)
+                assert fast.isbusday(date1) == cal.isbusday(date1)
+                assert fast.addworkdays(date1, offset) == \
+                    cal.addworkdays(date1, offset)
+                assert fast.addbusdays(date1, offset) == \
+                    cal.addbusdays(date1, offset)
+                assert fast.workdaycount(date1, date2) == \
+                    cal.workdaycount(date1, date2)
+                assert fast.busdaycount(date1, date2) == \
+                    cal.busdaycount(date1, date2)
+
+
+def test_compiled_warns():
+    cal = Calendar(holidays=holidays).compile()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        cal.isbusday(datetime.datetime(2020, 1, 1))
+        cal.addbusdays(datetime.datetime(2020, 1, 1), 1)
+        cal.busdaycount(datetime.datetime(2000, 1, 3),
+                        datetime.datetime(2000, 1, 4))
+    assert len(caught) == 3
+    for warning in caught:
+        assert issubclass(warning.category, CalendarHolidayWarning)
+        assert warning.filename == __file__.replace('.pyc', '.py')
+
+
+def test_decompile():
+    cal = Calendar().compile()
+    assert 'addbusdays' in vars(cal)
+    assert cal.decompile() is cal
+    assert 'addbusdays' not in vars(cal)
+    assert cal.addbusdays('2015-01-02', 1) == datetime.datetime(2015, 1, 5)
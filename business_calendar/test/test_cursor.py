@@ -0,0 +1,57 @@
+import datetime
+import random
+import warnings
+from business_calendar import Calendar, CalendarHolidayWarning
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 11)]
+
+
+def check_stream(cal, dates, offsets):
+    cursor = cal.cursor()
+    for date, offset in zip(dates, offsets):
+        assert cursor.isholiday(date) == cal.isholiday(date)
+        assert cursor.isbusday(date) == cal.isbusday(date)
+        assert cursor.addbusdays(date, offset) == \
+            cal.addbusdays(date, offset)
+        date2 = date + datetime.timedelta(days=offset)
+        assert cursor.busdaycount(date, date2) == \
+            cal.busdaycount(date, date2)
+        assert cursor.busdaycount(date2, date) == \
+            cal.busdaycount(date2, date)
+
+
+def test_cursor_streams():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    rnd = random.Random(0)
+    start = datetime.datetime(2009, 12, 1)
+    dates = [start + datetime.timedelta(days=d) for d in range(0, 1550, 3)]
+    offsets = [rnd.randint(-25, 25) for d in dates]
+    for cal in [Calendar(holidays=holidays),
+                Calendar(workdays=[0, 1, 4, 6], holidays=holidays),
+                Calendar()]:
+        # sorted, sorted with small steps back, reversed and random order
+        check_stream(cal, dates, offsets)
+        jitter = [d - datetime.timedelta(days=rnd.randint(0, 20))
+                  for d in dates]
+        check_stream(cal, jitter, offsets)
+        check_stream(cal, dates[::-1], offsets)
+        shuffled = list(dates)
+        rnd.shuffle(shuffled)
+        check_stream(cal, shuffled, offsets)
+
+
+def test_cursor_warns():
+    cal = Calendar(holidays=holidays)
+    cursor = cal.cursor()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        cursor.isholiday(datetime.datetime(2020, 1, 1))
+        cursor.addbusdays(datetime.datetime(2000, 1, 1), -1)
+        cursor.busdaycount(datetime.datetime(2000, 1, 1),
+                           datetime.datetime(2020, 1, 1))
+    assert len(caught) == 4
+    for warning in caught:
+        assert issubclass(warning.category, CalendarHolidayWarning)
+        assert warning.filename == __file__.replace('.pyc', '.py')
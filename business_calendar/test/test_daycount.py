@@ -0,0 +1,57 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar
+try:
+    import numpy as np
+    from business_calendar import daycount
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+holidays = ['2014-01-01', '2014-12-25', '2015-01-01', '2015-04-03',
+            '2015-12-25', '2016-01-01', '2016-03-25', '2016-12-26']
+
+
+def test_busdaycount_matches_scalar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    cal = Calendar(holidays=holidays)
+    start = datetime.datetime(2014, 1, 1)
+    dates1 = [start + datetime.timedelta(days=5 * i) for i in range(200)]
+    dates2 = [start + datetime.timedelta(days=3 * i + 100) for i in range(200)]
+    counts = daycount.busdaycount(cal, dates1, dates2)
+    for i in range(200):
+        assert counts[i] == cal.busdaycount(dates1[i], dates2[i])
+
+
+def test_bus252():
+    cal = Calendar(holidays=holidays)
+    frac = daycount.bus252(cal, ['2015-01-02', '2015-01-09'],
+                           np.array(['2015-01-09', '2015-01-02'],
+                                    dtype='M8[D]'))
+    assert (frac == np.array([5, -5]) / 252.).all()
+    assert daycount.busyearfrac(cal, '2015-01-02', '2015-01-09', 250) == \
+        5 / 250.
+
+
+def test_busbus():
+    cal = Calendar(holidays=holidays)
+    assert daycount.busbus(cal, '2014-12-31', '2015-12-31') == 1
+    assert daycount.busbus(cal, '2014-12-31', '2016-12-31') == 2
+    inyear = cal.busdaycount('2014-12-31', '2015-12-31')
+    frac = daycount.busbus(cal, ['2015-06-30', '2015-12-31'],
+                           ['2015-01-30', '2016-01-04'])
+    assert frac[0] == -cal.busdaycount('2015-01-30', '2015-06-30') / \
+        float(inyear)
+    assert frac[1] == 1. / cal.busdaycount('2015-12-31', '2016-12-31')
+
+
+def test_missing_dates():
+    cal = Calendar(holidays=holidays)
+    for fun in (daycount.busdaycount, daycount.bus252, daycount.busbus):
+        try:
+            fun(cal, ['2015-01-02', 'NaT'], '2016-02-01')
+        except ValueError as error:
+            assert 'NaT' in str(error)
+        else:
+            assert False, 'NaT accepted'
@@ -0,0 +1,261 @@
+"""
+Differential fuzz tests: random work days, holidays and queries are run on
+every engine and compared with a day by day reference implementation.
+
+Scalar engines are the generic Calendar methods, the ones specialized by
+Calendar.compile and the ones memoized by Calendar.cache. Array engines are
+the 'table' and 'numpy' engines, and are only run if numpy is installed.
+
+Run with `python -m business_calendar.test.test_fuzz [rounds]` to fuzz more
+rounds and report the throughput of each engine.
+"""
+import datetime
+import random
+import sys
+import time
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+try:
+    import numpy as np
+    from business_calendar.rules import Rule
+    from business_calendar.table import asdays, todates
+except ImportError:
+    np = None
+
+
+OPS = ('isbusday', 'adjust', 'addworkdays', 'addbusdays', 'workdaycount',
+       'busdaycount', 'range', 'buseom')
+
+MODES = (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING)
+
+START = datetime.datetime(2000, 1, 1)
+DAY = datetime.timedelta(days=1)
+
+
+class Reference(object):
+    """Day by day implementation of the Calendar semantics."""
+
+    def __init__(self, workdays, holidays):
+        self.workdays = set(workdays)
+        self.holidays = set(holidays)
+
+    def isworkday(self, date):
+        return date.weekday() in self.workdays
+
+    def isbusday(self, date):
+        return self.isworkday(date) and date not in self.holidays
+
+    def _move(self, date, offset, test):
+        step = DAY if offset > 0 else -DAY
+        for i in range(abs(offset)):
+            date += step
+            while not test(date):
+                date += step
+        return date
+
+    def adjust(self, date, mode):
+        if self.isbusday(date):
+            return date
+        if mode == PREVIOUS:
+            return self._move(date, -1, self.isbusday)
+        adjusted = self._move(date, 1, self.isbusday)
+        if mode == MODIFIEDFOLLOWING and adjusted.month != date.month:
+            adjusted = self._move(date, -1, self.isbusday)
+        return adjusted
+
+    def addworkdays(self, date, offset):
+        return self._move(date, offset, self.isworkday)
+
+    def addbusdays(self, date, offset):
+        return self._move(date, offset, self.isbusday)
+
+    def _count(self, date1, date2, test):
+        # COB to COB, the days in (date1, date2]
+        if date1 > date2:
+            return -self._count(date2, date1, test)
+        count = 0
+        while date1 < date2:
+            date1 += DAY
+            count += test(date1)
+        return count
+
+    def workdaycount(self, date1, date2):
+        return self._count(date1, date2, self.isworkday)
+
+    def busdaycount(self, date1, date2):
+        return self._count(date1, date2, self.isbusday)
+
+    def range(self, date1, date2):
+        while date1 < date2:
+            if self.isbusday(date1):
+                yield date1
+            date1 += DAY
+
+    def buseom(self, date):
+        date = date.replace(day=28) + datetime.timedelta(days=4)
+        return self.adjust(date - datetime.timedelta(days=date.day),
+                           PREVIOUS)
+
+
+def random_case(rnd, nqueries):
+    """
+    Random work days, holidays and queries as (date1, date2, date3, offset,
+    mode), where date3 is close to date1 for ranges.
+    """
+    workdays = [wk for wk in range(7) if rnd.random() < 0.6] or \
+        [rnd.randrange(7)]
+    density = rnd.choice([0.0, 0.02, 0.1, 0.5])
+    holidays = [START + d * DAY for d in range(1500)
+                if rnd.random() < density]
+    queries = []
+    for i in range(nqueries):
+        date1 = START + rnd.randint(-30, 1530) * DAY
+        queries.append((date1, START + rnd.randint(-30, 1530) * DAY,
+                        date1 + rnd.randint(-5, 60) * DAY,
+                        rnd.randint(-40, 40), rnd.choice(MODES)))
+    return workdays, holidays, queries
+
+
+def scalar(cal):
+    """Functions running each operation of a scalar engine on queries."""
+    return {
+        'isbusday': lambda q: [cal.isbusday(d1) for d1, d2, d3, n, m in q],
+        'adjust': lambda q: [cal.adjust(d1, m) for d1, d2, d3, n, m in q],
+        'addworkdays': lambda q: [cal.addworkdays(d1, n)
+                                  for d1, d2, d3, n, m in q],
+        'addbusdays': lambda q: [cal.addbusdays(d1, n)
+                                 for d1, d2, d3, n, m in q],
+        'workdaycount': lambda q: [cal.workdaycount(d1, d2)
+                                   for d1, d2, d3, n, m in q],
+        'busdaycount': lambda q: [cal.busdaycount(d1, d2)
+                                  for d1, d2, d3, n, m in q],
+        'range': lambda q: [list(cal.range(d1, d3))
+                            for d1, d2, d3, n, m in q],
+        'buseom': lambda q: [cal.buseom(d1) for d1, d2, d3, n, m in q],
+    }
+
+
+def columns(queries):
+    """Queries as arrays of day numbers, offsets and modes."""
+    return [asdays([query[0] for query in queries]),
+            asdays([query[1] for query in queries]),
+            asdays([query[2] for query in queries]),
+            np.array([query[3] for query in queries]),
+            np.array([query[4] for query in queries])]
+
+
+def array(cal, free):
+    """
+    Functions running each operation of an array engine on the columns of
+    the queries, free being the calendar without holidays used for work day
+    operations.
+    """
+    buseom = Rule.eom().adjust(PREVIOUS).compile(cal)
+
+    def adjust(q):
+        days, modes = q[0], q[4]
+        result = days.copy()
+        for mode in MODES:
+            result[modes == mode] = cal._rolltable().adjust(
+                days[modes == mode], mode)
+        return todates(result)
+
+    return {
+        'isbusday': lambda q: cal._rolltable().isbusday(q[0]),
+        'adjust': adjust,
+        'addworkdays': lambda q: todates(free._rolltable().shift(q[0], q[3])),
+        'addbusdays': lambda q: todates(cal._rolltable().shift(q[0], q[3])),
+        'workdaycount': lambda q: free._rolltable().count(q[0], q[1]),
+        'busdaycount': lambda q: cal._rolltable().count(q[0], q[1]),
+        'range': lambda q: [todates(cal._rolltable().range(d1, d3))
+                            for d1, d3 in zip(q[0].tolist(), q[2].tolist())],
+        'buseom': lambda q: buseom(q[0]),
+    }
+
+
+def normalize(result):
+    """Results of all engines as lists of dates, bools and ints."""
+    if isinstance(result, datetime.datetime):
+        return result.date()
+    if np is not None and isinstance(result, np.ndarray):
+        if result.dtype.kind == 'M':
+            result = result.astype('M8[D]').astype(object)
+        return [normalize(item) for item in result.tolist()]
+    if isinstance(result, list):
+        return [normalize(item) for item in result]
+    return result
+
+
+def engines(workdays, holidays):
+    """
+    Name, functions and input preparation of each engine, reference first.
+    The input is prepared from the queries before timing, None if the
+    functions take the queries as they are.
+    """
+    result = [('reference', scalar(Reference(workdays, holidays)), None),
+              ('generic', scalar(Calendar(workdays, holidays)), None),
+              ('compiled', scalar(Calendar(workdays, holidays).compile()),
+               None),
+              ('cached', scalar(Calendar(workdays, holidays).cache()), None)]
+    if np is not None:
+        for engine in ('table', 'numpy'):
+            cal = Calendar(workdays, holidays)
+            free = Calendar(workdays)
+            cal.engine = free.engine = engine
+            result.append((engine, array(cal, free), columns))
+    return result
+
+
+def fuzz(rounds, nqueries, seed=0, timings=None):
+    """
+    Run random cases on all engines and check them against the reference.
+    If timings is a dict, the seconds of each (engine, op) are added to it.
+    """
+    rnd = random.Random(seed)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for i in range(rounds):
+            workdays, holidays, queries = random_case(rnd, nqueries)
+            funs = [(name, ops, queries if prepare is None else
+                     prepare(queries))
+                    for name, ops, prepare in engines(workdays, holidays)]
+            for op in OPS:
+                expected = None
+                for name, ops, data in funs:
+                    start = time.time()
+                    result = ops[op](data)
+                    if timings is not None:
+                        key = (name, op)
+                        timings[key] = timings.get(key, 0.0) + \
+                            time.time() - start
+                    result = normalize(result)
+                    if expected is None:
+                        expected = result
+                    elif result != expected:
+                        index = [a == b for a, b in
+                                 zip(result, expected)].index(False)
+                        raise AssertionError(
+                            '%s %s differs from reference on %s, workdays '
+                            '%s: %s != %s' % (name, op, queries[index],
+                                              workdays, result[index],
+                                              expected[index]))
+
+
+def test_fuzz():
+    fuzz(rounds=20, nqueries=50)
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    nqueries = 500
+    timings = {}
+    fuzz(rounds, nqueries, timings=timings)
+    names = [name for name, ops, prepare in engines([0], [])]
+    print('%d rounds of %d queries, all engines agree with the reference' %
+          (rounds, nqueries))
+    print('thousands of queries per second')
+    print('%-13s' % '' + ''.join('%11s' % name for name in names))
+    for op in OPS:
+        print('%-13s' % op + ''.join(
+            '%11.1f' % (rounds * nqueries / timings[name, op] / 1e3)
+            for name in names))
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import unittest
+try:
+    from importlib.util import find_spec
+except ImportError:
+    from pkgutil import find_loader as find_spec  # Python 2
+
+
+# budget for the cumulative time of a cold `import business_calendar`, in
+# seconds; the default is generous since wall-clock times depend on the
+# machine, tighten it in the environment, e.g.
+# BUSINESS_CALENDAR_IMPORT_BUDGET=0.05
+IMPORT_BUDGET = float(os.environ.get('BUSINESS_CALENDAR_IMPORT_BUDGET', 0.5))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+
+def run(args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    process = subprocess.Popen([sys.executable] + args, env=env,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+    out, err = process.communicate()
+    assert process.returncode == 0, err
+    return out.decode().strip(), err.decode().strip()
+
+
+def test_import_time():
+    if sys.version_info < (3, 7):
+        raise unittest.SkipTest('-X importtime requires Python 3.7')
+    times = []
+    for i in range(3):
+        out, err = run(['-X', 'importtime', '-c', 'import business_calendar'])
+        # last line is the package: "import time: self | cumulative | name"
+        line = err.splitlines()[-1].split('|')
+        assert line[-1].strip() == 'business_calendar'
+        times.append(int(line[-2]) / 1e6)
+    print('import business_calendar: %.6fs' % min(times))
+    assert min(times) < IMPORT_BUDGET
+
+
+def test_lazy_imports():
+    out, err = run(['-c', 'import sys, business_calendar; '
+                    'print(sorted(m for m in sys.modules '
+                    'if m.split(".")[0] in ("dateutil", "numpy", "pandas")))'])
+    assert out == '[]'
+
+
+def test_lazy_parsefun():
+    if find_spec('dateutil') is not None:
+        expected = '_dateutilparsefun'
+    else:
+        expected = '_simpleparsefun'
+    out, err = run(['-c', 'import business_calendar.business_calendar as bc; '
+                    'import datetime; '
+                    'bc.Calendar(holidays=[datetime.date(2015, 1, 5)]); '
+                    'print(bc.parsefun.__name__); '
+                    'bc.Calendar(holidays=["2015-01-05"]); '
+                    'print(bc.parsefun.__name__)'])
+    assert out.split() == ['_lazyparsefun', expected]
+    out, err = run(['-c', 'import business_calendar.business_calendar as bc; '
+                    'bc.parsefun = lambda date: date; '
+                    'print(bc.Calendar().addbusdays(1, 0))'])
+    assert out == '1'
@@ -0,0 +1,129 @@
+"""
+Memory use of Calendar, measured with tracemalloc: bytes per Calendar and
+per holiday, memory allocated by scalar calls and peak memory of long range
+iterations. The tests fail when a change goes over the thresholds below.
+
+Run with `python -m business_calendar.test.test_memory` for a report.
+"""
+import datetime
+import gc
+import unittest
+from business_calendar import Calendar, merge_ranges
+try:
+    import tracemalloc
+except ImportError:
+    raise unittest.SkipTest('tracemalloc not available')
+
+
+# thresholds in bytes, about twice the figures measured on CPython 3
+CALENDAR_BYTES = 1024 # per Calendar without holidays
+HOLIDAY_BYTES = 200 # per holiday parsed from a str
+CALL_PEAK_BYTES = 2048 # peak of 1000 scalar calls
+CALL_LEAK_BYTES = 1024 # kept after 1000 scalar calls
+RANGE_PEAK_BYTES = 8192 # peak of a range iteration of any length
+RANGE_GROWTH_BYTES = 1024 # peak growth from 1 to 50 years of range
+
+holidays = [datetime.datetime(2000, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 20000, 3)]
+cal = Calendar(holidays=holidays)
+date1 = datetime.datetime(2010, 5, 5)
+date2 = datetime.datetime(2013, 8, 2)
+
+
+def traced(fun):
+    """
+    Run fun with tracemalloc and return the memory still allocated when it
+    returns (including its result) and the peak, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fun()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def calendar_bytes(n=200):
+    current, peak = traced(lambda: [Calendar(workdays=[0, 1, 4, 6])
+                                    for i in range(n)])
+    return current / float(n)
+
+
+def holiday_bytes(n=20000):
+    strs = [str(datetime.date(2000, 1, 1) + datetime.timedelta(days=d))
+            for d in range(n)]
+    empty = traced(lambda: Calendar(holidays=[]))[0]
+    return (traced(lambda: Calendar(holidays=strs))[0] - empty) / float(n)
+
+
+def calls(fun, n=1000):
+    """Memory kept and peak of n calls."""
+    def run():
+        for i in range(n):
+            fun()
+    return traced(run)
+
+
+def consume(iterable):
+    """Peak memory of an iteration that keeps nothing."""
+    def run():
+        for item in iterable():
+            pass
+    return traced(run)[1]
+
+
+def range_peak(years):
+    return consume(lambda: cal.range(
+        datetime.datetime(2000, 1, 1), datetime.datetime(2000 + years, 1, 1)))
+
+
+def merge_peak(years):
+    calendars = [cal, Calendar(workdays=[0, 1, 4, 6], holidays=holidays[::2]),
+                 Calendar(workdays=[6])]
+    return consume(lambda: merge_ranges(
+        calendars, datetime.datetime(2000, 1, 1),
+        datetime.datetime(2000 + years, 1, 1), bitmask=True))
+
+
+def test_calendar_bytes():
+    assert calendar_bytes() < CALENDAR_BYTES
+
+
+def test_holiday_bytes():
+    assert holiday_bytes() < HOLIDAY_BYTES
+
+
+def test_call_memory():
+    for fun in (lambda: cal.addbusdays(date1, 17),
+                lambda: cal.addbusdays(date1, -17),
+                lambda: cal.busdaycount(date1, date2),
+                lambda: cal.adjust(date1, 1),
+                lambda: next(cal.range(date1, date2))):
+        current, peak = calls(fun)
+        assert current < CALL_LEAK_BYTES
+        assert peak < CALL_PEAK_BYTES
+
+
+def test_range_memory():
+    # constant memory however long the range
+    for peak in (range_peak, merge_peak):
+        short = peak(1)
+        assert short < RANGE_PEAK_BYTES
+        assert peak(50) - short < RANGE_GROWTH_BYTES
+
+
+if __name__ == '__main__':
+    print('Calendar          %8.1f bytes' % calendar_bytes())
+    print('holiday           %8.1f bytes' % holiday_bytes())
+    for name, fun in [('addbusdays', lambda: cal.addbusdays(date1, 17)),
+                      ('busdaycount', lambda: cal.busdaycount(date1, date2)),
+                      ('range', lambda: next(cal.range(date1, date2)))]:
+        current, peak = calls(fun)
+        print('1000 %-12s %8d bytes kept %8d bytes peak' % (name, current,
+                                                           peak))
+    for years in (1, 10, 50):
+        print('range %2d years    %8d bytes peak, merge_ranges %8d bytes '
+              'peak' % (years, range_peak(years), merge_peak(years)))
@@ -0,0 +1,86 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, PREVIOUS, MODIFIEDFOLLOWING
+try:
+    import numpy as np
+    import pandas as pd
+    from business_calendar.pandas_ext import CalendarDay, busdate_range
+except ImportError:
+    raise unittest.SkipTest('pandas not installed')
+
+
+cal = Calendar(workdays=[0, 1, 2, 3], holidays=['2015-01-01', '2015-01-13',
+                                                 '2015-04-02', '2015-12-24'])
+dates = [datetime.datetime(2015, 1, 1) + datetime.timedelta(days=d)
+         for d in range(0, 360, 5)]
+
+
+def test_series_accessor():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    series = pd.Series(dates, name='trade')
+    series[3] = pd.NaT
+    offsets = np.arange(len(dates)) % 7 - 3
+    isbusday = series.bcal(cal).isbusday()
+    adjusted = series.bcal(cal).adjust(MODIFIEDFOLLOWING)
+    shifted = series.bcal(cal).addbusdays(offsets)
+    counts = series.bcal(cal).busdaycount(shifted)
+    assert isbusday.name == 'trade' and shifted.name == 'trade'
+    assert not isbusday[3] and pd.isnull(adjusted[3])
+    assert pd.isnull(shifted[3]) and np.isnan(counts[3])
+    for i, date in enumerate(dates):
+        if i == 3:
+            continue
+        assert isbusday[i] == cal.isbusday(date)
+        assert adjusted[i] == cal.adjust(date, MODIFIEDFOLLOWING)
+        assert shifted[i] == cal.addbusdays(date, int(offsets[i]))
+        assert counts[i] == cal.busdaycount(date, shifted[i])
+
+
+def test_missing_no_warning():
+    cal2 = Calendar(holidays=['2015-01-01', '2016-12-26'])
+    series = pd.Series(['2015-03-02', None, '2015-06-05'])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        accessor = series.bcal(cal2)
+        shifted = accessor.addbusdays(1)
+        assert pd.isnull(shifted[1])
+        assert shifted[2] == datetime.datetime(2015, 6, 8)
+        assert pd.isnull(accessor.adjust()[1])
+        assert list(accessor.isbusday()) == [True, False, True]
+        assert np.isnan(accessor.busdaycount(shifted)[1])
+
+
+def test_index_accessor():
+    index = pd.DatetimeIndex(dates, tz='America/Sao_Paulo')
+    adjusted = index.bcal(cal).adjust(PREVIOUS)
+    assert isinstance(adjusted, pd.DatetimeIndex)
+    assert adjusted.tz == index.tz
+    for i, date in enumerate(dates):
+        assert adjusted[i].tz_localize(None) == cal.adjust(date, PREVIOUS)
+    counts = pd.Series(dates).bcal.busdaycount('2015-03-02')
+    assert counts.dtype == np.int64
+    assert counts[0] == Calendar().busdaycount(dates[0], '2015-03-02')
+
+
+def test_busdate_range():
+    index = busdate_range(cal, '2015-01-01', '2015-12-31', name='busdays')
+    assert index.name == 'busdays'
+    assert list(index) == list(cal.range('2015-01-01', '2015-12-31'))
+    assert len(busdate_range(cal, '2015-01-05', '2015-01-05')) == 0
+
+
+def test_offset():
+    offset = CalendarDay(2, calendar=cal)
+    index = pd.date_range('2015-01-01', '2015-02-01', freq=offset)
+    expected = [cal.adjust('2015-01-01', 1)]
+    while True:
+        date = cal.addbusdays(expected[-1], 2)
+        if date > datetime.datetime(2015, 2, 1):
+            break
+        expected.append(date)
+    assert list(index) == expected
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        shifted = pd.DatetimeIndex(dates) + offset
+    assert list(shifted) == [cal.addbusdays(d, 2) for d in dates]
@@ -0,0 +1,48 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, MODIFIEDFOLLOWING
+try:
+    import numpy as np
+    from business_calendar.table import asdays, todates
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+def test_map_parallel():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    cal = Calendar(workdays=[0, 1, 4, 6], holidays=holidays)
+    rnd = np.random.RandomState(0)
+    days = asdays('2010-01-01') + rnd.randint(0, 1400, 1000)
+    other = asdays('2010-01-01') + rnd.randint(0, 1400, 1000)
+    offsets = rnd.randint(-30, 30, 1000)
+    dates = todates(days)
+    table = cal._rolltable()
+
+    def run(op, arg):
+        shards = list(cal.map_parallel(op, dates, arg, workers=2,
+                                       chunksize=300))
+        assert len(shards) == 4
+        return np.concatenate(shards)
+
+    assert (run('isbusday', None) == table.isbusday(days)).all()
+    assert (run('adjust', MODIFIEDFOLLOWING) ==
+            todates(table.adjust(days, MODIFIEDFOLLOWING))).all()
+    assert (run('addbusdays', offsets) ==
+            todates(table.shift(days, offsets))).all()
+    assert (run('addbusdays', 3) == todates(table.shift(days, 3))).all()
+    assert (run('busdaycount', todates(other)) ==
+            table.count(days, other)).all()
+
+
+def test_map_parallel_invalid():
+    try:
+        Calendar().map_parallel('caleom', ['2015-01-01'])
+    except ValueError:
+        pass
+    else:
+        assert False, 'invalid operation accepted'
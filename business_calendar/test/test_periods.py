@@ -0,0 +1,63 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS
+from business_calendar.test import holidays, random_dates
+try:
+    import numpy as np
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+calendars = [Calendar(),
+             Calendar(holidays=holidays),
+             Calendar(workdays=[0, 1, 4, 6], holidays=holidays)]
+
+
+def period(cal, date, freq, roll):
+    """Brute force period of a date, as the first business day in it."""
+    if roll is not None:
+        date = cal.adjust(date, roll)
+    if freq == 'W':
+        start = date - datetime.timedelta(days=date.weekday())
+    elif freq == 'M':
+        start = date.replace(day=1)
+    elif freq == 'Q':
+        start = date.replace(month=(date.month - 1) // 3 * 3 + 1, day=1)
+    else:
+        index = cal.busdaycount('1969-12-31', date)
+        return cal.addbusdays('1969-12-31', (index - 1) // freq * freq + 1)
+    return cal.adjust(start, FOLLOWING)
+
+
+def test_busperiod_key():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates = random_dates(300, 3)
+    for cal in calendars:
+        for freq in ('W', 'M', 'Q', 1, 5, 21):
+            for roll in (PREVIOUS, FOLLOWING):
+                codes, starts = cal.busperiod_key(dates, freq, roll)
+                assert codes.min() == 0
+                assert codes.max() == len(starts) - 1
+                assert (np.diff(starts.view('i8')) >= 0).all()
+                for date, code in zip(dates, codes):
+                    assert starts[code] == np.datetime64(
+                        period(cal, date, freq, roll), 'D')
+
+
+def test_busperiod_key_missing_and_errors():
+    cal = Calendar(holidays=holidays)
+    dates = np.array(['2010-03-31', 'NaT', '2010-04-01'], dtype='M8[D]')
+    codes, starts = cal.busperiod_key(dates, 'M', None)
+    assert list(codes) == [0, -1, 1]
+    assert list(starts) == [np.datetime64('2010-03-01'),
+                            np.datetime64('2010-04-01')]
+    codes, starts = cal.busperiod_key(dates[1:2], 'W')
+    assert list(codes) == [-1] and len(starts) == 0
+    for freq in ('D', 0, 2.5, True):
+        try:
+            cal.busperiod_key(dates, freq)
+        except ValueError:
+            pass
+        else:
+            assert False, 'invalid frequency %s accepted' % freq
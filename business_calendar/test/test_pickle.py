@@ -0,0 +1,78 @@
+import datetime
+import pickle
+from business_calendar import Calendar
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+class PlainCalendar(Calendar):
+    """Calendar pickled with the default protocol, for comparison."""
+    __reduce__ = object.__reduce__
+
+
+def roundtrip(cal):
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(cal, protocol))
+        assert type(copy) is type(cal)
+        assert copy.workdays == cal.workdays
+        assert copy.weekdaymap == cal.weekdaymap
+        assert copy.holidays == cal.holidays
+        assert [type(hol) for hol in copy.holidays] == \
+            [type(hol) for hol in cal.holidays]
+        assert copy.valid_from == cal.valid_from
+        assert copy.valid_to == cal.valid_to
+    return copy
+
+
+def test_compact():
+    cal = Calendar(workdays=[0, 1, 4, 6], holidays=holidays,
+                   valid_to='2015-12-31')
+    copy = roundtrip(cal)
+    assert copy.addbusdays('2012-03-01', 40) == \
+        cal.addbusdays('2012-03-01', 40)
+    plain = PlainCalendar(workdays=[0, 1, 4, 6], holidays=holidays)
+    assert len(pickle.dumps(cal, 2)) * 4 < len(pickle.dumps(plain, 2))
+    roundtrip(plain)
+
+
+def test_dates_and_empty():
+    roundtrip(Calendar(holidays=[datetime.date(2015, 1, 1),
+                                 datetime.date(2015, 12, 25)]))
+    roundtrip(Calendar())
+    roundtrip(Calendar(workdays=[2], valid_from='2000-01-01'))
+
+
+def test_fallback():
+    # holidays with a time of day can't be packed as ordinals
+    cal = Calendar(holidays=[datetime.datetime(2015, 1, 1, 12),
+                             datetime.datetime(2015, 12, 25)])
+    roundtrip(cal)
+
+
+def test_instance_attributes():
+    cal = Calendar(holidays=holidays).compile()
+    cal.engine = 'numpy'
+    cal.name = 'test'
+    copy = roundtrip(cal)
+    assert copy.engine == 'numpy' and copy.name == 'test'
+    assert 'addbusdays' not in vars(copy) # compile is not pickled
+    assert copy._table is None
+
+
+def test_lazy_holidays():
+    cal = Calendar(holidays=holidays)
+    copy = pickle.loads(pickle.dumps(cal, 2))
+    assert 'holidays' not in vars(copy)
+    assert copy.isbusday('2010-01-01') is False
+    assert 'holidays' in vars(copy) and '_packed' not in vars(copy)
+    # pickling again before the first use
+    copy = pickle.loads(pickle.dumps(pickle.loads(pickle.dumps(cal, 2)), 2))
+    assert copy.holidays == cal.holidays
+    try:
+        copy.nonexistent
+    except AttributeError:
+        pass
+    else:
+        assert False, 'missing attribute found'
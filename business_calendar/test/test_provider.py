@@ -0,0 +1,95 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import warnings
+try:
+    import asyncio
+    from business_calendar.provider import HolidayFileProvider, readholidays
+except ImportError:
+    raise unittest.SkipTest('asyncio not available')
+
+
+def write(path, lines):
+    with open(path, 'w') as holidayfile:
+        holidayfile.write('\n'.join(lines) + '\n')
+
+
+class TestProvider(object):
+    def setup_method(self, method=None):
+        self.path = tempfile.mkdtemp()
+        self.files = {'A': os.path.join(self.path, 'a.txt'),
+                      'B': os.path.join(self.path, 'b.txt')}
+        write(self.files['A'], ['# comment', '2015-01-01', '', '2015-12-25'])
+        write(self.files['B'], ['2015-05-01'])
+        self.loop = asyncio.new_event_loop()
+        warnings.filterwarnings('ignore', module='business_calendar')
+
+    setup = setup_method
+
+    def teardown_method(self, method=None):
+        self.loop.close()
+        shutil.rmtree(self.path)
+
+    teardown = teardown_method
+
+    def test_readholidays(self):
+        assert readholidays(self.files['A']) == \
+            [datetime.datetime(2015, 1, 1), datetime.datetime(2015, 12, 25)]
+
+    def test_load_and_swap(self):
+        provider = HolidayFileProvider(self.files, loop=self.loop)
+        assert provider.get('A') is None
+        names = self.loop.run_until_complete(provider.start())
+        provider.stop()
+        assert names == set(['A', 'B'])
+        cal = provider['A']
+        assert not cal.isbusday('2015-12-25')
+        # nothing changed, nothing swapped
+        assert self.loop.run_until_complete(provider.reload()) == set()
+        assert provider['A'] is cal
+        # modify a file, with a later modification time
+        write(self.files['A'], ['2015-12-24'])
+        mtime = os.stat(self.files['A']).st_mtime + 1
+        os.utime(self.files['A'], (mtime, mtime))
+        assert self.loop.run_until_complete(provider.reload()) == set(['A'])
+        assert provider['A'] is not cal
+        assert provider['A'].isbusday('2015-12-25')
+        assert not cal.isbusday('2015-12-25') # old readers unaffected
+        metrics = provider.metrics()
+        assert metrics['reloads'] == 3
+        assert metrics['swaps'] == 2
+        assert metrics['errors'] == 0
+        assert metrics['latency_max'] >= metrics['latency_last'] >= 0
+
+    def test_error_keeps_calendars(self):
+        provider = HolidayFileProvider(self.files, loop=self.loop)
+        self.loop.run_until_complete(provider.reload())
+        cal = provider['B']
+        os.remove(self.files['B'])
+        try:
+            self.loop.run_until_complete(provider.reload(force=True))
+        except OSError:
+            pass
+        else:
+            assert False, 'missing file not reported'
+        assert provider['B'] is cal
+        assert isinstance(provider.error, OSError)
+        assert provider.metrics()['errors'] == 1
+
+    def test_polling(self):
+        provider = HolidayFileProvider(self.files, interval=0.01,
+                                       loop=self.loop)
+        self.loop.run_until_complete(provider.start())
+        write(self.files['B'], ['2015-05-04'])
+        mtime = time.time() + 10
+        os.utime(self.files['B'], (mtime, mtime))
+        deadline = time.time() + 5
+        while provider['B'].isbusday('2015-05-01') is False and \
+                time.time() < deadline:
+            self.loop.run_until_complete(asyncio.sleep(0.01))
+        provider.stop()
+        assert provider['B'].isbusday('2015-05-01')
+        assert not provider['B'].isbusday('2015-05-04')
@@ -0,0 +1,119 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, \
+    MODIFIEDFOLLOWING, FR, MO
+from business_calendar.recurring import Recurrence, imm, cds, nthweekday, \
+    monthday
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+holidays = ['2015-01-01', '2015-03-18', '2015-12-16', '2015-12-25',
+            '2016-01-01', '2016-06-20', '2016-12-30']
+
+d = datetime.datetime
+
+
+def test_year_functions():
+    assert imm(2015) == [d(2015, 3, 18), d(2015, 6, 17), d(2015, 9, 16),
+                         d(2015, 12, 16)]
+    assert cds(2016) == [d(2016, 3, 20), d(2016, 6, 20), d(2016, 9, 20),
+                         d(2016, 12, 20)]
+    assert nthweekday(-1, FR, [1, 2])(2016) == [d(2016, 1, 29),
+                                                d(2016, 2, 26)]
+    # February 2015 has no fifth Monday
+    assert nthweekday(5, MO, [2, 8])(2015) == [d(2015, 8, 31)]
+    assert nthweekday(-5, MO, [2, 8])(2015) == [d(2015, 8, 3)]
+    assert monthday(31, [2, 4])(2016) == [d(2016, 2, 29), d(2016, 4, 30)]
+    try:
+        nthweekday(0, MO)
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_recurrence_adjusted():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    cal = Calendar(holidays=holidays)
+    for mode in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING, None):
+        for offset in (0, -1, 2):
+            rec = Recurrence(monthday(31), cal, mode, offset)
+            dates = list(rec.range('2015-01-01', datetime.date(2017, 1, 1)))
+            expected = []
+            for year in (2014, 2015, 2016, 2017):
+                for date in monthday(31)(year):
+                    if mode is not None:
+                        date = cal.adjust(date, mode)
+                    date = cal.addbusdays(date, offset)
+                    if d(2015, 1, 1) <= date < d(2017, 1, 1):
+                        expected.append(date)
+            assert dates == expected
+    rec = Recurrence(imm, cal, FOLLOWING)
+    assert list(rec.range('2015-01-01', '2015-07-01')) == \
+        [d(2015, 3, 19), d(2015, 6, 17)]
+    assert list(Recurrence(imm).range('2015-01-01', '2015-04-01')) == \
+        [d(2015, 3, 18)]
+
+
+def test_recurrence_dates():
+    # a calendar of datetime.date holidays gets datetime.date dates
+    date = datetime.date
+    cal = Calendar(holidays=[date(2015, 3, 18), date(2015, 12, 16)])
+    rec = Recurrence(imm, cal, FOLLOWING)
+    assert list(rec.range(date(2015, 1, 1), date(2016, 1, 1))) == \
+        [date(2015, 3, 19), date(2015, 6, 17), date(2015, 9, 16),
+         date(2015, 12, 17)]
+    assert list(rec.range('2015-06-01', d(2015, 7, 1))) == \
+        [date(2015, 6, 17)]
+    rec = Recurrence(monthday(20), cal, None, offset=-1)
+    assert rec.year(2015)[2] == date(2015, 3, 19)
+    if np is not None:
+        assert list(rec.array('2015-03-01', '2015-04-01')) == \
+            [np.datetime64('2015-03-19')]
+
+
+def test_recurrence_cache():
+    cal = Calendar(holidays=holidays)
+    rec = Recurrence(cds, cal, FOLLOWING, cachesize=4)
+    # the year before is needed for dates moved forward across years
+    list(rec.range('2016-01-01', '2017-01-01'))
+    assert (rec.hits, rec.misses) == (0, 2)
+    list(rec.range('2016-01-01', '2017-01-01'))
+    assert (rec.hits, rec.misses) == (2, 2)
+    assert rec.year(2016)[1] == d(2016, 6, 21)
+    cal.holidays = cal.holidays[:-2]
+    assert rec.year(2016)[1] == d(2016, 6, 20)
+    assert rec.misses == 3
+    for year in range(2020, 2025):
+        rec.year(year)
+    assert list(rec._cache) == [2021, 2022, 2023, 2024]
+    # the year after is needed for dates moved back across years
+    rec = Recurrence(cds, cal, PREVIOUS, cachesize=0)
+    assert list(rec.range('2016-01-01', '2016-12-31')) == \
+        list(rec.range('2016-01-01', '2016-12-31'))
+    assert (rec.hits, rec.misses) == (0, 4)
+    assert list(rec._cache) == []
+    for mode in (None, MODIFIEDFOLLOWING):
+        rec = Recurrence(cds, cal, mode)
+        list(rec.range('2016-01-01', '2016-12-31'))
+        assert rec.misses == 1
+    # a list of the same length, the old one freed so its id may be reused
+    for day in (20, 21, 22):
+        cal.holidays = []
+        cal.holidays = [d(2016, 6, day)]
+        assert rec.year(2016)[1] == d(2016, 6, 21 if day == 20 else 20)
+
+
+def test_recurrence_array():
+    if np is None:
+        raise unittest.SkipTest('numpy not installed')
+    rec = Recurrence(imm, Calendar(holidays=holidays), FOLLOWING)
+    result = rec.array('2015-01-01', '2016-01-01')
+    assert result.dtype == np.dtype('M8[D]')
+    assert list(result) == [np.datetime64(date.date(), 'D') for date in
+                            rec.range('2015-01-01', '2016-01-01')]
+    assert len(rec.array('2015-04-01', '2015-05-01')) == 0
@@ -0,0 +1,98 @@
+import calendar
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+from business_calendar.test import holidays, random_dates
+try:
+    import numpy as np
+    from business_calendar.rules import Rule, _fuse
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+def addmonths(date, n):
+    month = date.month - 1 + n
+    year, month = date.year + month // 12, month % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+def eom(date):
+    return date.replace(day=calendar.monthrange(date.year, date.month)[1])
+
+
+def scalar(cal, rule, date):
+    for name, arg in rule.steps:
+        if name == 'adddays':
+            date += datetime.timedelta(days=arg)
+        elif name == 'addmonths':
+            date = addmonths(date, arg)
+        elif name == 'eom':
+            date = eom(date)
+        elif name == 'addbus':
+            date = cal.addbusdays(date, arg)
+        else:
+            date = cal.adjust(date, arg)
+    return date
+
+
+rules = [Rule(),
+         Rule.addbus(2).eom().adjust(PREVIOUS).addbus(-1),
+         Rule.adjust(MODIFIEDFOLLOWING).addbus(3).addbus(-5).adjust(PREVIOUS),
+         Rule.addbus(0).addbus(-1).addbus(-2),
+         Rule.adddays(3).adddays(-1).addmonths(1).addmonths(-13).eom().eom(),
+         Rule.addmonths(6).adjust(FOLLOWING).adjust(PREVIOUS),
+         Rule.eom().addbus(1).addbus(-1)]
+
+
+def test_rules_match_scalar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates = random_dates(300)
+    for workdays in ([0, 1, 2, 3, 4], [0, 1, 4, 6], [2]):
+        cal = Calendar(workdays=workdays, holidays=holidays)
+        for rule in rules:
+            result = rule.compile(cal)(dates)
+            expected = [scalar(cal, rule, date) for date in dates]
+            assert list(result) == [np.datetime64(date.date(), 'D')
+                                    for date in expected], rule
+
+
+def test_rule_missing_values():
+    cal = Calendar(holidays=holidays)
+    fun = Rule.addbus(2).eom().compile(cal)
+    dates = np.array([['2012-06-01', 'NaT']], dtype='M8[D]')
+    result = fun(dates)
+    assert result.shape == (1, 2)
+    assert result[0, 0] == np.datetime64('2012-06-30')
+    assert np.isnat(result[0, 1])
+    assert len(fun(np.array([], dtype='M8[D]'))) == 0
+    assert Rule.addbus(1).apply(cal, '2012-06-01') == \
+        np.datetime64('2012-06-08')
+
+
+def test_rule_building():
+    rule = Rule.addbus(2).eom()
+    assert rule.addbus(1) != rule.adjust(PREVIOUS)
+    assert rule.steps == (('addbus', 2), ('eom', None))
+    assert rule == Rule().addbus(2).eom()
+    assert repr(rule.adjust(PREVIOUS)) == 'Rule.addbus(2).eom().adjust(%s)' \
+        % PREVIOUS
+    for bad in (lambda: Rule.adjust(7), lambda: Rule.addbus(1.5),
+                lambda: Rule.adddays(True)):
+        try:
+            bad()
+        except ValueError:
+            pass
+        else:
+            assert False
+
+
+def test_fuse():
+    assert _fuse(Rule.addbus(2).eom().adjust(PREVIOUS).addbus(-1).steps) == \
+        [('bus', ('addbus', 2), 0), ('eom', None),
+         ('bus', ('adjust', PREVIOUS), -1)]
+    assert _fuse(Rule.adddays(1).adddays(2).addbus(0).adddays(1).steps) == \
+        [('adddays', 4)]
+    assert _fuse(Rule.addbus(1).adjust(FOLLOWING).addbus(3).steps) == \
+        [('bus', ('addbus', 1), 3)]
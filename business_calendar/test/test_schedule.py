@@ -0,0 +1,93 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, PREVIOUS, MODIFIEDFOLLOWING
+try:
+    import numpy as np
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+def dates(*args):
+    return np.array(args, dtype='M8[D]')
+
+
+def test_regular():
+    cal = Calendar()
+    sch = cal.schedule('2015-01-15', '2016-01-15', 6, payment=2)
+    assert (sch.schedule == 0).all()
+    assert (sch.unadjusted == dates('2015-01-15', '2015-07-15',
+                                     '2016-01-15')).all()
+    assert (sch.adjusted == sch.unadjusted).all()
+    assert (sch.fixing == sch.adjusted).all()
+    assert (sch.payment == dates('2015-01-19', '2015-07-17',
+                                  '2016-01-19')).all()
+
+
+def test_stubs():
+    cal = Calendar()
+    sch = cal.schedule('2015-02-10', '2016-01-15', 6)
+    assert (sch.unadjusted == dates('2015-02-10', '2015-07-15',
+                                     '2016-01-15')).all()
+    sch = cal.schedule('2015-02-10', '2016-01-15', 6, backward=False)
+    assert (sch.unadjusted == dates('2015-02-10', '2015-08-10',
+                                     '2016-01-15')).all()
+
+
+def test_eom():
+    cal = Calendar()
+    sch = cal.schedule('2015-02-28', '2015-08-31', 3, mode=None)
+    assert (sch.unadjusted == dates('2015-02-28', '2015-05-31',
+                                     '2015-08-31')).all()
+    sch = cal.schedule('2015-02-28', '2015-08-31', 3, mode=None,
+                       backward=False)
+    assert (sch.unadjusted == dates('2015-02-28', '2015-05-28',
+                                     '2015-08-28', '2015-08-31')).all()
+    sch = cal.schedule('2015-02-28', '2015-08-31', 3, mode=None, eom=True,
+                       backward=False)
+    assert (sch.unadjusted == dates('2015-02-28', '2015-05-31',
+                                     '2015-08-31')).all()
+    assert (sch.adjusted == sch.unadjusted).all()
+    sch = cal.schedule('2015-02-28', '2015-08-31', 3, PREVIOUS, eom=True,
+                       backward=False)
+    assert (sch.adjusted == dates('2015-02-27', '2015-05-29',
+                                   '2015-08-31')).all()
+
+
+def test_batch_matches_scalar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    cal = Calendar(workdays=[0, 1, 2, 3], holidays=['2015-12-24',
+                                                     '2016-03-31'])
+    start = datetime.datetime(2015, 1, 3)
+    starts = [start + datetime.timedelta(days=7 * i) for i in range(40)]
+    ends = [cal.caleom(d + datetime.timedelta(days=400 + 3 * i))
+            for i, d in enumerate(starts)]
+    sch = cal.schedule(starts, ends, 3, fixing=-2, payment=1, eom=True)
+    assert sch.schedule[-1] == 39
+    for i in range(40):
+        rows = sch.schedule == i
+        unadjusted = sch.unadjusted[rows].astype('M8[us]').astype(object)
+        assert unadjusted[0] == starts[i]
+        assert unadjusted[-1] == ends[i]
+        for j in range(1, len(unadjusted)):
+            assert unadjusted[j] > unadjusted[j-1]
+            assert unadjusted[j] == cal.caleom(unadjusted[j])
+        for k, date in enumerate(unadjusted):
+            adjusted = cal.adjust(date, MODIFIEDFOLLOWING)
+            fixing = cal.addbusdays(adjusted, -2)
+            payment = cal.addbusdays(adjusted, 1)
+            assert sch.adjusted[rows][k] == np.datetime64(adjusted, 'D')
+            assert sch.fixing[rows][k] == np.datetime64(fixing, 'D')
+            assert sch.payment[rows][k] == np.datetime64(payment, 'D')
+
+
+def test_invalid():
+    cal = Calendar()
+    for args in (('2015-01-01', '2014-01-01', 6), ('2015-01-01',
+                                                   '2016-01-01', 0)):
+        try:
+            cal.schedule(*args)
+        except ValueError:
+            pass
+        else:
+            assert False
@@ -0,0 +1,108 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+from business_calendar.test import holidays, random_dates
+try:
+    import numpy as np
+    from business_calendar.settlement import Settlement, joint
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+gbp = Calendar(holidays=holidays[::2], valid_from='2009-01-01',
+               valid_to='2014-12-31')
+usd = Calendar(holidays=holidays[1::2] + ['2012-06-08'],
+               valid_from='2009-06-01', valid_to='2015-12-31')
+aed = Calendar(workdays=[0, 1, 2, 3, 6], holidays=holidays[:5],
+               valid_from='2008-01-01', valid_to='2016-12-31')
+
+
+def value_date(cal, required, mode, date, n):
+    """Scalar value date, rolling day by day."""
+    date = cal.addbusdays(date, n)
+    step = -1 if mode == PREVIOUS else 1
+    value = date
+    while not all(other.isbusday(value) for other in required):
+        value += datetime.timedelta(days=step)
+    if mode == MODIFIEDFOLLOWING and value.month != date.month:
+        value = date
+        while not all(other.isbusday(value) for other in required):
+            value -= datetime.timedelta(days=1)
+    return value
+
+
+def test_joint():
+    cal = joint([gbp, usd, aed])
+    assert cal.workdays == [0, 1, 2, 3]
+    assert cal.holidays == sorted(set(
+        hol for hol in gbp.holidays + usd.holidays + aed.holidays
+        if hol.weekday() < 4))
+    assert cal.valid_from == datetime.datetime(2009, 6, 1)
+    assert cal.valid_to == datetime.datetime(2014, 12, 31)
+    try:
+        joint([])
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_value_dates_match_scalar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates = random_dates(300)
+    for required in ([], [usd], [gbp, usd], [gbp, usd, aed]):
+        for mode in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+            spot = Settlement(gbp, required, mode)
+            for n in (0, 2, -1):
+                result = spot.value_dates(dates, n)
+                expected = [value_date(gbp, required, mode, date, n)
+                            for date in dates]
+                assert list(result) == [np.datetime64(date.date(), 'D')
+                                        for date in expected]
+
+
+def test_value_dates_shapes():
+    spot = Settlement(gbp, [gbp, usd])
+    dates = np.array([['2012-06-01', 'NaT'], ['2012-06-05', '2012-06-06']],
+                     dtype='M8[D]')
+    result = spot.value_dates(dates, [2, 1])
+    assert result.shape == (2, 2)
+    assert np.isnat(result[0, 1])
+    assert result[0, 0] == np.datetime64('2012-06-11')
+    assert result[1, 1] == np.datetime64('2012-06-11')
+    assert spot.value_dates('2012-06-01', 2) == np.datetime64('2012-06-11')
+    try:
+        Settlement(gbp, mode=7)
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_joint_rebuilt():
+    usd2 = Calendar(holidays=holidays)
+    spot = Settlement(gbp, [usd2])
+    first = spot.joint
+    assert spot.joint is first
+    assert spot.value_dates('2013-12-23', 2) == np.datetime64('2013-12-26')
+    usd2.holidays.append(datetime.datetime(2013, 12, 26))
+    assert spot.joint is not first
+    assert spot.value_dates('2013-12-23', 2) == np.datetime64('2013-12-27')
+    # a list of the same length, the old one freed so its id may be reused
+    for day in range(2, 28):
+        usd2.holidays = []
+        usd2.holidays = [datetime.datetime(2014, 1, day)]
+        assert not spot.joint.isbusday(usd2.holidays[0])
+
+
+def test_joint_rebuilt_on_required():
+    cal1 = Calendar(holidays=['2015-01-01', '2015-12-25'])
+    cal2 = Calendar(holidays=['2015-01-01', '2015-06-01', '2015-12-25'])
+    cal3 = Calendar(holidays=['2015-01-01', '2015-06-02', '2015-12-25'])
+    spot = Settlement(cal1, [cal1, cal2])
+    assert spot.value_dates('2015-05-28', 2) == np.datetime64('2015-06-02')
+    spot.required = (cal1, cal2, cal3)
+    assert spot.value_dates('2015-05-28', 2) == np.datetime64('2015-06-03')
+    spot.required = (cal1,)
+    assert spot.value_dates('2015-05-28', 2) == np.datetime64('2015-06-01')
@@ -0,0 +1,75 @@
+import datetime
+import os
+import shutil
+import tempfile
+import warnings
+from business_calendar import Calendar
+from business_calendar.store import HolidayStore
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+def test_bulkload():
+    store = HolidayStore()
+    rows = [('A', h) for h in holidays] + [('B', '2011-05-02')]
+    assert store.bulkload(rows) == len(holidays) + 1
+    assert store.bulkload(rows) == 0 # duplicates ignored
+    assert store.names() == ['A', 'B']
+    assert store.holidays('A', '2010-01-01', '2010-01-19') == holidays[:3]
+    assert store.holidays('B', '2011-01-01', '2011-12-31') == \
+        [datetime.datetime(2011, 5, 2)]
+    plan = store.connection.execute(
+        'EXPLAIN QUERY PLAN SELECT date FROM holidays WHERE calendar = ? '
+        'AND date >= ? AND date < ?', ('A', 0, 1)).fetchall()
+    assert 'holidays_calendar_date' in str(plan)
+
+
+def test_calendar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    store = HolidayStore()
+    store.load('A', holidays)
+    cal = store.calendar('A', 2011, 2012, workdays=[0, 1, 4, 6])
+    full = Calendar(workdays=[0, 1, 4, 6], holidays=holidays)
+    assert cal.holidays == [h for h in full.holidays if h.year in (2011, 2012)]
+    assert cal.valid_from == datetime.datetime(2011, 1, 1)
+    assert cal.valid_to == datetime.datetime(2012, 12, 31)
+    date = datetime.datetime(2011, 3, 1)
+    for offset in range(-30, 300, 7):
+        assert cal.addbusdays(date, offset) == full.addbusdays(date, offset)
+
+
+def test_cache():
+    store = HolidayStore(cachesize=2)
+    store.load('A', holidays)
+    store.calendar('A', 2010, 2011)
+    assert (store.hits, store.misses) == (0, 2)
+    store.calendar('A', 2011)
+    assert (store.hits, store.misses) == (1, 2)
+    store.calendar('A', 2012) # evicts 2010, the least recently used
+    store.calendar('A', 2010)
+    assert (store.hits, store.misses) == (1, 4)
+    store.load('A', ['2012-03-05'])
+    assert datetime.datetime(2012, 3, 5) in store.year('A', 2012)
+
+
+def test_no_cache():
+    store = HolidayStore(cachesize=0)
+    store.load('A', holidays)
+    assert store.year('A', 2010) == store.year('A', 2010)
+    assert (store.hits, store.misses) == (0, 2)
+
+
+def test_file():
+    path = tempfile.mkdtemp()
+    try:
+        store = HolidayStore(os.path.join(path, 'holidays.db'))
+        store.load('A', holidays)
+        store.close()
+        store = HolidayStore(os.path.join(path, 'holidays.db'))
+        assert list(store.year('A', 2010)) == \
+            [h for h in holidays if h.year == 2010]
+        store.close()
+    finally:
+        shutil.rmtree(path)
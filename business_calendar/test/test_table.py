@@ -0,0 +1,254 @@
+import datetime
+import unittest
+import warnings
+from business_calendar import Calendar, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING
+from business_calendar.test import holidays, random_dates
+try:
+    import numpy as np
+    from business_calendar.table import asdays, todates
+except ImportError:
+    raise unittest.SkipTest('numpy not installed')
+
+
+calendars = [Calendar(),
+             Calendar(holidays=holidays),
+             Calendar(workdays=[0, 1, 4, 6], holidays=holidays),
+             Calendar(workdays=[2], holidays=holidays)]
+
+
+def test_asdays():
+    days = asdays(['2010-01-01', datetime.date(2010, 1, 2),
+                   datetime.datetime(2010, 1, 3, 12, 30), 'Jan 4, 2010'])
+    assert list(days) == [14610, 14611, 14612, 14613]
+    assert todates(days)[0] == np.datetime64('2010-01-01')
+    assert asdays(np.array(['2010-01-01T23:00'], dtype='M8[ns]'))[0] == 14610
+
+
+def test_table_matches_scalar():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates1 = random_dates(500, 1)
+    dates2 = random_dates(500, 2)
+    offsets = np.random.RandomState(0).randint(-30, 30, 500)
+    for cal in calendars:
+        table = cal._rolltable()
+        days1, days2 = asdays(dates1), asdays(dates2)
+        shifted = todates(table.shift(days1, offsets))
+        counts = table.count(days1, days2)
+        busday = table.isbusday(days1)
+        for i in range(500):
+            expected = cal.addbusdays(dates1[i], int(offsets[i]))
+            assert shifted[i] == np.datetime64(expected.date())
+            assert counts[i] == cal.busdaycount(dates1[i], dates2[i])
+            assert busday[i] == cal.isbusday(dates1[i])
+        for mode in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+            adjusted = todates(table.adjust(days1, mode))
+            for i in range(500):
+                expected = cal.adjust(dates1[i], mode)
+                assert adjusted[i] == np.datetime64(expected.date())
+
+
+def test_table_grows():
+    cal = Calendar(holidays=holidays)
+    table = cal._rolltable()
+    day = asdays('1900-01-01')
+    assert table.isbusday(day)
+    assert table.lo <= day
+    expected = cal.addbusdays('2010-01-01', 10000)
+    assert todates(table.shift(asdays('2010-01-01'), 10000))[()] == \
+        np.datetime64(expected.date())
+    assert cal._rolltable() is table
+
+
+def test_table_rebuilt_on_new_holidays():
+    cal = Calendar()
+    table = cal._rolltable()
+    cal.holidays = [datetime.datetime(2010, 1, 1)]
+    assert cal._rolltable() is not table
+    assert not cal._rolltable().isbusday(asdays('2010-01-01'))
+    # a list of the same length, the old one freed so its id may be reused
+    for day in range(4, 30):
+        cal.holidays = []
+        cal.holidays = [datetime.datetime(2010, 1, day)]
+        assert not cal._rolltable().isbusday(asdays(cal.holidays[0]))
+
+
+def test_busdaycount_matrix():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates1 = random_dates(30, 3)
+    dates2 = random_dates(20, 4) + ['1995-01-01']
+    for cal in calendars:
+        matrix = cal.busdaycount_matrix(dates1, dates2)
+        assert matrix.shape == (30, 21)
+        for i in range(30):
+            for j in range(21):
+                assert matrix[i, j] == cal.busdaycount(dates1[i], dates2[j])
+    assert cal.busdaycount_matrix([], dates2).shape == (0, 21)
+    for engine in ('table', 'numpy'):
+        cal = Calendar(holidays=holidays)
+        cal.engine = engine
+        try:
+            cal.busdaycount_matrix(dates1 + ['NaT'], dates2)
+        except ValueError as error:
+            assert 'NaT' in str(error)
+        else:
+            assert False, 'NaT accepted'
+
+
+def test_to_from_numpy():
+    cal = Calendar(workdays=[0, 1, 4, 6], holidays=holidays)
+    busdaycal = cal.to_numpy()
+    assert list(busdaycal.weekmask) == [True, True, False, False, True,
+                                        False, True]
+    assert len(busdaycal.holidays) == len(cal.holidays)
+    assert busdaycal.holidays[0] == np.datetime64('2010-01-01')
+    cal2 = Calendar.from_numpy(busdaycal)
+    assert cal2.workdays == cal.workdays
+    assert cal2.holidays == cal.holidays
+
+
+def test_from_array():
+    workdays = [0, 1, 4, 6]
+    cal = Calendar(workdays=workdays, holidays=holidays)
+    ordinals = [datetime.date(*map(int, hol.split('-'))).toordinal()
+                for hol in holidays]
+    days = np.array(holidays * 2, dtype='M8[D]')[::-1]
+    for arr in (np.array(ordinals), np.array(ordinals, dtype='i4'),
+                days, days.astype('M8[s]') + np.timedelta64(3600, 's'),
+                np.append(days, np.datetime64('NaT'))):
+        cal2 = Calendar.from_array(arr, workdays=workdays)
+        assert cal2.workdays == cal.workdays
+        assert cal2.holidays == cal.holidays
+        assert type(cal2.holidays[0]) is datetime.datetime
+        assert cal2.valid_from == cal.valid_from
+        assert cal2.valid_to == cal.valid_to
+    cal2 = Calendar.from_array(ordinals, valid_from='2009-01-01',
+                               valid_to='2014-12-31')
+    assert cal2.holidays == Calendar(holidays=holidays).holidays
+    assert cal2.valid_from == datetime.datetime(2009, 1, 1)
+    assert cal2.valid_to == datetime.datetime(2014, 12, 31)
+    cal2 = Calendar.from_array(np.array([], dtype='M8[D]'))
+    assert cal2.holidays == []
+    assert cal2.valid_from is None and cal2.valid_to is None
+
+
+def test_numpy_engine():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    days1 = asdays(random_dates(500, 5))
+    days2 = asdays(random_dates(500, 6))
+    offsets = np.random.RandomState(1).randint(-30, 30, 500)
+    for base in calendars:
+        cal = Calendar(workdays=base.workdays, holidays=base.holidays)
+        table = cal._rolltable()
+        cal.engine = 'numpy'
+        engine = cal._rolltable()
+        assert engine is not table
+        assert (engine.isbusday(days1) == table.isbusday(days1)).all()
+        assert (engine.index(days1) == table.index(days1)).all()
+        assert (engine.count(days1, days2) == table.count(days1, days2)).all()
+        assert (engine.shift(days1, offsets) ==
+                table.shift(days1, offsets)).all()
+        for mode in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+            assert (engine.adjust(days1, mode) ==
+                    table.adjust(days1, mode)).all()
+        matrix = cal.busdaycount_matrix(days1[:50].view('M8[D]'),
+                                        days2[:40].view('M8[D]'))
+        cal.engine = 'table'
+        assert (matrix == cal.busdaycount_matrix(days1[:50].view('M8[D]'),
+                                                 days2[:40].view('M8[D]'))
+                ).all()
+
+
+def test_array_window_check():
+    cal = Calendar(holidays=holidays, valid_from='2009-01-01',
+                   valid_to='2014-12-31')
+    inside = asdays(random_dates(100, 7))
+    outside = inside + 3650
+    for engine in ('table', 'numpy'):
+        cal.engine = engine
+        table = cal._rolltable()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            table.count(inside, inside + 30)
+            table.shift(inside, 5)
+        assert len(caught) == 0
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            table.isbusday(outside)
+        assert len(caught) == 1
+        # one warning per call, attributed to the caller
+        outdates = todates(outside)
+        for call in (lambda: table.shift(outside, 5),
+                     lambda: table.adjust(outside, MODIFIEDFOLLOWING),
+                     lambda: table.count(inside, outside),
+                     lambda: cal.shift_busdays(outdates, 2),
+                     lambda: cal.busdaycount_matrix(outdates, outdates)):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                call()
+            assert len(caught) == 1
+            assert caught[0].filename == __file__.replace('.pyc', '.py')
+
+
+def test_busday_index():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates = random_dates(500, 8) + [datetime.datetime(1969, 12, 29),
+                                    datetime.datetime(1970, 1, 1)]
+    for base in calendars:
+        for engine in ('table', 'numpy'):
+            cal = Calendar(workdays=base.workdays, holidays=base.holidays)
+            cal.engine = engine
+            busdates = [cal.adjust(d, FOLLOWING) for d in dates]
+            index = cal.to_busday_index(busdates)
+            assert (index == [cal.busdaycount('1969-12-31', d)
+                              for d in busdates]).all()
+            assert (cal.from_busday_index(index) ==
+                    np.array(busdates, dtype='M8[D]')).all()
+            for mode in (FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+                assert (cal.to_busday_index(dates, mode) ==
+                        cal.to_busday_index([cal.adjust(d, mode)
+                                             for d in dates])).all()
+            index = cal.to_busday_index(np.array(busdates[:6]).reshape(2, 3))
+            assert index.shape == (2, 3)
+            assert cal.from_busday_index(index).shape == (2, 3)
+            for mode in (None, FOLLOWING, PREVIOUS, MODIFIEDFOLLOWING):
+                try:
+                    cal.to_busday_index(busdates + ['NaT'], mode)
+                except ValueError as error:
+                    assert 'NaT' in str(error)
+                else:
+                    assert False, 'NaT accepted'
+
+
+def test_busday_index_scalar():
+    cal = Calendar(holidays=['2015-01-01'])
+    index = cal.to_busday_index('2015-01-02')
+    assert isinstance(index, int)
+    assert cal.to_busday_index('2015-01-01', FOLLOWING) == index
+    assert cal.to_busday_index('2015-01-03', PREVIOUS) == index
+    assert cal.from_busday_index(index) == datetime.datetime(2015, 1, 2)
+    assert cal.from_busday_index(index + 1) == datetime.datetime(2015, 1, 5)
+    try:
+        cal.to_busday_index(['2015-01-02', '2015-01-03'])
+    except ValueError:
+        pass
+    else:
+        assert False, 'non-business date accepted'
+
+
+def test_shift_busdays():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    dates = random_dates(300, 9)
+    k = np.random.RandomState(2).randint(-25, 25, 300)
+    for cal in calendars:
+        arr = np.array(dates, dtype='M8[D]')
+        arr[::7] = np.datetime64('NaT')
+        shifted = cal.shift_busdays(arr, k)
+        assert shifted.dtype == np.dtype('M8[D]')
+        assert np.isnat(shifted[::7]).all()
+        for i in range(300):
+            if i % 7:
+                assert shifted[i] == np.datetime64(
+                    cal.addbusdays(dates[i], int(k[i])), 'D')
+        lagged = cal.shift_busdays(arr.reshape(30, 10), -3)
+        assert lagged.shape == (30, 10)
+        assert (lagged.ravel()[1:7] == cal.shift_busdays(arr[1:7], -3)).all()
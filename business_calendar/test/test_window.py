@@ -0,0 +1,84 @@
+import datetime
+import random
+import warnings
+from business_calendar import Calendar, CalendarHolidayWarning
+
+
+holidays = [datetime.datetime(2010, 1, 1) + datetime.timedelta(days=d)
+            for d in range(0, 1460, 9)]
+
+
+def count_warnings(fun, *args):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        fun(*args)
+    for warning in caught:
+        assert issubclass(warning.category, CalendarHolidayWarning)
+    return len(caught)
+
+
+def test_default_window():
+    cal = Calendar(holidays=holidays)
+    assert cal.valid_from == holidays[0]
+    assert cal.valid_to == cal.holidays[-1]
+    cal = Calendar()
+    assert cal.valid_from is None and cal.valid_to is None
+    assert count_warnings(cal.addbusdays, '1900-01-01', 5) == 0
+
+
+def test_explicit_window():
+    cal = Calendar(holidays=holidays, valid_from='2009-01-01',
+                   valid_to='2014-12-31')
+    assert cal.valid_from == datetime.datetime(2009, 1, 1)
+    # beyond the last holiday but inside the window
+    assert count_warnings(cal.isbusday, '2014-06-02') == 0
+    assert count_warnings(cal.addbusdays, '2014-06-02', 20) == 0
+    assert count_warnings(cal.busdaycount, '2009-06-01', '2014-06-02') == 0
+    # outside the window
+    assert count_warnings(cal.isbusday, '2015-06-02') == 1
+    assert count_warnings(cal.addbusdays, '2014-12-30', 5) == 1
+    assert count_warnings(cal.addbusdays, '2009-01-02', -5) == 1
+    assert count_warnings(cal.busdaycount, '2008-06-02', '2015-06-02') == 2
+
+
+def test_isvalid():
+    cal = Calendar(holidays=holidays, valid_to='2014-12-31')
+    assert cal.isvalid('2012-01-01')
+    assert cal.isvalid('2010-01-01', '2014-12-31')
+    assert not cal.isvalid('2009-12-31', '2012-01-01')
+    assert not cal.isvalid('2012-01-01', '2015-01-01')
+    assert Calendar().isvalid('1900-01-01', '2100-01-01')
+
+
+def test_unchecked_matches_checked():
+    warnings.filterwarnings('ignore', module='business_calendar')
+    rnd = random.Random(1)
+    start = datetime.datetime(2010, 1, 1)
+    for workdays in ([0, 1, 2, 3, 4], [0, 1, 4, 6], [2]):
+        cal = Calendar(workdays=workdays, holidays=holidays)
+        fast = Calendar(workdays=workdays, holidays=holidays).compile(
+            check=False)
+        for i in range(300):
+            date1 = start + datetime.timedelta(days=rnd.randint(0, 1400))
+            date2 = start + datetime.timedelta(days=rnd.randint(0, 1400))
+            offset = rnd.randint(-20, 20)
+            assert fast.isbusday(date1) == cal.isbusday(date1)
+            assert fast.addbusdays(date1, offset) == \
+                cal.addbusdays(date1, offset)
+            assert fast.busdaycount(date1, date2) == \
+                cal.busdaycount(date1, date2)
+
+
+def test_unchecked_never_warns():
+    cal = Calendar(holidays=holidays).compile(check=False)
+    assert count_warnings(cal.isbusday, '2020-01-01') == 0
+    assert count_warnings(cal.addbusdays, '2020-01-01', 1) == 0
+    assert count_warnings(cal.busdaycount, '2000-01-03', '2020-01-01') == 0
+
+
+def test_busdaycount_from_last_holiday():
+    cal = Calendar(holidays=holidays)
+    last = cal.holidays[-1]
+    warnings.filterwarnings('ignore', module='business_calendar')
+    assert cal.busdaycount(last, last + datetime.timedelta(days=7)) == 5
+    assert cal.busdaycount(last + datetime.timedelta(days=7), last) == -5
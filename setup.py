@@ -19,6 +19,7 @@ setup(
     author_email='antonio@inhames.com',
 	packages=find_packages(exclude=['test*']),
     include_package_data=True,
+    extras_require={'numpy': ['numpy'], 'pandas': ['numpy', 'pandas']},
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Intended Audience :: Developers',